@@ -63,6 +63,7 @@ from bpy.props import (
     FloatProperty,
     IntProperty,
     BoolProperty,
+    EnumProperty,
 )
 
 import traceback
@@ -88,6 +89,8 @@ class RbxAddonPreferences(AddonPreferences):
     # The only token we need to persist is the refresh token, since it gives all new tokens in the next session
     refresh_token: StringProperty()
     selected_creator_enum_index: IntProperty()
+    # The last known creators, serialized as JSON so the creator dropdown can be shown before the session is refreshed
+    cached_creators: StringProperty()
 
     # export_scale is configurable via the Add-on preferences menu in Blender
     from .lib import constants
@@ -157,6 +160,136 @@ class RbxAddonPreferences(AddonPreferences):
         description="Export Custom Properties",
         default=True,
     )
+    max_concurrent_uploads: IntProperty(
+        name="Concurrent Uploads",
+        description="How many files are sent at once. Fewer concurrent uploads share the connection fewer ways, so "
+        "each finishes sooner",
+        default=constants.DEFAULT_MAX_CONCURRENT_UPLOADS,
+        min=1,
+        soft_max=8,
+    )
+    upload_order: EnumProperty(
+        name="Upload Order",
+        description="The order in which exported files wait to be uploaded",
+        items=[
+            (
+                "SMALLEST_FIRST",
+                "Smallest First",
+                "Upload the smallest files first, so most objects finish as soon as possible",
+            ),
+            (
+                "BALANCED",
+                "Balanced",
+                "Alternate between the smallest and largest files, so large objects are not left until last",
+            ),
+            ("SELECTION_ORDER", "Selection Order", "Upload files in the order the objects are listed"),
+        ],
+        default="SMALLEST_FIRST",
+    )
+    validate_before_upload: BoolProperty(
+        name="Validate Before Upload",
+        description="Check objects against the limits on uploaded meshes, such as triangle and bone counts, before "
+        "exporting them, and skip the objects that exceed them",
+        default=True,
+    )
+    split_oversized_meshes: BoolProperty(
+        name="Split Oversized Meshes",
+        description="Export unanimated meshes over the triangle or vertex limit as several parts that are each within "
+        "it, together as one model",
+        default=True,
+    )
+    staging_location: EnumProperty(
+        name="Staging Location",
+        description="Where exported files are kept until they have been uploaded",
+        items=[
+            (
+                "AUTO",
+                "Automatic",
+                "Keep files in memory (tmpfs) when there is enough memory available, and on disk otherwise",
+            ),
+            ("MEMORY", "Memory", "Keep files in memory (tmpfs) when it is available, and on disk otherwise"),
+            ("DISK", "Disk", "Keep files in the temporary directory on disk"),
+        ],
+        default="AUTO",
+    )
+    max_staged_megabytes: IntProperty(
+        name="Max Staged Size (MB)",
+        description="Exporting waits for uploads to finish once this many megabytes of exported files are waiting to "
+        "be uploaded. 0 for no limit",
+        default=constants.DEFAULT_MAX_STAGED_MEGABYTES,
+        min=0,
+    )
+    upload_duplicates_once: BoolProperty(
+        name="Upload Duplicates Once",
+        description="Upload selected objects with identical geometry, materials and transform (apart from location) "
+        "once, and give every one of them the resulting asset",
+        default=True,
+    )
+    generate_lods: BoolProperty(
+        name="Generate LODs",
+        description="Upload decimated levels of detail of each unanimated mesh object alongside it, each as an asset of "
+        "its own",
+        default=False,
+    )
+    lod_ratios: StringProperty(
+        name="Ratios",
+        description="Comma separated ratios of faces kept by each level of detail. A level is given more faces if "
+        "needed to stay within the max error",
+        default="0.5, 0.25",
+    )
+    lod_max_error: FloatProperty(
+        name="Max Error",
+        description="How far a level of detail may move the surface, as a percentage of the size of the mesh",
+        subtype="PERCENTAGE",
+        min=0.0,
+        max=100.0,
+        default=1.0,
+    )
+    max_texture_size: EnumProperty(
+        name="Max Texture Size",
+        description="Embedded textures larger than this are downscaled for the export, leaving the source images "
+        'untouched. Objects can override this with a "Roblox Max Texture Size" custom property',
+        items=[
+            ("0", "Original", "Embed textures at their original size"),
+            ("512", "512", "Downscale textures to at most 512 pixels on each side"),
+            ("1024", "1024", "Downscale textures to at most 1024 pixels on each side"),
+            ("2048", "2048", "Downscale textures to at most 2048 pixels on each side"),
+            ("4096", "4096", "Downscale textures to at most 4096 pixels on each side"),
+        ],
+        default="0",
+    )
+    texture_file_format: EnumProperty(
+        name="Texture Format",
+        description="The format that embedded textures are saved in",
+        items=[
+            ("KEEP", "Keep", "Keep the format of each texture, only saving the textures that are downscaled"),
+            ("PNG", "PNG", "Save every texture as a lossless PNG"),
+            ("JPEG", "JPEG", "Save every texture as a smaller, lossy JPEG, without transparency"),
+        ],
+        default="KEEP",
+    )
+    upload_textures_separately: BoolProperty(
+        name="Upload Textures Separately",
+        description="Upload each distinct image used by the selected objects' materials once, as an asset of its own, "
+        "instead of embedding the textures in every exported FBX. Models are then uploaded untextured, and the image "
+        "IDs must be applied to their materials in Studio",
+        default=False,
+    )
+    texture_asset_type: EnumProperty(
+        name="Texture Asset Type",
+        description="The type of asset that textures are uploaded as",
+        items=[
+            ("Image", "Image", "Upload textures as Image assets"),
+            ("Decal", "Decal", "Upload textures as Decal assets"),
+        ],
+        default="Image",
+    )
+    network_timing_log_path: StringProperty(
+        name="Network Timing Log",
+        description="A JSONL file that the timing of every request made by the add-on is appended to. Leave empty to "
+        "only keep recent timings in memory",
+        subtype="FILE_PATH",
+    )
 
     def draw(self, context):
         self.layout.label(text="Include")
@@ -182,6 +315,39 @@ class RbxAddonPreferences(AddonPreferences):
         bake_anim_box.prop(self, "bake_anim_step")
         bake_anim_box.prop(self, "bake_anim_simplify_factor")
 
+        self.layout.label(text="Upload")
+        upload_box = self.layout.box()
+        upload_box.prop(self, "max_concurrent_uploads")
+        upload_box.prop(self, "upload_order")
+        upload_box.prop(self, "upload_duplicates_once")
+        upload_box.prop(self, "validate_before_upload")
+        upload_box.prop(self, "split_oversized_meshes")
+        upload_box.prop(self, "staging_location")
+        upload_box.prop(self, "max_staged_megabytes")
+
+        self.layout.prop(self, "generate_lods")
+        lods_box = self.layout.box()
+        lods_box.use_property_split = True
+        lods_box.enabled = self.generate_lods
+        lods_box.prop(self, "lod_ratios")
+        lods_box.prop(self, "lod_max_error")
+
+        self.layout.label(text="Textures")
+        textures_box = self.layout.box()
+        embedded_textures_column = textures_box.column()
+        embedded_textures_column.enabled = not self.upload_textures_separately
+        embedded_textures_column.prop(self, "max_texture_size")
+        embedded_textures_column.prop(self, "texture_file_format")
+        textures_box.prop(self, "upload_textures_separately")
+        texture_asset_type_row = textures_box.row()
+        texture_asset_type_row.enabled = self.upload_textures_separately
+        texture_asset_type_row.prop(self, "texture_asset_type")
+        textures_box.operator("rbx.clear_image_asset_cache")
+
+        self.layout.label(text="Diagnostics")
+        diagnostics_box = self.layout.box()
+        diagnostics_box.prop(self, "network_timing_log_path")
+
 
 class RBX_PT_sidebar:
     bl_space_type = "VIEW_3D"
@@ -235,6 +401,11 @@ class RBX_PT_main(RBX_PT_sidebar, Panel):
 
             creator_details.load_creator_details(context.window_manager, context.preferences)
 
+            # Creators cached from the last session are shown straight away, and verified by refreshing the
+            # remembered session in the background
+            if rbx.is_creator_data_provisional:
+                creator_details.schedule_creator_revalidation()
+
         if not rbx.is_logged_in:
             from .lib import oauth2_login_operators
 
@@ -245,6 +416,10 @@ class RBX_PT_main(RBX_PT_sidebar, Panel):
             if bpy.ops.rbx.oauth2_cancel_login.poll():
                 layout.row().operator(oauth2_login_operators.RBX_OT_oauth2_cancel_login.bl_idname)
 
+            if rbx.is_creator_data_provisional:
+                layout.row().label(text="Restoring last session...", icon="TIME")
+                layout.prop(rbx, "creator")
+
 
 class RBX_PT_creator(RBX_PT_sidebar, Panel):
     bl_parent_id = "RBX_PT_main"
@@ -285,10 +460,17 @@ class RBX_PT_upload(RBX_PT_sidebar, Panel):
     bl_options = {"HIDE_HEADER"}
 
     def draw(self, context):
-        from .lib.upload_operator import RBX_OT_upload
+        from .lib.upload_operator import RBX_OT_upload, RBX_OT_cancel_upload
 
         layout = self.layout
         layout.row().operator(RBX_OT_upload.bl_idname)
+        layout.row().prop(context.window_manager.rbx, "is_watching", icon="HIDE_OFF")
+        if RBX_OT_cancel_upload.poll(context):
+            layout.row().operator(RBX_OT_cancel_upload.bl_idname, icon="CANCEL")
+
+            from .lib import upload_progress
+
+            upload_progress.draw_progress(layout.column())
 
         from .lib.get_selected_objects import get_selected_objects
 
@@ -307,12 +489,54 @@ class RBX_PT_upload(RBX_PT_sidebar, Panel):
         return rbx.is_logged_in and not rbx.is_processing_login_or_logout
 
 
+class RBX_PT_network_timing(RBX_PT_sidebar, Panel):
+    bl_parent_id = "RBX_PT_main"
+    bl_label = "Network Timing"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context):
+        from .lib import network_timing
+
+        network_timing.draw_timings(self.layout)
+
+    @classmethod
+    def poll(cls, context):
+        rbx = context.window_manager.rbx
+        return rbx.is_logged_in
+
+
+class RBX_PT_upload_history(RBX_PT_sidebar, Panel):
+    bl_parent_id = "RBX_PT_main"
+    bl_label = "Upload History"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context):
+        from .lib import upload_history
+
+        upload_history.draw_history(self.layout)
+
+    @classmethod
+    def poll(cls, context):
+        rbx = context.window_manager.rbx
+        return rbx.is_logged_in
+
+
 @persistent
 def load_post(dummy):
-    from .lib import event_loop
+    from .lib import event_loop, upload_journal, watch_mode
+    from .lib.upload_operator import RBX_OT_upload
 
     event_loop.reset_timer_running()
 
+    # Edits seen in the previous file refer to objects by name, so they must not carry over
+    watch_mode.clear()
+
+    # Objects waiting to be exported belong to the previous file
+    RBX_OT_upload.drop_queued_exports(bpy.context.window_manager)
+
+    # Uploads from this file that were still processing when Blender last closed are picked back up
+    upload_journal.schedule_resume_pending_uploads()
+
 
 def get_classes():
     from .lib import (
@@ -322,7 +546,8 @@ def get_classes():
         roblox_properties,
     )
     from .lib.install_dependencies import RBX_OT_install_dependencies
-    from .lib.upload_operator import RBX_OT_upload
+    from .lib.upload_operator import RBX_OT_upload, RBX_OT_cancel_upload
+    from .lib.texture_uploads import RBX_OT_clear_image_asset_cache
 
     return (
         event_loop.RBX_OT_event_loop,
@@ -334,7 +559,11 @@ def get_classes():
         RBX_PT_main,
         RBX_PT_creator,
         RBX_OT_upload,
+        RBX_OT_cancel_upload,
+        RBX_OT_clear_image_asset_cache,
         RBX_PT_upload,
+        RBX_PT_upload_history,
+        RBX_PT_network_timing,
         roblox_properties.RbxStatusProperties,
         roblox_properties.RbxProperties,
         RbxAddonPreferences,
@@ -352,6 +581,11 @@ def register():
 
 
 def unregister():
+    from .lib import export_staging, watch_mode
+
+    watch_mode.stop()
+    export_staging.shutdown()
+
     # We unregister in reverse order to ensure a class is not unregistered while
     # another still depends on it
     for cls in reversed(get_classes()):
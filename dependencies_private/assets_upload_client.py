@@ -31,6 +31,7 @@ from openapi_client.models import (
 )
 from openapi_client.api.asset_api import AssetApi
 from openapi_client.api.upload_status_api import UploadStatusApi
+from openapi_client.api.multipart_upload_api import MultipartUploadApi
 
 
 class AssetsUploadClient:
@@ -53,11 +54,15 @@ class AssetsUploadClient:
     UPLOAD_ASSET_TIMEOUT_SECONDS = float(10)
     GET_ASSET_UPLOAD_STATUS_TIMEOUT_SECONDS = float(2)
 
-    def __init__(self, creator: RobloxOpenCloudAssetsV1Creator, api_key="", oauth2_token=""):
+    def __init__(
+        self, creator: RobloxOpenCloudAssetsV1Creator, api_key="", oauth2_token="", connector=None, trace_configs=None
+    ):
         """
         Initializes an AssetsUploadClient, accepts an environment as a parameter.
+        An aiohttp connector can be passed to reuse pooled connections across clients.
+        aiohttp TraceConfigs can be passed to observe the requests the client makes.
         """
-        base_url = os.getenv(AssetsUploadClient.ASSETS_UPLOAD_API_BASE_URL_ENV_NAME, AssetsUploadClient.BASE_URL)
+        base_url = AssetsUploadClient.get_base_url()
         environment = os.getenv(AssetsUploadClient.ENVIRONMENT_ENV_NAME, AssetsUploadClient.ENVIRONMENT)
 
         if not base_url:
@@ -72,19 +77,36 @@ class AssetsUploadClient:
         configuration = openapi_client.Configuration()
         configuration.ssl_ca_cert = certifi.where()
         configuration.host = base_url
-        self.base_client = openapi_client.ApiClient(configuration=configuration)
+        self.base_client = openapi_client.ApiClient(
+            configuration=configuration, connector=connector, trace_configs=trace_configs
+        )
         if api_key:
             self.base_client.set_default_header("x-api-key", api_key)
         elif oauth2_token:
-            self.base_client.set_default_header("Authorization", f"Bearer {oauth2_token}")
+            self.set_oauth2_token(oauth2_token)
 
         if environment == "local":
             self.base_client.set_default_header("robloxctx-authenticated-userid", str(self.creator_id))
             self.base_client.set_default_header("robloxctx-account-id", str(self.creator_id))
 
+        # The API objects share the base client, and with it a single lazily created session and connector
         self.asset_client = AssetApi(self.base_client)
         self.creator = creator
         self.upload_status_client = UploadStatusApi(self.base_client)
+        self.multipart_upload_client = MultipartUploadApi(self.base_client)
+
+    @staticmethod
+    def get_base_url() -> str:
+        """
+        Returns the base URL requests are made to, taking the ASSETS_UPLOAD_API_BASE_URL override into account.
+        """
+        return os.getenv(AssetsUploadClient.ASSETS_UPLOAD_API_BASE_URL_ENV_NAME, AssetsUploadClient.BASE_URL)
+
+    def set_oauth2_token(self, oauth2_token: str):
+        """
+        Replaces the OAuth2 access token used by subsequent requests, for instance after it has been refreshed.
+        """
+        self.base_client.set_default_header("Authorization", f"Bearer {oauth2_token}")
 
     async def __aenter__(self):
         return self
@@ -0,0 +1,57 @@
+# Copyright © 2023 Roblox Corporation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+# associated documentation files (the “Software”), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial
+# portions of the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+# OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# SPDX-License-Identifier: MIT
+
+"""
+JSON encoding and decoding shared by the add-on and the Open Cloud client.
+Uses orjson when it has been installed into dependencies_public, and falls back to the standard library otherwise.
+Both backends decode str and bytes, so response bodies can be decoded without converting them to str first.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so this catches decoding errors from either backend
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data):
+    """Deserializes a str or UTF-8 encoded bytes JSON document. Raises JSONDecodeError if the document is invalid."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def loads_response_body(body):
+    """Deserializes the body of an HTTP response like loads, except that an empty or whitespace-only body, such as
+    that of a 200 response with no content, gives None"""
+    if not body or not body.strip():
+        return None
+    return loads(body)
+
+
+def dumps(obj) -> str:
+    """Serializes an object to a JSON formatted str"""
+    if orjson:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
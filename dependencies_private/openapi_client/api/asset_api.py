@@ -17,12 +17,33 @@ import re  # noqa: F401
 # python 2 and python 3 compatibility library
 import six
 
-from openapi_client.api_client import ApiClient
+from openapi_client.api_client import ApiClient, RequestTemplate
 from openapi_client.exceptions import (  # noqa: F401
     ApiTypeError,
     ApiValueError
 )
 
+# Keyword arguments the precompiled request templates can handle. Calls
+# passing anything else go through the generic `call_api` path.
+FAST_PATH_KWARGS = frozenset(['request', '_request_timeout'])
+
+ASSET_RESPONSE_TYPES_MAP = {
+        200: "RobloxLongrunningOperation",
+        400: "MicrosoftAspNetCoreMvcProblemDetails",
+        401: "MicrosoftAspNetCoreMvcProblemDetails",
+        403: "MicrosoftAspNetCoreMvcProblemDetails",
+    }
+
+ASSET_CREATE_TEMPLATE = RequestTemplate(
+    '/v1/assets', 'POST',
+    {'Accept': 'application/json', 'Content-Type': 'multipart/form-data'},
+    ASSET_RESPONSE_TYPES_MAP)
+
+ASSET_UPDATE_TEMPLATE = RequestTemplate(
+    '/v1/assets/{assetId}', 'PATCH',
+    {'Accept': 'application/json', 'Content-Type': 'multipart/form-data'},
+    ASSET_RESPONSE_TYPES_MAP)
+
 
 class AssetApi(object):
     """NOTE: This class is auto generated by OpenAPI Generator
@@ -64,6 +85,12 @@ class AssetApi(object):
                  returns the request thread.
         :rtype: RobloxLongrunningOperation
         """
+        if file_content is not None and kwargs.keys() <= FAST_PATH_KWARGS:
+            return self.api_client.call_template(
+                ASSET_CREATE_TEMPLATE,
+                post_params=[('request', kwargs['request'])] if 'request' in kwargs else None,  # noqa: E501
+                files={'fileContent': file_content},
+                _request_timeout=kwargs.get('_request_timeout'))
         kwargs['_return_http_data_only'] = True
         return self.asset_create_with_http_info(file_content, **kwargs)  # noqa: E501
 
@@ -219,6 +246,14 @@ class AssetApi(object):
                  returns the request thread.
         :rtype: RobloxLongrunningOperation
         """
+        if (asset_id is not None and file_content is not None
+                and kwargs.keys() <= FAST_PATH_KWARGS):
+            return self.api_client.call_template(
+                ASSET_UPDATE_TEMPLATE,
+                path_params={'assetId': asset_id},
+                post_params=[('request', kwargs['request'])] if 'request' in kwargs else None,  # noqa: E501
+                files={'fileContent': file_content},
+                _request_timeout=kwargs.get('_request_timeout'))
         kwargs['_return_http_data_only'] = True
         return self.asset_update_with_http_info(asset_id, file_content, **kwargs)  # noqa: E501
 
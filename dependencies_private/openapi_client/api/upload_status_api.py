@@ -17,12 +17,26 @@ import re  # noqa: F401
 # python 2 and python 3 compatibility library
 import six
 
-from openapi_client.api_client import ApiClient
+from openapi_client.api_client import ApiClient, RequestTemplate
 from openapi_client.exceptions import (  # noqa: F401
     ApiTypeError,
     ApiValueError
 )
 
+# Keyword arguments the precompiled request templates can handle. Calls
+# passing anything else go through the generic `call_api` path.
+FAST_PATH_KWARGS = frozenset(['_request_timeout'])
+
+GET_OPERATION_STATUS_TEMPLATE = RequestTemplate(
+    '/v1/operations/{operationId}', 'GET',
+    {'Accept': 'application/json'},
+    {
+        200: "RobloxLongrunningOperation",
+        400: "MicrosoftAspNetCoreMvcProblemDetails",
+        401: "MicrosoftAspNetCoreMvcProblemDetails",
+        403: "MicrosoftAspNetCoreMvcProblemDetails",
+    })
+
 
 class UploadStatusApi(object):
     """NOTE: This class is auto generated by OpenAPI Generator
@@ -62,6 +76,11 @@ class UploadStatusApi(object):
                  returns the request thread.
         :rtype: RobloxLongrunningOperation
         """
+        if operation_id is not None and kwargs.keys() <= FAST_PATH_KWARGS:
+            return self.api_client.call_template(
+                GET_OPERATION_STATUS_TEMPLATE,
+                path_params={'operationId': operation_id},
+                _request_timeout=kwargs.get('_request_timeout'))
         kwargs['_return_http_data_only'] = True
         return self.upload_status_get_operation_status_with_http_info(operation_id, **kwargs)  # noqa: E501
 
@@ -10,12 +10,10 @@
 
 from __future__ import absolute_import
 
-import atexit
+import asyncio
 import datetime
 from dateutil.parser import parse
-import json
 import mimetypes
-from multiprocessing.pool import ThreadPool
 import os
 import re
 import tempfile
@@ -28,6 +26,30 @@ from openapi_client.configuration import Configuration
 import openapi_client.models
 from openapi_client import rest
 from openapi_client.exceptions import ApiValueError, ApiException
+import json_codec
+
+CHARSET_PATTERN = re.compile(r"charset=([a-zA-Z\-\d]+)[\s\;]?")
+
+
+class RequestTemplate(object):
+    """The parts of an endpoint's request that are the same for every call.
+
+    Hot endpoints build one of these once, so calls to them skip the keyword
+    introspection, header selection and parameter formatting of `call_api`.
+
+    :param resource_path: Path to method endpoint.
+    :param method: Method to call.
+    :param headers: Headers sent with every call, e.g. Accept.
+    :param response_types_map: Response type by status code.
+    """
+
+    __slots__ = ('resource_path', 'method', 'headers', 'response_types_map')
+
+    def __init__(self, resource_path, method, headers, response_types_map):
+        self.resource_path = resource_path
+        self.method = method
+        self.headers = headers
+        self.response_types_map = response_types_map
 
 
 class ApiClient(object):
@@ -48,8 +70,11 @@ class ApiClient(object):
         the API.
     :param cookie: a cookie to include in the header when making calls
         to the API
-    :param pool_threads: The number of threads to use for async requests
-        to the API. More threads means more concurrent API requests.
+    :param connector: an aiohttp connector to share with other clients
+        instead of creating one for this client. Nothing is connected until
+        the first request is made.
+    :param trace_configs: aiohttp TraceConfigs to attach to the session,
+        for instance to time requests.
     """
 
     PRIMITIVE_TYPES = (float, bool, bytes, six.text_type) + six.integer_types
@@ -63,16 +88,23 @@ class ApiClient(object):
         'datetime': datetime.datetime,
         'object': object,
     }
-    _pool = None
+    # Deserialization plans by type string or class, compiled on first
+    # use and shared by every client
+    _deserialization_plans = {}
+    # (attribute, json key) pairs by model class, for serializing requests
+    _serialization_fields = {}
 
     def __init__(self, configuration=None, header_name=None, header_value=None,
-                 cookie=None, pool_threads=1):
+                 cookie=None, connector=None, trace_configs=None):
         if configuration is None:
             configuration = Configuration.get_default_copy()
         self.configuration = configuration
-        self.pool_threads = pool_threads
 
-        self.rest_client = rest.RESTClientObject(configuration)
+        self.rest_client = rest.RESTClientObject(configuration,
+                                                 connector=connector,
+                                                 trace_configs=trace_configs)
+        # Template headers merged with the default headers, by template
+        self._template_headers = {}
         self.default_headers = {}
         if header_name is not None:
             self.default_headers[header_name] = header_value
@@ -89,22 +121,6 @@ class ApiClient(object):
 
     async def close(self):
         await self.rest_client.close()
-        if self._pool:
-            self._pool.close()
-            self._pool.join()
-            self._pool = None
-            if hasattr(atexit, 'unregister'):
-                atexit.unregister(self.close)
-
-    @property
-    def pool(self):
-        """Create thread pool on first request
-         avoids instantiating unused threadpool for blocking clients.
-        """
-        if self._pool is None:
-            atexit.register(self.close)
-            self._pool = ThreadPool(self.pool_threads)
-        return self._pool
 
     @property
     def user_agent(self):
@@ -114,9 +130,11 @@ class ApiClient(object):
     @user_agent.setter
     def user_agent(self, value):
         self.default_headers['User-Agent'] = value
+        self._template_headers.clear()
 
     def set_default_header(self, header_name, header_value):
         self.default_headers[header_name] = header_value
+        self._template_headers.clear()
 
     async def __call_api(
             self, resource_path, method, path_params=None,
@@ -198,28 +216,91 @@ class ApiClient(object):
         if not _preload_content:
             return return_data
 
+        return_data = self.__deserialize_response(response_data,
+                                                  response_types_map)
+
+        if _return_http_data_only:
+            return (return_data)
+        else:
+            return (return_data, response_data.status,
+                    response_data.getheaders())
+
+    async def call_template(self, template, path_params=None,
+                            post_params=None, files=None,
+                            _request_timeout=None):
+        """Makes the HTTP request described by a RequestTemplate and returns
+        the deserialized data only.
+
+        :param template: RequestTemplate of the endpoint.
+        :param path_params: Path parameters by json name.
+        :param post_params: Form parameters as a list of (json name, value).
+        :param files dict: key -> filename, value -> filepath.
+        :param _request_timeout: timeout setting for this request.
+        :return: The deserialized response data.
+        """
+        headers = self._template_headers.get(template)
+        if headers is None:
+            headers = dict(template.headers)
+            headers.update(self.default_headers)
+            if self.cookie:
+                headers['Cookie'] = self.cookie
+            self._template_headers[template] = headers
+
+        resource_path = template.resource_path
+        if path_params:
+            for k, v in six.iteritems(path_params):
+                resource_path = resource_path.replace(
+                    '{%s}' % k,
+                    quote(str(v),
+                          safe=self.configuration.safe_chars_for_path_param)
+                )
+
+        if post_params or files:
+            post_params = [(k, self.sanitize_for_serialization(v))
+                           for k, v in post_params or []]
+            post_params.extend(self.files_parameters(files))
+
+        try:
+            # The rest client removes the multipart Content-Type, so it gets
+            # its own copy of the cached headers
+            response_data = await self.request(
+                template.method, self.configuration.host + resource_path,
+                headers=dict(headers), post_params=post_params,
+                _request_timeout=_request_timeout)
+        except ApiException as e:
+            e.body = e.body.decode('utf-8')
+            raise e
+
+        self.last_response = response_data
+
+        return self.__deserialize_response(response_data,
+                                           template.response_types_map)
+
+    def __deserialize_response(self, response_data, response_types_map):
+        """Decodes and deserializes a preloaded response.
+
+        :param response_data: RESTResponse object to be deserialized.
+        :param response_types_map: Response type by status code.
+        :return: deserialized object, or None for unmapped status codes.
+        """
         response_type = response_types_map.get(response_data.status, None)
 
         if six.PY3 and response_type not in ["file", "bytes"]:
             match = None
             content_type = response_data.getheader('content-type')
             if content_type is not None:
-                match = re.search(r"charset=([a-zA-Z\-\d]+)[\s\;]?", content_type)
+                match = CHARSET_PATTERN.search(content_type)
             encoding = match.group(1) if match else "utf-8"
-            response_data.data = response_data.data.decode(encoding)
+            # The JSON codec decodes UTF-8 bytes directly, so only bodies in
+            # other charsets are converted to str up front
+            if encoding.lower() not in ('utf-8', 'utf8'):
+                response_data.data = response_data.data.decode(encoding)
 
         # deserialize response data
 
         if response_type:
-            return_data = self.deserialize(response_data, response_type)
-        else:
-            return_data = None
-
-        if _return_http_data_only:
-            return (return_data)
-        else:
-            return (return_data, response_data.status,
-                    response_data.getheaders())
+            return self.deserialize(response_data, response_type)
+        return None
 
     def sanitize_for_serialization(self, obj):
         """Builds a JSON POST object.
@@ -256,9 +337,16 @@ class ApiClient(object):
             # and attributes which value is not None.
             # Convert attribute name to json key in
             # model definition for request.
-            obj_dict = {obj.attribute_map[attr]: getattr(obj, attr)
-                        for attr, _ in six.iteritems(obj.openapi_types)
-                        if getattr(obj, attr) is not None}
+            fields = self._serialization_fields.get(type(obj))
+            if fields is None:
+                fields = tuple((attr, obj.attribute_map[attr])
+                               for attr in obj.openapi_types)
+                self._serialization_fields[type(obj)] = fields
+            obj_dict = {}
+            for attr, json_key in fields:
+                value = getattr(obj, attr)
+                if value is not None:
+                    obj_dict[json_key] = value
 
         return {key: self.sanitize_for_serialization(val)
                 for key, val in six.iteritems(obj_dict)}
@@ -279,9 +367,11 @@ class ApiClient(object):
 
         # fetch data from response object
         try:
-            data = json.loads(response.data)
+            data = json_codec.loads(response.data)
         except ValueError:
             data = response.data
+            if isinstance(data, bytes):
+                data = data.decode('utf-8')
 
         return self.__deserialize(data, response_type)
 
@@ -296,33 +386,100 @@ class ApiClient(object):
         if data is None:
             return None
 
+        return self._get_deserialization_plan(klass)(self, data)
+
+    @classmethod
+    def _get_deserialization_plan(cls, klass):
+        """Returns the cached deserialization plan for a type.
+
+        A plan is a function taking the client and the non-None data, which
+        resolves the type string and its nested types only once.
+
+        :param klass: class literal, or string of class name.
+        :return: function(api_client, data) returning the object.
+        """
+        plan = cls._deserialization_plans.get(klass)
+        if plan is None:
+            plan = cls.__compile_deserialization_plan(klass)
+            cls._deserialization_plans[klass] = plan
+        return plan
+
+    @classmethod
+    def __compile_deserialization_plan(cls, klass):
         if type(klass) == str:
             if klass.startswith('list['):
                 sub_kls = re.match(r'list\[(.*)\]', klass).group(1)
-                return [self.__deserialize(sub_data, sub_kls)
-                        for sub_data in data]
+                sub_plan = cls._get_deserialization_plan(sub_kls)
+                return lambda client, data: [
+                    None if sub_data is None else sub_plan(client, sub_data)
+                    for sub_data in data]
 
             if klass.startswith('dict['):
                 sub_kls = re.match(r'dict\[([^,]*), (.*)\]', klass).group(2)
-                return {k: self.__deserialize(v, sub_kls)
-                        for k, v in six.iteritems(data)}
+                sub_plan = cls._get_deserialization_plan(sub_kls)
+                return lambda client, data: {
+                    k: None if v is None else sub_plan(client, v)
+                    for k, v in six.iteritems(data)}
 
             # convert str to class
-            if klass in self.NATIVE_TYPES_MAPPING:
-                klass = self.NATIVE_TYPES_MAPPING[klass]
+            if klass in cls.NATIVE_TYPES_MAPPING:
+                klass = cls.NATIVE_TYPES_MAPPING[klass]
             else:
                 klass = getattr(openapi_client.models, klass)
 
-        if klass in self.PRIMITIVE_TYPES:
-            return self.__deserialize_primitive(data, klass)
+        if klass in cls.PRIMITIVE_TYPES:
+            return lambda client, data: client.__deserialize_primitive(
+                data, klass)
         elif klass == object:
-            return self.__deserialize_object(data)
+            return lambda client, data: client.__deserialize_object(data)
         elif klass == datetime.date:
-            return self.__deserialize_date(data)
+            return lambda client, data: client.__deserialize_date(data)
         elif klass == datetime.datetime:
-            return self.__deserialize_datetime(data)
+            return lambda client, data: client.__deserialize_datetime(data)
         else:
-            return self.__deserialize_model(data, klass)
+            return cls.__compile_model_plan(klass)
+
+    @classmethod
+    def __compile_model_plan(cls, klass):
+        """Compiles the plan for a model class.
+
+        The plan holds the json key and nested plan of every attribute, so
+        deserializing a response only walks the keys present in the data.
+        """
+        has_discriminator = bool(hasattr(klass, 'get_real_child_model')
+                                 and klass.discriminator_value_class_map)
+
+        if not klass.openapi_types and has_discriminator is False:
+            return lambda client, data: data
+
+        fields = []
+
+        def deserialize_model(client, data):
+            kwargs = {}
+            if isinstance(data, dict):
+                for attr, json_key, attr_plan in fields:
+                    if json_key in data:
+                        value = data[json_key]
+                        kwargs[attr] = (None if value is None
+                                        else attr_plan(client, value))
+
+            kwargs["local_vars_configuration"] = client.configuration
+            instance = klass(**kwargs)
+
+            if has_discriminator:
+                klass_name = instance.get_real_child_model(data)
+                if klass_name:
+                    instance = client.__deserialize(data, klass_name)
+            return instance
+
+        # Register the plan before resolving attribute types so models that
+        # reference themselves resolve to this plan instead of recursing
+        cls._deserialization_plans[klass] = deserialize_model
+        for attr, attr_type in six.iteritems(klass.openapi_types):
+            fields.append((attr, klass.attribute_map[attr],
+                           cls._get_deserialization_plan(attr_type)))
+
+        return deserialize_model
 
     def call_api(self, resource_path, method,
                  path_params=None, query_params=None, header_params=None,
@@ -331,9 +488,10 @@ class ApiClient(object):
                  async_req=None, _return_http_data_only=None,
                  collection_formats=None,_preload_content=True,
                   _request_timeout=None, _host=None, _request_auth=None):
-        """Makes the HTTP request (synchronous) and returns deserialized data.
+        """Makes the HTTP request and returns deserialized data.
 
-        To make an async_req request, set the async_req parameter.
+        Returns a coroutine to await. To schedule the request on the running
+        event loop straight away, set the async_req parameter.
 
         :param resource_path: Path to method endpoint.
         :param method: Method to call.
@@ -366,32 +524,21 @@ class ApiClient(object):
         :type _request_token: dict, optional
         :return:
             If async_req parameter is True,
-            the request will be called asynchronously.
-            The method will return the request thread.
-            If parameter async_req is False or missing,
-            then the method will return the response directly.
+            the request is scheduled as an asyncio.Task and the task is
+            returned. Otherwise a coroutine returning the response is
+            returned.
         """
+        coroutine = self.__call_api(resource_path, method,
+                                    path_params, query_params, header_params,
+                                    body, post_params, files,
+                                    response_types_map, auth_settings,
+                                    _return_http_data_only, collection_formats,
+                                    _preload_content, _request_timeout, _host,
+                                    _request_auth)
         if not async_req:
-            return self.__call_api(resource_path, method,
-                                   path_params, query_params, header_params,
-                                   body, post_params, files,
-                                   response_types_map, auth_settings,
-                                   _return_http_data_only, collection_formats,
-                                   _preload_content, _request_timeout, _host,
-                                   _request_auth)
-
-        return self.pool.apply_async(self.__call_api, (resource_path,
-                                                       method, path_params,
-                                                       query_params,
-                                                       header_params, body,
-                                                       post_params, files,
-                                                       response_types_map,
-                                                       auth_settings,
-                                                       _return_http_data_only,
-                                                       collection_formats,
-                                                       _preload_content,
-                                                       _request_timeout,
-                                                       _host, _request_auth))
+            return coroutine
+
+        return asyncio.ensure_future(coroutine)
 
     def request(self, method, url, query_params=None, headers=None,
                 post_params=None, body=None, _preload_content=True,
@@ -683,28 +830,4 @@ class ApiClient(object):
         :param klass: class literal.
         :return: model object.
         """
-        has_discriminator = False
-        if (hasattr(klass, 'get_real_child_model')
-                and klass.discriminator_value_class_map):
-            has_discriminator = True
-
-        if not klass.openapi_types and has_discriminator is False:
-            return data
-
-        kwargs = {}
-        if (data is not None and
-                klass.openapi_types is not None and
-                isinstance(data, (list, dict))):
-            for attr, attr_type in six.iteritems(klass.openapi_types):
-                if klass.attribute_map[attr] in data:
-                    value = data[klass.attribute_map[attr]]
-                    kwargs[attr] = self.__deserialize(value, attr_type)
-
-        kwargs["local_vars_configuration"] = self.configuration
-        instance = klass(**kwargs)
-
-        if has_discriminator:
-            klass_name = instance.get_real_child_model(data)
-            if klass_name:
-                instance = self.__deserialize(data, klass_name)
-        return instance
+        return self._get_deserialization_plan(klass)(self, data)
@@ -83,6 +83,7 @@ class Configuration(object):
     """
 
     _default = None
+    _shared_default = None
 
     def __init__(self, host=None,
                  api_key=None, api_key_prefix=None,
@@ -199,7 +200,7 @@ class Configuration(object):
         result = cls.__new__(cls)
         memo[id(self)] = result
         for k, v in self.__dict__.items():
-            if k not in ('logger', 'logger_file_handler'):
+            if k not in ('logger', 'logger_file_handler', '_frozen'):
                 setattr(result, k, copy.deepcopy(v, memo))
         # shallow copy of loggers
         result.logger = copy.copy(self.logger)
@@ -209,6 +210,10 @@ class Configuration(object):
         return result
 
     def __setattr__(self, name, value):
+        if self.__dict__.get('_frozen'):
+            raise ApiValueError(
+                "The shared default configuration cannot be modified. "
+                "Use get_default_copy to get a configuration to change.")
         object.__setattr__(self, name, value)
         if name == 'disabled_client_side_validations':
             s = set(filter(None, value.split(',')))
@@ -243,6 +248,24 @@ class Configuration(object):
             return copy.deepcopy(cls._default)
         return Configuration()
 
+    @classmethod
+    def get_default(cls):
+        """Return the default configuration without copying it.
+
+        Models only read their configuration, so they share this instance
+        instead of each building their own. It is frozen when it was not
+        passed to set_default, so it cannot be changed by accident.
+
+        :return: The configuration object.
+        """
+        if cls._default is not None:
+            return cls._default
+        if cls._shared_default is None:
+            shared_default = Configuration()
+            object.__setattr__(shared_default, '_frozen', True)
+            cls._shared_default = shared_default
+        return cls._shared_default
+
     @property
     def logger_file(self):
         """The logger file.
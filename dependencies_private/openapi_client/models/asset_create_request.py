@@ -35,6 +35,14 @@ class AssetCreateRequest(object):
       attribute_map (dict): The key is attribute name
                             and the value is json key in definition.
     """
+    __slots__ = (
+        'local_vars_configuration',
+        '_request',
+        '_file_content'
+    )
+
+    discriminator = None
+
     openapi_types = {
         'request': 'AssetCreateRequestRequest',
         'file_content': 'file'
@@ -48,12 +56,11 @@ class AssetCreateRequest(object):
     def __init__(self, request=None, file_content=None, local_vars_configuration=None):  # noqa: E501
         """AssetCreateRequest - a model defined in OpenAPI"""  # noqa: E501
         if local_vars_configuration is None:
-            local_vars_configuration = Configuration.get_default_copy()
+            local_vars_configuration = Configuration.get_default()
         self.local_vars_configuration = local_vars_configuration
 
         self._request = None
         self._file_content = None
-        self.discriminator = None
 
         if request is not None:
             self.request = request
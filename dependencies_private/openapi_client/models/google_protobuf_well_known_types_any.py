@@ -35,6 +35,14 @@ class GoogleProtobufWellKnownTypesAny(object):
       attribute_map (dict): The key is attribute name
                             and the value is json key in definition.
     """
+    __slots__ = (
+        'local_vars_configuration',
+        '_type_url',
+        '_value'
+    )
+
+    discriminator = None
+
     openapi_types = {
         'type_url': 'str',
         'value': 'list[int]'
@@ -48,12 +56,11 @@ class GoogleProtobufWellKnownTypesAny(object):
     def __init__(self, type_url=None, value=None, local_vars_configuration=None):  # noqa: E501
         """GoogleProtobufWellKnownTypesAny - a model defined in OpenAPI"""  # noqa: E501
         if local_vars_configuration is None:
-            local_vars_configuration = Configuration.get_default_copy()
+            local_vars_configuration = Configuration.get_default()
         self.local_vars_configuration = local_vars_configuration
 
         self._type_url = None
         self._value = None
-        self.discriminator = None
 
         self.type_url = type_url
         self.value = value
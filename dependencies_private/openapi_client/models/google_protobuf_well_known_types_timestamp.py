@@ -35,6 +35,14 @@ class GoogleProtobufWellKnownTypesTimestamp(object):
       attribute_map (dict): The key is attribute name
                             and the value is json key in definition.
     """
+    __slots__ = (
+        'local_vars_configuration',
+        '_seconds',
+        '_nanos'
+    )
+
+    discriminator = None
+
     openapi_types = {
         'seconds': 'int',
         'nanos': 'int'
@@ -48,12 +56,11 @@ class GoogleProtobufWellKnownTypesTimestamp(object):
     def __init__(self, seconds=None, nanos=None, local_vars_configuration=None):  # noqa: E501
         """GoogleProtobufWellKnownTypesTimestamp - a model defined in OpenAPI"""  # noqa: E501
         if local_vars_configuration is None:
-            local_vars_configuration = Configuration.get_default_copy()
+            local_vars_configuration = Configuration.get_default()
         self.local_vars_configuration = local_vars_configuration
 
         self._seconds = None
         self._nanos = None
-        self.discriminator = None
 
         if seconds is not None:
             self.seconds = seconds
@@ -35,6 +35,15 @@ class GoogleRpcStatus(object):
       attribute_map (dict): The key is attribute name
                             and the value is json key in definition.
     """
+    __slots__ = (
+        'local_vars_configuration',
+        '_code',
+        '_message',
+        '_details'
+    )
+
+    discriminator = None
+
     openapi_types = {
         'code': 'str',
         'message': 'str',
@@ -50,13 +59,12 @@ class GoogleRpcStatus(object):
     def __init__(self, code=None, message=None, details=None, local_vars_configuration=None):  # noqa: E501
         """GoogleRpcStatus - a model defined in OpenAPI"""  # noqa: E501
         if local_vars_configuration is None:
-            local_vars_configuration = Configuration.get_default_copy()
+            local_vars_configuration = Configuration.get_default()
         self.local_vars_configuration = local_vars_configuration
 
         self._code = None
         self._message = None
         self._details = None
-        self.discriminator = None
 
         if code is not None:
             self.code = code
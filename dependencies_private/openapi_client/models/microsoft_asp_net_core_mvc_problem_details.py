@@ -35,6 +35,17 @@ class MicrosoftAspNetCoreMvcProblemDetails(object):
       attribute_map (dict): The key is attribute name
                             and the value is json key in definition.
     """
+    __slots__ = (
+        'local_vars_configuration',
+        '_type',
+        '_title',
+        '_status',
+        '_detail',
+        '_instance'
+    )
+
+    discriminator = None
+
     openapi_types = {
         'type': 'str',
         'title': 'str',
@@ -54,7 +65,7 @@ class MicrosoftAspNetCoreMvcProblemDetails(object):
     def __init__(self, type=None, title=None, status=None, detail=None, instance=None, local_vars_configuration=None):  # noqa: E501
         """MicrosoftAspNetCoreMvcProblemDetails - a model defined in OpenAPI"""  # noqa: E501
         if local_vars_configuration is None:
-            local_vars_configuration = Configuration.get_default_copy()
+            local_vars_configuration = Configuration.get_default()
         self.local_vars_configuration = local_vars_configuration
 
         self._type = None
@@ -62,7 +73,6 @@ class MicrosoftAspNetCoreMvcProblemDetails(object):
         self._status = None
         self._detail = None
         self._instance = None
-        self.discriminator = None
 
         self.type = type
         self.title = title
@@ -35,6 +35,16 @@ class RobloxAssetsManagementAssetsUploadApiFile(object):
       attribute_map (dict): The key is attribute name
                             and the value is json key in definition.
     """
+    __slots__ = (
+        'local_vars_configuration',
+        '_content_type',
+        '_filesize',
+        '_md5_checksum',
+        '_chunk_plan'
+    )
+
+    discriminator = None
+
     openapi_types = {
         'content_type': 'str',
         'filesize': 'int',
@@ -52,14 +62,13 @@ class RobloxAssetsManagementAssetsUploadApiFile(object):
     def __init__(self, content_type=None, filesize=None, md5_checksum=None, chunk_plan=None, local_vars_configuration=None):  # noqa: E501
         """RobloxAssetsManagementAssetsUploadApiFile - a model defined in OpenAPI"""  # noqa: E501
         if local_vars_configuration is None:
-            local_vars_configuration = Configuration.get_default_copy()
+            local_vars_configuration = Configuration.get_default()
         self.local_vars_configuration = local_vars_configuration
 
         self._content_type = None
         self._filesize = None
         self._md5_checksum = None
         self._chunk_plan = None
-        self.discriminator = None
 
         self.content_type = content_type
         if filesize is not None:
@@ -35,6 +35,15 @@ class RobloxAssetsManagementAssetsUploadApiGetUploadStatusResponse(object):
       attribute_map (dict): The key is attribute name
                             and the value is json key in definition.
     """
+    __slots__ = (
+        'local_vars_configuration',
+        '_status',
+        '_result',
+        '_public_error'
+    )
+
+    discriminator = None
+
     openapi_types = {
         'status': 'RobloxOperationscoreOperationserviceV1Beta1OperationStatus',
         'result': 'RobloxOperationscoreOperationserviceV1Beta1PublicAssetCreationResult',
@@ -50,13 +59,12 @@ class RobloxAssetsManagementAssetsUploadApiGetUploadStatusResponse(object):
     def __init__(self, status=None, result=None, public_error=None, local_vars_configuration=None):  # noqa: E501
         """RobloxAssetsManagementAssetsUploadApiGetUploadStatusResponse - a model defined in OpenAPI"""  # noqa: E501
         if local_vars_configuration is None:
-            local_vars_configuration = Configuration.get_default_copy()
+            local_vars_configuration = Configuration.get_default()
         self.local_vars_configuration = local_vars_configuration
 
         self._status = None
         self._result = None
         self._public_error = None
-        self.discriminator = None
 
         if status is not None:
             self.status = status
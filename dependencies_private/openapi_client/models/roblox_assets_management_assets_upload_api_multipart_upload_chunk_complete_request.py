@@ -35,6 +35,14 @@ class RobloxAssetsManagementAssetsUploadApiMultipartUploadChunkCompleteRequest(o
       attribute_map (dict): The key is attribute name
                             and the value is json key in definition.
     """
+    __slots__ = (
+        'local_vars_configuration',
+        '_chunk_num',
+        '_e_tag'
+    )
+
+    discriminator = None
+
     openapi_types = {
         'chunk_num': 'int',
         'e_tag': 'str'
@@ -48,12 +56,11 @@ class RobloxAssetsManagementAssetsUploadApiMultipartUploadChunkCompleteRequest(o
     def __init__(self, chunk_num=None, e_tag=None, local_vars_configuration=None):  # noqa: E501
         """RobloxAssetsManagementAssetsUploadApiMultipartUploadChunkCompleteRequest - a model defined in OpenAPI"""  # noqa: E501
         if local_vars_configuration is None:
-            local_vars_configuration = Configuration.get_default_copy()
+            local_vars_configuration = Configuration.get_default()
         self.local_vars_configuration = local_vars_configuration
 
         self._chunk_num = None
         self._e_tag = None
-        self.discriminator = None
 
         if chunk_num is not None:
             self.chunk_num = chunk_num
@@ -35,6 +35,14 @@ class RobloxAssetsManagementAssetsUploadApiMultipartUploadStartRequest(object):
       attribute_map (dict): The key is attribute name
                             and the value is json key in definition.
     """
+    __slots__ = (
+        'local_vars_configuration',
+        '_asset',
+        '_file'
+    )
+
+    discriminator = None
+
     openapi_types = {
         'asset': 'RobloxOpenCloudAssetsV1Asset',
         'file': 'RobloxAssetsManagementAssetsUploadApiFile'
@@ -48,12 +56,11 @@ class RobloxAssetsManagementAssetsUploadApiMultipartUploadStartRequest(object):
     def __init__(self, asset=None, file=None, local_vars_configuration=None):  # noqa: E501
         """RobloxAssetsManagementAssetsUploadApiMultipartUploadStartRequest - a model defined in OpenAPI"""  # noqa: E501
         if local_vars_configuration is None:
-            local_vars_configuration = Configuration.get_default_copy()
+            local_vars_configuration = Configuration.get_default()
         self.local_vars_configuration = local_vars_configuration
 
         self._asset = None
         self._file = None
-        self.discriminator = None
 
         if asset is not None:
             self.asset = asset
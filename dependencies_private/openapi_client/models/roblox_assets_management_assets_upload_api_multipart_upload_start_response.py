@@ -35,6 +35,14 @@ class RobloxAssetsManagementAssetsUploadApiMultipartUploadStartResponse(object):
       attribute_map (dict): The key is attribute name
                             and the value is json key in definition.
     """
+    __slots__ = (
+        'local_vars_configuration',
+        '_operation_path',
+        '_upload_urls'
+    )
+
+    discriminator = None
+
     openapi_types = {
         'operation_path': 'str',
         'upload_urls': 'list[RobloxAssetsManagementAssetsUploadApiPreSignedUploadUrl]'
@@ -48,12 +56,11 @@ class RobloxAssetsManagementAssetsUploadApiMultipartUploadStartResponse(object):
     def __init__(self, operation_path=None, upload_urls=None, local_vars_configuration=None):  # noqa: E501
         """RobloxAssetsManagementAssetsUploadApiMultipartUploadStartResponse - a model defined in OpenAPI"""  # noqa: E501
         if local_vars_configuration is None:
-            local_vars_configuration = Configuration.get_default_copy()
+            local_vars_configuration = Configuration.get_default()
         self.local_vars_configuration = local_vars_configuration
 
         self._operation_path = None
         self._upload_urls = None
-        self.discriminator = None
 
         self.operation_path = operation_path
         self.upload_urls = upload_urls
@@ -35,6 +35,18 @@ class RobloxAssetsManagementAssetsUploadApiPreSignedUploadUrl(object):
       attribute_map (dict): The key is attribute name
                             and the value is json key in definition.
     """
+    __slots__ = (
+        'local_vars_configuration',
+        '_http_verb',
+        '_url',
+        '_expiration_time_ms',
+        '_chunk_num',
+        '_content_start',
+        '_content_length'
+    )
+
+    discriminator = None
+
     openapi_types = {
         'http_verb': 'str',
         'url': 'str',
@@ -56,7 +68,7 @@ class RobloxAssetsManagementAssetsUploadApiPreSignedUploadUrl(object):
     def __init__(self, http_verb=None, url=None, expiration_time_ms=None, chunk_num=None, content_start=None, content_length=None, local_vars_configuration=None):  # noqa: E501
         """RobloxAssetsManagementAssetsUploadApiPreSignedUploadUrl - a model defined in OpenAPI"""  # noqa: E501
         if local_vars_configuration is None:
-            local_vars_configuration = Configuration.get_default_copy()
+            local_vars_configuration = Configuration.get_default()
         self.local_vars_configuration = local_vars_configuration
 
         self._http_verb = None
@@ -65,7 +77,6 @@ class RobloxAssetsManagementAssetsUploadApiPreSignedUploadUrl(object):
         self._chunk_num = None
         self._content_start = None
         self._content_length = None
-        self.discriminator = None
 
         self.http_verb = http_verb
         self.url = url
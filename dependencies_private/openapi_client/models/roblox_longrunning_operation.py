@@ -35,6 +35,18 @@ class RobloxLongrunningOperation(object):
       attribute_map (dict): The key is attribute name
                             and the value is json key in definition.
     """
+    __slots__ = (
+        'local_vars_configuration',
+        '_path',
+        '_metadata',
+        '_done',
+        '_error',
+        '_response',
+        '_result_case'
+    )
+
+    discriminator = None
+
     openapi_types = {
         'path': 'str',
         'metadata': 'GoogleProtobufWellKnownTypesAny',
@@ -56,7 +68,7 @@ class RobloxLongrunningOperation(object):
     def __init__(self, path=None, metadata=None, done=None, error=None, response=None, result_case=None, local_vars_configuration=None):  # noqa: E501
         """RobloxLongrunningOperation - a model defined in OpenAPI"""  # noqa: E501
         if local_vars_configuration is None:
-            local_vars_configuration = Configuration.get_default_copy()
+            local_vars_configuration = Configuration.get_default()
         self.local_vars_configuration = local_vars_configuration
 
         self._path = None
@@ -65,7 +77,6 @@ class RobloxLongrunningOperation(object):
         self._error = None
         self._response = None
         self._result_case = None
-        self.discriminator = None
 
         self.path = path
         if metadata is not None:
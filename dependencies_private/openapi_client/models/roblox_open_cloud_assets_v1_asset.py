@@ -35,6 +35,21 @@ class RobloxOpenCloudAssetsV1Asset(object):
       attribute_map (dict): The key is attribute name
                             and the value is json key in definition.
     """
+    __slots__ = (
+        'local_vars_configuration',
+        '_path',
+        '_revision_id',
+        '_revision_create_time',
+        '_asset_id',
+        '_display_name',
+        '_description',
+        '_asset_type',
+        '_creation_context',
+        '_moderation_result'
+    )
+
+    discriminator = None
+
     openapi_types = {
         'path': 'str',
         'revision_id': 'str',
@@ -62,7 +77,7 @@ class RobloxOpenCloudAssetsV1Asset(object):
     def __init__(self, path=None, revision_id=None, revision_create_time=None, asset_id=None, display_name=None, description=None, asset_type=None, creation_context=None, moderation_result=None, local_vars_configuration=None):  # noqa: E501
         """RobloxOpenCloudAssetsV1Asset - a model defined in OpenAPI"""  # noqa: E501
         if local_vars_configuration is None:
-            local_vars_configuration = Configuration.get_default_copy()
+            local_vars_configuration = Configuration.get_default()
         self.local_vars_configuration = local_vars_configuration
 
         self._path = None
@@ -74,7 +89,6 @@ class RobloxOpenCloudAssetsV1Asset(object):
         self._asset_type = None
         self._creation_context = None
         self._moderation_result = None
-        self.discriminator = None
 
         self.path = path
         self.revision_id = revision_id
@@ -35,6 +35,14 @@ class RobloxOpenCloudAssetsV1CreationContext(object):
       attribute_map (dict): The key is attribute name
                             and the value is json key in definition.
     """
+    __slots__ = (
+        'local_vars_configuration',
+        '_creator',
+        '_expected_price'
+    )
+
+    discriminator = None
+
     openapi_types = {
         'creator': 'RobloxOpenCloudAssetsV1Creator',
         'expected_price': 'int'
@@ -48,12 +56,11 @@ class RobloxOpenCloudAssetsV1CreationContext(object):
     def __init__(self, creator=None, expected_price=None, local_vars_configuration=None):  # noqa: E501
         """RobloxOpenCloudAssetsV1CreationContext - a model defined in OpenAPI"""  # noqa: E501
         if local_vars_configuration is None:
-            local_vars_configuration = Configuration.get_default_copy()
+            local_vars_configuration = Configuration.get_default()
         self.local_vars_configuration = local_vars_configuration
 
         self._creator = None
         self._expected_price = None
-        self.discriminator = None
 
         if creator is not None:
             self.creator = creator
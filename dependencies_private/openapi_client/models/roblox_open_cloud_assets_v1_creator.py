@@ -35,6 +35,15 @@ class RobloxOpenCloudAssetsV1Creator(object):
       attribute_map (dict): The key is attribute name
                             and the value is json key in definition.
     """
+    __slots__ = (
+        'local_vars_configuration',
+        '_user_id',
+        '_group_id',
+        '_creator_id_case'
+    )
+
+    discriminator = None
+
     openapi_types = {
         'user_id': 'int',
         'group_id': 'int',
@@ -50,13 +59,12 @@ class RobloxOpenCloudAssetsV1Creator(object):
     def __init__(self, user_id=None, group_id=None, creator_id_case=None, local_vars_configuration=None):  # noqa: E501
         """RobloxOpenCloudAssetsV1Creator - a model defined in OpenAPI"""  # noqa: E501
         if local_vars_configuration is None:
-            local_vars_configuration = Configuration.get_default_copy()
+            local_vars_configuration = Configuration.get_default()
         self.local_vars_configuration = local_vars_configuration
 
         self._user_id = None
         self._group_id = None
         self._creator_id_case = None
-        self.discriminator = None
 
         if user_id is not None:
             self.user_id = user_id
@@ -35,6 +35,13 @@ class RobloxOpenCloudAssetsV1ModerationResult(object):
       attribute_map (dict): The key is attribute name
                             and the value is json key in definition.
     """
+    __slots__ = (
+        'local_vars_configuration',
+        '_moderation_state'
+    )
+
+    discriminator = None
+
     openapi_types = {
         'moderation_state': 'RobloxOpenCloudAssetsV1ModerationState'
     }
@@ -46,11 +53,10 @@ class RobloxOpenCloudAssetsV1ModerationResult(object):
     def __init__(self, moderation_state=None, local_vars_configuration=None):  # noqa: E501
         """RobloxOpenCloudAssetsV1ModerationResult - a model defined in OpenAPI"""  # noqa: E501
         if local_vars_configuration is None:
-            local_vars_configuration = Configuration.get_default_copy()
+            local_vars_configuration = Configuration.get_default()
         self.local_vars_configuration = local_vars_configuration
 
         self._moderation_state = None
-        self.discriminator = None
 
         if moderation_state is not None:
             self.moderation_state = moderation_state
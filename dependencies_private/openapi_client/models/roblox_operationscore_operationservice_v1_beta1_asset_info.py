@@ -35,6 +35,14 @@ class RobloxOperationscoreOperationserviceV1Beta1AssetInfo(object):
       attribute_map (dict): The key is attribute name
                             and the value is json key in definition.
     """
+    __slots__ = (
+        'local_vars_configuration',
+        '_asset_id',
+        '_asset_version_number'
+    )
+
+    discriminator = None
+
     openapi_types = {
         'asset_id': 'int',
         'asset_version_number': 'int'
@@ -48,12 +56,11 @@ class RobloxOperationscoreOperationserviceV1Beta1AssetInfo(object):
     def __init__(self, asset_id=None, asset_version_number=None, local_vars_configuration=None):  # noqa: E501
         """RobloxOperationscoreOperationserviceV1Beta1AssetInfo - a model defined in OpenAPI"""  # noqa: E501
         if local_vars_configuration is None:
-            local_vars_configuration = Configuration.get_default_copy()
+            local_vars_configuration = Configuration.get_default()
         self.local_vars_configuration = local_vars_configuration
 
         self._asset_id = None
         self._asset_version_number = None
-        self.discriminator = None
 
         if asset_id is not None:
             self.asset_id = asset_id
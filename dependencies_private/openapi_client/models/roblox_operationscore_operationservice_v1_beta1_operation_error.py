@@ -35,6 +35,14 @@ class RobloxOperationscoreOperationserviceV1Beta1OperationError(object):
       attribute_map (dict): The key is attribute name
                             and the value is json key in definition.
     """
+    __slots__ = (
+        'local_vars_configuration',
+        '_error_code',
+        '_error_message'
+    )
+
+    discriminator = None
+
     openapi_types = {
         'error_code': 'RobloxOperationscoreOperationserviceV1Beta1OperationErrorTypesErrorCode',
         'error_message': 'str'
@@ -48,12 +56,11 @@ class RobloxOperationscoreOperationserviceV1Beta1OperationError(object):
     def __init__(self, error_code=None, error_message=None, local_vars_configuration=None):  # noqa: E501
         """RobloxOperationscoreOperationserviceV1Beta1OperationError - a model defined in OpenAPI"""  # noqa: E501
         if local_vars_configuration is None:
-            local_vars_configuration = Configuration.get_default_copy()
+            local_vars_configuration = Configuration.get_default()
         self.local_vars_configuration = local_vars_configuration
 
         self._error_code = None
         self._error_message = None
-        self.discriminator = None
 
         if error_code is not None:
             self.error_code = error_code
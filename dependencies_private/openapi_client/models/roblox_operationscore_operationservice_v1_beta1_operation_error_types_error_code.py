@@ -47,6 +47,10 @@ class RobloxOperationscoreOperationserviceV1Beta1OperationErrorTypesErrorCode(ob
       attribute_map (dict): The key is attribute name
                             and the value is json key in definition.
     """
+    __slots__ = ('local_vars_configuration',)
+
+    discriminator = None
+
     openapi_types = {
     }
 
@@ -56,9 +60,8 @@ class RobloxOperationscoreOperationserviceV1Beta1OperationErrorTypesErrorCode(ob
     def __init__(self, local_vars_configuration=None):  # noqa: E501
         """RobloxOperationscoreOperationserviceV1Beta1OperationErrorTypesErrorCode - a model defined in OpenAPI"""  # noqa: E501
         if local_vars_configuration is None:
-            local_vars_configuration = Configuration.get_default_copy()
+            local_vars_configuration = Configuration.get_default()
         self.local_vars_configuration = local_vars_configuration
-        self.discriminator = None
 
     def to_dict(self, serialize=False):
         """Returns the model properties as a dict"""
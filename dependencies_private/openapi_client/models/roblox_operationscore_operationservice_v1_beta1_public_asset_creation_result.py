@@ -35,6 +35,14 @@ class RobloxOperationscoreOperationserviceV1Beta1PublicAssetCreationResult(objec
       attribute_map (dict): The key is attribute name
                             and the value is json key in definition.
     """
+    __slots__ = (
+        'local_vars_configuration',
+        '_asset_info',
+        '_metadata'
+    )
+
+    discriminator = None
+
     openapi_types = {
         'asset_info': 'RobloxOperationscoreOperationserviceV1Beta1AssetInfo',
         'metadata': 'GoogleProtobufWellKnownTypesAny'
@@ -48,12 +56,11 @@ class RobloxOperationscoreOperationserviceV1Beta1PublicAssetCreationResult(objec
     def __init__(self, asset_info=None, metadata=None, local_vars_configuration=None):  # noqa: E501
         """RobloxOperationscoreOperationserviceV1Beta1PublicAssetCreationResult - a model defined in OpenAPI"""  # noqa: E501
         if local_vars_configuration is None:
-            local_vars_configuration = Configuration.get_default_copy()
+            local_vars_configuration = Configuration.get_default()
         self.local_vars_configuration = local_vars_configuration
 
         self._asset_info = None
         self._metadata = None
-        self.discriminator = None
 
         if asset_info is not None:
             self.asset_info = asset_info
@@ -35,6 +35,13 @@ class RobloxOperationscoreOperationserviceV1Beta1PublicError(object):
       attribute_map (dict): The key is attribute name
                             and the value is json key in definition.
     """
+    __slots__ = (
+        'local_vars_configuration',
+        '_errors'
+    )
+
+    discriminator = None
+
     openapi_types = {
         'errors': 'list[RobloxOperationscoreOperationserviceV1Beta1OperationError]'
     }
@@ -46,11 +53,10 @@ class RobloxOperationscoreOperationserviceV1Beta1PublicError(object):
     def __init__(self, errors=None, local_vars_configuration=None):  # noqa: E501
         """RobloxOperationscoreOperationserviceV1Beta1PublicError - a model defined in OpenAPI"""  # noqa: E501
         if local_vars_configuration is None:
-            local_vars_configuration = Configuration.get_default_copy()
+            local_vars_configuration = Configuration.get_default()
         self.local_vars_configuration = local_vars_configuration
 
         self._errors = None
-        self.discriminator = None
 
         self.errors = errors
 
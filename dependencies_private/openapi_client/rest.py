@@ -11,7 +11,6 @@
 
 
 import io
-import json
 import logging
 import re
 import ssl
@@ -20,10 +19,14 @@ import aiohttp
 # python 2 and python 3 compatibility library
 from six.moves.urllib.parse import urlencode
 
+import json_codec
+import progress_payload
 from openapi_client.exceptions import ApiException, ApiValueError
 
 logger = logging.getLogger(__name__)
 
+JSON_CONTENT_TYPE_PATTERN = re.compile('json', re.IGNORECASE)
+
 
 class RESTResponse(io.IOBase):
 
@@ -44,12 +47,51 @@ class RESTResponse(io.IOBase):
 
 class RESTClientObject(object):
 
-    def __init__(self, configuration, pools_size=4, maxsize=None):
+    def __init__(self, configuration, pools_size=4, maxsize=None,
+                 connector=None, trace_configs=None):
+        """
+        The aiohttp session, and the connector when one is not provided, are
+        only created on the first request, so constructing a client is cheap.
+
+        :param connector: an aiohttp connector shared with other clients.
+                          When provided, its connections outlive this
+                          client and it is not closed by `close`.
+        :param trace_configs: aiohttp TraceConfigs to attach to the session.
+        """
 
         # maxsize is number of requests to host that are allowed in parallel
         if maxsize is None:
             maxsize = configuration.connection_pool_maxsize
 
+        self.configuration = configuration
+        self.maxsize = maxsize
+        self.connector = connector
+        self.trace_configs = trace_configs
+
+        self.proxy = configuration.proxy
+        self.proxy_headers = configuration.proxy_headers
+
+        self._pool_manager = None
+
+    @property
+    def pool_manager(self):
+        """https pool manager, created on first use"""
+        if self._pool_manager is None:
+            connector_owner = self.connector is None
+            connector = (self.__create_connector() if connector_owner
+                         else self.connector)
+
+            self._pool_manager = aiohttp.ClientSession(
+                connector=connector,
+                connector_owner=connector_owner,
+                trace_configs=self.trace_configs,
+                trust_env=True
+            )
+        return self._pool_manager
+
+    def __create_connector(self):
+        configuration = self.configuration
+
         ssl_context = ssl.create_default_context(cafile=configuration.ssl_ca_cert)
         if configuration.cert_file:
             ssl_context.load_cert_chain(
@@ -60,22 +102,15 @@ class RESTClientObject(object):
             ssl_context.check_hostname = False
             ssl_context.verify_mode = ssl.CERT_NONE
 
-        connector = aiohttp.TCPConnector(
-            limit=maxsize,
+        return aiohttp.TCPConnector(
+            limit=self.maxsize,
             ssl=ssl_context
         )
 
-        self.proxy = configuration.proxy
-        self.proxy_headers = configuration.proxy_headers
-
-        # https pool manager
-        self.pool_manager = aiohttp.ClientSession(
-            connector=connector,
-            trust_env=True
-        )
-
     async def close(self):
-        await self.pool_manager.close()
+        if self._pool_manager is not None:
+            await self._pool_manager.close()
+            self._pool_manager = None
 
     async def request(self, method, url, query_params=None, headers=None,
                       body=None, post_params=None, _preload_content=True,
@@ -130,9 +165,9 @@ class RESTClientObject(object):
 
         # For `POST`, `PUT`, `PATCH`, `OPTIONS`, `DELETE`
         if method in ['POST', 'PUT', 'PATCH', 'OPTIONS', 'DELETE']:
-            if re.search('json', headers['Content-Type'], re.IGNORECASE):
+            if JSON_CONTENT_TYPE_PATTERN.search(headers['Content-Type']):
                 if body is not None:
-                    body = json.dumps(body)
+                    body = json_codec.dumps(body)
                 args["data"] = body
             elif headers['Content-Type'] == 'application/x-www-form-urlencoded':  # noqa: E501
                 args["data"] = aiohttp.FormData(post_params)
@@ -145,11 +180,12 @@ class RESTClientObject(object):
                     k, v = param
                     if isinstance(v, tuple) and len(v) == 3:
                         data.add_field(k,
-                                       value=v[1],
+                                       value=progress_payload.get_file_payload(
+                                           v[1], v[2]),
                                        filename=v[0],
                                        content_type=v[2])
                     elif isinstance(v, dict):
-                        data.add_field(k, json.dumps(v))
+                        data.add_field(k, json_codec.dumps(v))
                     else:
                         data.add_field(k, v)
                 args["data"] = data
@@ -0,0 +1,66 @@
+# Copyright © 2023 Roblox Corporation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+# associated documentation files (the “Software”), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial
+# portions of the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+# OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# SPDX-License-Identifier: MIT
+
+"""
+Reports how much of each uploaded file has been sent. While a callback is set in current_progress_callback, the
+Open Cloud client sends file contents as ProgressPayloads, which write in chunks and call it after each one.
+Writes wait for the connection to drain once enough is buffered, so the count follows what has actually been sent.
+"""
+
+from contextvars import ContextVar
+
+import aiohttp
+
+# Called with (bytes_sent, total_bytes) as a file is sent by requests made in the current task
+current_progress_callback = ContextVar("current_progress_callback", default=None)
+
+CHUNK_SIZE = 256 * 1024
+
+
+class ProgressPayload(aiohttp.BytesPayload):
+    """A bytes payload that calls progress_callback(bytes_sent, total_bytes) as it is written"""
+
+    def __init__(self, value, progress_callback, *args, **kwargs):
+        super().__init__(value, *args, **kwargs)
+        self._progress_callback = progress_callback
+
+    async def write(self, writer):
+        await self.write_with_length(writer, None)
+
+    async def write_with_length(self, writer, content_length):
+        view = memoryview(self._value)
+        if content_length is not None:
+            view = view[:content_length]
+
+        # A retried request writes the payload again, so progress restarts from zero
+        total_bytes = len(view)
+        self._progress_callback(0, total_bytes)
+        for start in range(0, total_bytes, CHUNK_SIZE):
+            chunk = view[start : start + CHUNK_SIZE]
+            await writer.write(chunk)
+            self._progress_callback(start + len(chunk), total_bytes)
+
+
+def get_file_payload(value, content_type):
+    """Returns the payload to send file contents as, which reports progress if a callback is set"""
+    progress_callback = current_progress_callback.get()
+    if progress_callback is None or not isinstance(value, bytes):
+        return value
+    return ProgressPayload(value, progress_callback, content_type=content_type)
@@ -32,6 +32,8 @@ if "bpy" in locals():
         importlib.reload(request_login_details)
     if "constants" in locals():
         importlib.reload(constants)
+    if "json_codec" in locals():
+        importlib.reload(json_codec)
 
 import bpy
 import asyncio
@@ -189,7 +191,7 @@ class AuthCallbackRequestHandler:
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
         from .create_http_client import create_http_client
 
-        async with create_http_client() as session:
+        async with create_http_client("token") as session:
             async with session.post(
                 constants.ACCESS_TOKEN_ENDPOINT,
                 headers=headers,
@@ -198,11 +200,14 @@ class AuthCallbackRequestHandler:
                 import aiohttp
 
                 try:
-                    response_data = await response.json()  # Raises json.JSONDecodeError
+                    import json_codec
+
+                    # Raises json.JSONDecodeError. An empty body gives None
+                    response_data = json_codec.loads_response_body(await response.read())
                     response.raise_for_status()  # Raises ClientResponseError or other ClientError
                     return response_data
                 except aiohttp.ClientResponseError as exception:
-                    error_description = response_data.get(
+                    error_description = (response_data or {}).get(
                         "error_description",
                         None,
                     )
@@ -0,0 +1,101 @@
+# Copyright © 2023 Roblox Corporation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+# associated documentation files (the “Software”), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial
+# portions of the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+# OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# SPDX-License-Identifier: MIT
+
+"""
+Keeps a small number of connections to the Open Cloud hosts open while the user is logged in, so the first
+requests of an upload do not pay for DNS, TCP and TLS setup.
+"""
+
+if "bpy" in locals():
+    # Imports have run before. Need to reload the imported modules
+    import importlib
+
+    if "event_loop" in locals():
+        importlib.reload(event_loop)
+    if "create_http_client" in locals():
+        importlib.reload(create_http_client)
+    if "constants" in locals():
+        importlib.reload(constants)
+    if "AssetsUploadClient" in locals():
+        importlib.reload(AssetsUploadClient)
+
+import bpy
+import asyncio
+from urllib.parse import urlsplit
+
+warming_task = None
+
+
+def start_warming_connections(rbx):
+    """Starts keeping connections warm in the background until the user logs out. Does nothing if already started."""
+    global warming_task
+
+    if warming_task and not warming_task.done():
+        return
+
+    from . import event_loop
+
+    warming_task = event_loop.submit(__warm_connections_while_logged_in(rbx), None)
+
+
+async def warm_connections():
+    """Opens, or keeps alive, NUM_WARM_CONNECTIONS_PER_HOST pooled connections to each host the add-on talks to"""
+    from . import constants
+    from .create_http_client import create_http_client
+
+    origins = __get_warm_origins() * constants.NUM_WARM_CONNECTIONS_PER_HOST
+
+    async with create_http_client("warm") as session:
+        # Concurrent requests cannot share a connection, so each one opens its own or refreshes an idle pooled one
+        results = await asyncio.gather(
+            *(__touch_connection(session, origin) for origin in origins), return_exceptions=True
+        )
+
+    for origin, result in zip(origins, results):
+        if isinstance(result, Exception):
+            print(f"Failed to warm connection to {origin}: {result}")
+
+
+async def __warm_connections_while_logged_in(rbx):
+    from . import constants
+
+    while rbx.is_logged_in:
+        await warm_connections()
+
+        # Touch the connections again before the pool closes them for being idle
+        await asyncio.sleep(constants.CONNECTION_KEEPALIVE_SECONDS - constants.CONNECTION_REWARM_MARGIN_SECONDS)
+
+
+async def __touch_connection(session, origin):
+    async with session.head(origin, allow_redirects=False) as response:
+        # Reading the (empty) body releases the connection back to the pool rather than closing it
+        await response.read()
+
+
+def __get_warm_origins():
+    """Returns the distinct scheme and host pairs for the assets and OAuth2 APIs"""
+    from assets_upload_client import AssetsUploadClient
+    from . import constants
+
+    urls = [AssetsUploadClient.get_base_url(), constants.REFRESH_TOKEN_ENDPOINT]
+    split_urls = [urlsplit(url) for url in urls]
+
+    # The APIs may share a host, in which case they share connections too
+    return list(dict.fromkeys(f"{split_url.scheme}://{split_url.netloc}/" for split_url in split_urls))
@@ -22,14 +22,67 @@
 
 DEFAULT_EXPORT_SCALE = 0.01  # Blender Meters are 100:1 to Studio Studs
 RBX_PACKAGE_ID_PROPERTY_NAME = "Roblox Package ID"
+RBX_IMAGE_ASSET_ID_PROPERTY_NAME = "Roblox Image ID"
+# The package ID of each generated level of detail, formatted with its level starting at 1
+RBX_LOD_PACKAGE_ID_PROPERTY_NAME = "Roblox LOD{level} Package ID"
+# Overrides the add-on preference for the largest size of the textures embedded in an object's FBX
+RBX_MAX_TEXTURE_SIZE_PROPERTY_NAME = "Roblox Max Texture Size"
+# Custom properties named with this prefix followed by the name of an FBX export setting, such as
+# "Roblox Export bake_anim", override that setting for the object or collection they are on
+RBX_EXPORT_SETTING_PROPERTY_PREFIX = "Roblox Export "
+# Image files in these formats are uploaded as they are. Images in any other format are converted to PNG first.
+IMAGE_UPLOAD_FILE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".bmp", ".tga"}
 ASSET_DESCRIPTION = "Uploaded from Blender"
 ERROR_MESSAGES = {
     "UPLOAD_TIMED_OUT": "Upload Timed Out",
+    "UPLOAD_OUTCOME_UNKNOWN": "Upload Interrupted, it may still have been created",
     "OPERATION_TIMED_OUT": "Operation Timed Out",
     "INVALID_RESPONSE": "Invalid Response",
     "ADD_ON_ERROR": "Add-on Error",
 }
 MAX_UPLOADS_PER_MIN = 25
+# The default number of files sent at once. Separate from the rate limit, this keeps the uplink from being split between
+# so many uploads that all of them finish late
+DEFAULT_MAX_CONCURRENT_UPLOADS = 3
+
+# Limits on uploaded meshes, checked before exporting so objects that would be rejected are not uploaded
+MAX_TRIANGLES_PER_MESH = 20000
+MAX_VERTICES_PER_MESH = 20000
+MAX_BONES_PER_MESH = 50
+MAX_INFLUENCES_PER_VERTEX = 4
+MAX_MESH_SIZE_STUDS = 2048
+# Faces with an area up to this, in square Blender units, are counted as having no area
+ZERO_AREA_FACE_EPSILON = 1e-12
+
+# Staging exported files
+# Files are staged in memory (tmpfs) when this much memory is available, and on disk otherwise
+MEMORY_STAGING_DIRECTORY = "/dev/shm"
+MIN_AVAILABLE_MEMORY_FOR_STAGING_BYTES = 2 * 1024**3
+# Exporting waits once this many megabytes of exported files are waiting to be uploaded, by default, checking again
+# every STAGING_POLL_INTERVAL_SECONDS
+DEFAULT_MAX_STAGED_MEGABYTES = 2048
+STAGING_POLL_INTERVAL_SECONDS = 0.25
+
+# Watch mode uploads an edited object once it has not been edited for WATCH_DEBOUNCE_SECONDS, checking for such
+# objects every WATCH_POLL_INTERVAL_SECONDS
+WATCH_DEBOUNCE_SECONDS = 2
+WATCH_POLL_INTERVAL_SECONDS = 0.5
+
+# Retrying failed requests
+# A request is attempted at most MAX_REQUEST_ATTEMPTS times, and all uploads started together share RETRIES_PER_BATCH
+MAX_REQUEST_ATTEMPTS = 4
+RETRIES_PER_BATCH = 10
+RETRY_BACKOFF_BASE_SECONDS = 1
+RETRY_BACKOFF_MAX_SECONDS = 30
+
+# Uploads whose operation was not seen to finish are resumed for this long after they started
+UPLOAD_JOURNAL_RETENTION_DAYS = 7
+
+# Connection warming
+# Idle pooled connections are closed after this many seconds. Warm connections are refreshed shortly before then
+CONNECTION_KEEPALIVE_SECONDS = 60
+CONNECTION_REWARM_MARGIN_SECONDS = 10
+NUM_WARM_CONNECTIONS_PER_HOST = 2
 
 # OAuth2 Login
 ENV = "production"
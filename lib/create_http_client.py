@@ -26,17 +26,45 @@ if "bpy" in locals():
         importlib.reload(certifi)
     if "aiohttp" in locals():
         importlib.reload(aiohttp)
+    if "constants" in locals():
+        importlib.reload(constants)
+    if "network_timing" in locals():
+        importlib.reload(network_timing)
 
 import bpy
 import ssl
 
+shared_connector = None
 
-def create_http_client():
-    """Returns a new aiohttp ClientSession that uses certifi SSL context"""
-    import certifi
-    import aiohttp
 
-    ssl_context = ssl.create_default_context(cafile=certifi.where())
-    connector = aiohttp.TCPConnector(ssl=ssl_context)
+def get_shared_connector():
+    """Returns the aiohttp TCPConnector shared by every session the add-on creates, so connections are pooled and
+    kept alive between requests instead of being set up again for each one"""
+    global shared_connector
+
+    if shared_connector is None or shared_connector.closed:
+        import certifi
+        import aiohttp
+        from . import constants
+
+        ssl_context = ssl.create_default_context(cafile=certifi.where())
+        shared_connector = aiohttp.TCPConnector(
+            ssl=ssl_context, keepalive_timeout=constants.CONNECTION_KEEPALIVE_SECONDS
+        )
+
+    return shared_connector
+
+
+def create_http_client(operation):
+    """Returns a new aiohttp ClientSession that uses certifi SSL context and the shared connection pool.
+    The timing of its requests is recorded under the given operation name.
+    """
+    import aiohttp
+    from . import network_timing
 
-    return aiohttp.ClientSession(connector=connector)
+    # The session does not own the shared connector, so closing the session leaves its connections open for reuse
+    return aiohttp.ClientSession(
+        connector=get_shared_connector(),
+        connector_owner=False,
+        trace_configs=[network_timing.create_trace_config(operation)],
+    )
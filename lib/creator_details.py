@@ -28,13 +28,20 @@ if "bpy" in locals():
         importlib.reload(get_add_on_preferences)
     if "RbxOAuth2Client" in locals():
         importlib.reload(RbxOAuth2Client)
+    if "event_loop" in locals():
+        importlib.reload(event_loop)
+    if "json_codec" in locals():
+        importlib.reload(json_codec)
 
 import bpy
 from bpy.types import PropertyGroup
 from bpy.props import StringProperty, EnumProperty
+import traceback
 
-# The properties from the rbx object that are to be loaded from / saved to Add-on preferences
+# The properties from the rbx object that are to be loaded from / saved to Add-on preferences.
+# cached_creators must load before selected_creator_enum_index so the enum index refers to a populated list
 SAVED_PROPERTY_NAMES = [
+    "cached_creators",
     "selected_creator_enum_index",
     "refresh_token",
 ]
@@ -77,6 +84,10 @@ def save_creator_details(window_manager, preferences):
 
     for property_name in SAVED_PROPERTY_NAMES:
         match property_name:
+            case "cached_creators":
+                # Creators are only worth remembering while they belong to a session that can be restored
+                has_session = rbx.is_logged_in or rbx.is_creator_data_provisional
+                value = __serialize_creators(rbx.creators) if has_session else None
             case "refresh_token":
                 from .oauth2_client import RbxOAuth2Client
 
@@ -115,6 +126,9 @@ def load_creator_details(window_manager, preferences):
         property_holder = rbx
         property_to_set = property_name
         match property_name:
+            case "cached_creators":
+                __restore_cached_creators(rbx, getattr(add_on_preferences, property_name, None))
+                continue
             case "refresh_token":
                 from .oauth2_client import RbxOAuth2Client
 
@@ -125,3 +139,77 @@ def load_creator_details(window_manager, preferences):
 
         # Referencing with brackets to avoid triggering the update function & saving over the rest of the properties with non-loaded data
         property_holder[property_to_set] = getattr(add_on_preferences, property_name, None)
+
+    # Cached creators can only be verified by refreshing the remembered session, so without one they are discarded
+    if rbx.is_creator_data_provisional and not add_on_preferences.refresh_token:
+        rbx.creators.clear()
+        rbx.is_creator_data_provisional = False
+
+
+def schedule_creator_revalidation():
+    """Refreshes the remembered session in the background, replacing the provisional creators restored from the cache
+    with the creators currently authorized. Runs from a timer since operators cannot be invoked while drawing the UI.
+    """
+    bpy.app.timers.register(__revalidate_creator_details, first_interval=0)
+
+
+def __revalidate_creator_details():
+    window_manager = bpy.context.window_manager
+    rbx = window_manager.rbx
+
+    from .oauth2_client import RbxOAuth2Client
+
+    oauth2_client = RbxOAuth2Client(rbx)
+
+    def on_revalidation_complete(task):
+        try:
+            task.result()
+        except Exception as exception:
+            # The cached creators could not be verified. Clearing them leaves the remembered refresh token in place,
+            # so logging in manually follows the usual path of refreshing, or logging out and prompting a browser login
+            traceback.print_exception(exception)
+            rbx.creators.clear()
+            rbx.is_creator_data_provisional = False
+            # Forget the cache too, so the same stale creators are not restored and revalidated on every start
+            save_creator_details(window_manager, bpy.context.preferences)
+        finally:
+            rbx.is_creator_data_provisional = False
+
+    # Starting the event loop requires a window to attach its modal timer to, which timers do not provide
+    from . import event_loop
+
+    with bpy.context.temp_override(window=window_manager.windows[0]):
+        event_loop.submit(oauth2_client.refresh_login_if_needed(), on_revalidation_complete)
+
+    # Returning None unregisters the timer so it only runs once
+    return None
+
+
+def __serialize_creators(creators):
+    """Returns the creators in the CollectionProperty as a JSON string that can be stored in add-on preferences"""
+    import json_codec
+
+    return json_codec.dumps([{"id": creator.id, "type": creator.type, "name": creator.name} for creator in creators])
+
+
+def __restore_cached_creators(rbx, serialized_creators):
+    """Populates the creators CollectionProperty from a JSON string saved by __serialize_creators, marking them as
+    provisional until the session is refreshed"""
+    rbx.creators.clear()
+    if not serialized_creators:
+        return
+
+    try:
+        import json_codec
+
+        for cached_creator in json_codec.loads(serialized_creators):
+            creator = rbx.creators.add()
+            creator.type = cached_creator["type"]
+            creator.id = cached_creator["id"]
+            creator.name = cached_creator["name"]
+    except Exception as exception:
+        # A corrupt cache is not worth surfacing to the user since the creators are fetched again on login
+        traceback.print_exception(exception)
+        rbx.creators.clear()
+
+    rbx.is_creator_data_provisional = len(rbx.creators) > 0
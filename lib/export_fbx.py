@@ -18,70 +18,209 @@
 
 # SPDX-License-Identifier: MIT
 
+if "bpy" in locals():
+    # Imports have run before. Need to reload the imported modules
+    import importlib
+
+    if "constants" in locals():
+        importlib.reload(constants)
+    if "str_to_int" in locals():
+        importlib.reload(str_to_int)
+    if "texture_downscaling" in locals():
+        importlib.reload(texture_downscaling)
+    if "mesh_splitting" in locals():
+        importlib.reload(mesh_splitting)
+    if "status_indicators" in locals():
+        importlib.reload(status_indicators)
+    if "watch_mode" in locals():
+        importlib.reload(watch_mode)
+    if "export_settings" in locals():
+        importlib.reload(export_settings)
+
 import bpy
+import contextlib
+import copy
+
+# Settings of the FBX export operator that only decide which objects it exports, or how its other settings are passed
+# on. The objects are given to the exporter explicitly instead.
+OPERATOR_ONLY_SETTINGS = {
+    "filepath",
+    "check_existing",
+    "filter_glob",
+    "ui_tab",
+    "use_selection",
+    "use_visible",
+    "use_active_collection",
+    "batch_mode",
+    "use_batch_own_dir",
+    "use_space_transform",
+}
+
+# The export session in progress, if any
+session = None
+
+
+class ExportSession:
+    """State shared by the exports in a session: the evaluated depsgraph, the exporter's default settings and the
+    downscaled textures"""
+
+    def __init__(self, depsgraph, default_settings, replacement_image_cache):
+        self.depsgraph = depsgraph
+        self.default_settings = default_settings
+        self.replacement_image_cache = replacement_image_cache
+
+
+class ExportReporter:
+    """Stands in for the FBX export operator, which the exporter reports warnings to"""
+
+    def report(self, type, message):
+        print(f"FBX export {', '.join(sorted(type))}: {message}")
+
+
+@contextlib.contextmanager
+def export_session(view_layer):
+    """Within the context, exports share one evaluated depsgraph and look up the exporter's settings once. The active
+    object is kept in object mode, so that edits in edit mode are exported. Nested sessions join the outermost one.
+
+    Everything a batch changes is put back once at the end: no undo steps are pushed, status changes redraw the UI
+    when the session ends, and watch mode does not look at the depsgraph updates made while exporting."""
+    from . import status_indicators, watch_mode
+    from .texture_downscaling import ReplacementImageCache
+
+    global session
+    if session:
+        yield session
+        return
+
+    with contextlib.ExitStack() as exit_stack:
+        exit_stack.enter_context(status_indicators.deferred_redraws())
+        exit_stack.enter_context(watch_mode.paused())
+
+        # As the export operator does, leave edit mode so that the mesh data is up to date. Operators called this way
+        # do not push undo steps.
+        active_object = view_layer.objects.active
+        if active_object and active_object.mode != "OBJECT" and bpy.ops.object.mode_set.poll():
+            previous_mode = active_object.mode
+            bpy.ops.object.mode_set("EXEC_DEFAULT", False, mode="OBJECT")
+            exit_stack.callback(__restore_mode, previous_mode)
 
+        depsgraph = view_layer.depsgraph
+        depsgraph.update()
+        replacement_image_cache = ReplacementImageCache()
+        exit_stack.callback(replacement_image_cache.clear)
+        session = ExportSession(depsgraph, __get_default_settings(), replacement_image_cache)
+        try:
+            yield session
+        finally:
+            session = None
 
-def __find_wrapping_layer_collection_recursively(layer_collection, target_collection):
-    """Recursively finds the LayerCollection that wraps a target collection"""
-    if layer_collection.collection == target_collection:
-        return layer_collection
 
-    for nested_layer_collection in layer_collection.children:
-        result = __find_wrapping_layer_collection_recursively(nested_layer_collection, target_collection)
-        if result:
-            return result
+def __restore_mode(mode):
+    """Returns the active object to the given mode"""
+    if bpy.ops.object.mode_set.poll():
+        bpy.ops.object.mode_set("EXEC_DEFAULT", False, mode=mode)
+
+
+def __get_default_settings():
+    """Returns the default value of each setting of the FBX export operator that the exporter itself takes, so that
+    exports match those made through the operator"""
+    import io_scene_fbx
+
+    default_settings = {}
+    for name, annotation in io_scene_fbx.ExportFBX.__annotations__.items():
+        keywords = getattr(annotation, "keywords", {})
+        if name not in OPERATOR_ONLY_SETTINGS and "default" in keywords:
+            # Set and list defaults belong to the operator, so each session gets its own
+            default_settings[name] = copy.copy(keywords["default"])
+    return default_settings
 
 
 def export_fbx(scene, view_layer, target_object, exported_file_path, preferences):
     """Exports the given object to a FBX file in the given directory_path, subject to the given preferences"""
-    collection = None
-
-    # If the object is not a collection, we'll need to create a temporary collection to house it for export
-    is_collection = isinstance(target_object, bpy.types.Collection)
-    if not is_collection:
-        collection = bpy.data.collections.new("RobloxExportCollection")
-        scene.collection.children.link(collection)
-        collection.objects.link(target_object)
+    with export_session(view_layer) as current_session:
+        # Pick up changes made since the session started, such as to the modifiers of generated objects
+        current_session.depsgraph.update()
+
+        # A mesh over the limits on uploaded meshes is exported as several parts within them, together as one model
+        if preferences.split_oversized_meshes:
+            from .mesh_splitting import split_oversized_mesh
+
+            with split_oversized_mesh(target_object, current_session.depsgraph) as export_objects:
+                return __export_fbx(
+                    scene, current_session, target_object, export_objects, exported_file_path, preferences
+                )
+
+        if isinstance(target_object, bpy.types.Collection):
+            export_objects = list(target_object.all_objects)
+        else:
+            export_objects = [target_object]
+        return __export_fbx(scene, current_session, target_object, export_objects, exported_file_path, preferences)
+
+
+def __export_fbx(scene, current_session, target_object, export_objects, exported_file_path, preferences):
+    """Exports the export objects, which stand in for the target object, to a FBX file. The objects are passed to the
+    exporter directly, so nothing is linked into the scene for the export and no undo step is pushed."""
+    from bpy_extras.io_utils import axis_conversion
+    from io_scene_fbx import export_fbx_bin
+    from .export_settings import get_is_animated, get_overridden_settings
+
+    # Embedded textures are downscaled and re-encoded for the duration of the export. Textures uploaded
+    # separately are not embedded, so they are left alone.
+    if preferences.upload_textures_separately:
+        texture_context = contextlib.nullcontext()
     else:
-        collection = target_object
-
-    # Identify the LayerCollection corresponding with our Collection
-    layer_collection = __find_wrapping_layer_collection_recursively(view_layer.layer_collection, collection)
-    # Store the previous active collection so we can reset it later
-    previous_active_layer_collection = view_layer.active_layer_collection
-    # Set the current active LayerCollection to the LayerCollection corresponding with our Layer
-    # This method is called synchronously on the main thread, so we do not need to worry about user
-    # input interfering with this selection during export
-    view_layer.active_layer_collection = layer_collection
-
-    # Ensure cleanup happens while still passing export exceptions through
-    try:
-        # Because we are using the use_active_collection parameter when we export, only objects from the collection
-        # specified will be exported
-        bpy.ops.export_scene.fbx(
-            filepath=str(exported_file_path),
-            global_scale=preferences.export_scale,
-            bake_anim=preferences.bake_anim,
-            bake_anim_use_all_bones=preferences.bake_anim_use_all_bones,
-            bake_anim_use_nla_strips=preferences.bake_anim_use_nla_strips,
-            bake_anim_use_all_actions=preferences.bake_anim_use_all_actions,
-            bake_anim_force_startend_keying=preferences.bake_anim_force_startend_keying,
-            bake_anim_step=preferences.bake_anim_step,
-            bake_anim_simplify_factor=preferences.bake_anim_simplify_factor,
-            axis_forward="-Z",
-            axis_up="Y",
-            path_mode="COPY",
-            embed_textures=True,
-            use_active_collection=True,
-            add_leaf_bones=preferences.add_leaf_bones,
-            use_custom_props=preferences.use_custom_props,
+        from . import constants
+        from .str_to_int import str_to_int
+        from .texture_downscaling import downscaled_textures
+
+        max_texture_size = str_to_int(
+            target_object.get(constants.RBX_MAX_TEXTURE_SIZE_PROPERTY_NAME),
+            default=int(preferences.max_texture_size),
+        )
+        texture_context = downscaled_textures(
+            target_object,
+            max_texture_size,
+            preferences.texture_file_format,
+            current_session.replacement_image_cache,
+            preferences.staging_location,
         )
-    finally:
-        # Return to the previous active LayerCollection
-        view_layer.active_layer_collection = previous_active_layer_collection
 
-        # If we had to make a temporary collection, remove it
-        if not is_collection:
-            bpy.data.collections.remove(collection)
+    # The exporter may modify settings such as object_types, so each export starts from its own copy of the defaults
+    settings = {name: copy.copy(value) for name, value in current_session.default_settings.items()}
+    settings.update(
+        global_scale=preferences.export_scale,
+        bake_anim=preferences.bake_anim,
+        bake_anim_use_all_bones=preferences.bake_anim_use_all_bones,
+        bake_anim_use_nla_strips=preferences.bake_anim_use_nla_strips,
+        bake_anim_use_all_actions=preferences.bake_anim_use_all_actions,
+        bake_anim_force_startend_keying=preferences.bake_anim_force_startend_keying,
+        bake_anim_step=preferences.bake_anim_step,
+        bake_anim_simplify_factor=preferences.bake_anim_simplify_factor,
+        axis_forward="-Z",
+        axis_up="Y",
+        # Textures uploaded as separate assets are left out, and only referenced by file name
+        path_mode="STRIP" if preferences.upload_textures_separately else "COPY",
+        embed_textures=not preferences.upload_textures_separately,
+        add_leaf_bones=preferences.add_leaf_bones,
+        use_custom_props=preferences.use_custom_props,
+    )
+    # Baking samples every frame of the scene, which only changes the file when something is animated
+    if settings["bake_anim"] and not get_is_animated(export_objects):
+        settings["bake_anim"] = False
+    settings = get_overridden_settings(settings, target_object)
+    # The operator converts the axes into a matrix before handing them to the exporter
+    settings["global_matrix"] = axis_conversion(to_forward=settings["axis_forward"], to_up=settings["axis_up"]).to_4x4()
+
+    with texture_context:
+        # Textures swapped in for the export must be seen by the exporter
+        current_session.depsgraph.update()
+        export_fbx_bin.save_single(
+            ExportReporter(),
+            scene,
+            current_session.depsgraph,
+            filepath=str(exported_file_path),
+            context_objects=export_objects,
+            **settings,
+        )
 
     return exported_file_path
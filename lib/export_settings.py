@@ -0,0 +1,139 @@
+# Copyright © 2023 Roblox Corporation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+# associated documentation files (the “Software”), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial
+# portions of the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+# OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# SPDX-License-Identifier: MIT
+
+"""
+Adjusts the FBX export settings for each object. Animation is not baked for objects that nothing animates, since
+baking samples every frame of the scene for nothing, and custom properties on an object or collection override
+individual export settings for it.
+"""
+
+if "bpy" in locals():
+    # Imports have run before. Need to reload the imported modules
+    import importlib
+
+    if "constants" in locals():
+        importlib.reload(constants)
+
+import bpy
+
+
+def get_is_animated(export_objects):
+    """Returns whether anything could animate the exported objects: animation data or drivers on them, on their
+    parents or on the armatures deforming them, on their data or shape keys, or constraints on any of those objects"""
+    checked_objects = set()
+    unchecked_objects = list(export_objects)
+    while unchecked_objects:
+        checked_object = unchecked_objects.pop()
+        if checked_object in checked_objects:
+            continue
+        checked_objects.add(checked_object)
+
+        object_data = checked_object.data
+        if (
+            checked_object.constraints
+            or __has_animation(checked_object)
+            or __has_animation(object_data)
+            or __has_animation(getattr(object_data, "shape_keys", None))
+        ):
+            return True
+
+        if checked_object.parent:
+            unchecked_objects.append(checked_object.parent)
+        for modifier in checked_object.modifiers:
+            if modifier.type == "ARMATURE" and modifier.object:
+                unchecked_objects.append(modifier.object)
+    return False
+
+
+def get_overridden_settings(settings, target_object):
+    """Returns a copy of the export settings with those overridden by the custom properties of the object or
+    collection replaced. Overrides of unknown settings, or with values that do not suit the setting, are ignored."""
+    from . import constants
+
+    prefix = constants.RBX_EXPORT_SETTING_PROPERTY_PREFIX
+    overridden_settings = dict(settings)
+    for property_name in target_object.keys():
+        if not property_name.startswith(prefix):
+            continue
+
+        setting_name = property_name[len(prefix) :]
+        if setting_name not in settings or setting_name == "global_matrix":
+            print(f"Ignoring {property_name} on {target_object.name}: there is no such FBX export setting")
+            continue
+
+        try:
+            overridden_settings[setting_name] = __convert_setting_value(
+                target_object[property_name], settings[setting_name], __get_enum_identifiers(setting_name)
+            )
+        except (TypeError, ValueError):
+            print(f"Ignoring {property_name} on {target_object.name}: the value does not suit the setting")
+    return overridden_settings
+
+
+def copy_overrides(source, destination):
+    """Gives the destination the export setting overrides of the source, for objects exported in its place"""
+    from . import constants
+
+    for property_name in source.keys():
+        if property_name.startswith(constants.RBX_EXPORT_SETTING_PROPERTY_PREFIX):
+            destination[property_name] = source[property_name]
+
+
+def __has_animation(id_data):
+    """Returns whether the data-block has an action, NLA tracks or drivers"""
+    animation_data = getattr(id_data, "animation_data", None)
+    return bool(animation_data and (animation_data.action or animation_data.nla_tracks or animation_data.drivers))
+
+
+def __get_enum_identifiers(setting_name):
+    """Returns the identifiers the FBX export operator accepts for the setting, or None if it is not an enum"""
+    import io_scene_fbx
+
+    annotation = io_scene_fbx.ExportFBX.__annotations__.get(setting_name)
+    items = getattr(annotation, "keywords", {}).get("items")
+    if not isinstance(items, (list, tuple)):
+        return None
+    return {item[0] for item in items}
+
+
+def __convert_setting_value(value, current_value, enum_identifiers):
+    """Converts the value of a custom property to the type of the setting's current value. Sets, such as the object
+    types to export, are given as comma separated text. Enum values, and the items of enum sets, must be among the
+    given identifiers, unless they are None."""
+    if isinstance(current_value, bool):
+        if isinstance(value, str):
+            raise TypeError(value)
+        return bool(value)
+    if isinstance(current_value, (int, float)):
+        if isinstance(value, str):
+            raise TypeError(value)
+        return type(current_value)(value)
+    if isinstance(current_value, (set, frozenset)):
+        items = {item.strip() for item in str(value).split(",") if item.strip()}
+        if enum_identifiers is not None and not items <= enum_identifiers:
+            raise ValueError(value)
+        return items
+    if isinstance(current_value, str):
+        if not isinstance(value, str):
+            raise TypeError(value)
+        if enum_identifiers is not None and value not in enum_identifiers:
+            raise ValueError(value)
+        return value
+    raise TypeError(value)
@@ -0,0 +1,175 @@
+# Copyright © 2023 Roblox Corporation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+# associated documentation files (the “Software”), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial
+# portions of the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+# OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# SPDX-License-Identifier: MIT
+
+"""
+Exported files are staged in a directory per object, within a directory per batch, until they have been uploaded.
+Staging is in memory, on tmpfs, when there is memory to spare for it, and on disk otherwise. Staged files are deleted
+on a background thread so that the UI does not wait on large files being removed, and the space they take up is
+counted so that exporting can wait for uploads to catch up.
+"""
+
+if "bpy" in locals():
+    # Imports have run before. Need to reload the imported modules
+    import importlib
+
+    if "constants" in locals():
+        importlib.reload(constants)
+
+import bpy
+import os
+import shutil
+import tempfile
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+# The directory holding the staging directories of the batch in progress, if any
+batch_directory = None
+# The number of bytes in staging directories that have not been deleted yet
+staged_bytes = 0
+staged_bytes_lock = threading.Lock()
+# Deletes staging directories in the order they are cleaned up
+deletion_executor = None
+
+
+class StagingDirectory:
+    """A directory for the files exported for one object. Used like a tempfile.TemporaryDirectory, but cleaning it up
+    only schedules its deletion."""
+
+    def __init__(self, parent_directory):
+        self.name = tempfile.mkdtemp(dir=parent_directory)
+        self.size = 0
+        self.is_cleaned_up = False
+
+    def record_usage(self):
+        """Counts the files now in the directory towards the staged bytes"""
+        global staged_bytes
+
+        size = 0
+        for directory_path, _, file_names in os.walk(self.name):
+            for file_name in file_names:
+                try:
+                    size += os.path.getsize(os.path.join(directory_path, file_name))
+                except OSError:
+                    pass
+
+        with staged_bytes_lock:
+            staged_bytes += size - self.size
+        self.size = size
+
+    def cleanup(self):
+        """Deletes the directory and its files in the background, along with its batch directory if that batch is
+        over and nothing else is left in it"""
+        if not self.is_cleaned_up:
+            self.is_cleaned_up = True
+            parent_directory = os.path.dirname(self.name)
+            finished_batch_directory = parent_directory if parent_directory != batch_directory else None
+            delete_in_background(self.name, self.size, finished_batch_directory=finished_batch_directory)
+
+
+def start_batch(location):
+    """Makes a directory for the staging directories of a new batch, at the given location: "AUTO", "MEMORY" or
+    "DISK". The directory of the previous batch is deleted once its staging directories are."""
+    global batch_directory
+
+    previous_batch_directory = batch_directory
+    batch_directory = tempfile.mkdtemp(prefix="roblox_upload_", dir=get_staging_root(location))
+    if previous_batch_directory:
+        delete_in_background(previous_batch_directory, 0, only_if_empty=True)
+
+
+def create_directory(location):
+    """Returns a new StagingDirectory in the batch in progress. If there is none, a batch is started at the given
+    location."""
+    if not batch_directory or not os.path.isdir(batch_directory):
+        start_batch(location)
+    return StagingDirectory(batch_directory)
+
+
+def has_room(max_staged_bytes):
+    """Returns whether another object can be exported without going over the given number of staged bytes. One
+    object can always be exported while nothing is staged, however large it is. A limit of 0 means no limit."""
+    with staged_bytes_lock:
+        return max_staged_bytes <= 0 or staged_bytes == 0 or staged_bytes < max_staged_bytes
+
+
+def get_staging_root(location):
+    """Returns the directory that batch directories are made in for the given location"""
+    from . import constants
+
+    memory_directory = constants.MEMORY_STAGING_DIRECTORY
+    if location != "DISK" and os.path.isdir(memory_directory) and os.access(memory_directory, os.W_OK):
+        if location == "MEMORY" or __get_available_memory() >= constants.MIN_AVAILABLE_MEMORY_FOR_STAGING_BYTES:
+            return memory_directory
+    return tempfile.gettempdir()
+
+
+def delete_in_background(directory_path, size, only_if_empty=False, finished_batch_directory=None):
+    """Deletes the directory on a background thread, then discounts its size from the staged bytes. With
+    only_if_empty, the directory is kept if it still holds anything. The given directory of a finished batch is
+    deleted afterwards if it is left empty."""
+    global deletion_executor
+    if not deletion_executor:
+        deletion_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="RobloxStagingCleanup")
+    deletion_executor.submit(__delete_directory, directory_path, size, only_if_empty, finished_batch_directory)
+
+
+def shutdown():
+    """Waits for the deletions in progress, and deletes the directory of the last batch if nothing is left in it"""
+    global deletion_executor, batch_directory
+    if batch_directory:
+        delete_in_background(batch_directory, 0, only_if_empty=True)
+        batch_directory = None
+    if deletion_executor:
+        deletion_executor.shutdown(wait=True)
+        deletion_executor = None
+
+
+def __delete_directory(directory_path, size, only_if_empty, finished_batch_directory):
+    """Deletes the directory, then the directory of its finished batch, if any, when it is empty. Runs on the
+    deletion thread, so it only uses what it is given."""
+    global staged_bytes
+    try:
+        if only_if_empty:
+            try:
+                os.rmdir(directory_path)
+            except OSError:
+                # Staging directories still in it delete it after themselves
+                pass
+        else:
+            shutil.rmtree(directory_path, ignore_errors=True)
+            if finished_batch_directory:
+                try:
+                    os.rmdir(finished_batch_directory)
+                except OSError:
+                    pass
+    except Exception as exception:
+        traceback.print_exception(exception)
+    finally:
+        with staged_bytes_lock:
+            staged_bytes -= size
+
+
+def __get_available_memory():
+    """Returns the number of bytes of physical memory available, or 0 if it cannot be told"""
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return 0
@@ -24,13 +24,13 @@ body with a Message entry. This returns the message, regardless of either
 response type.
 """
 
-import json
-
 
 def extract_exception_message(exception):
     message = exception.body or exception.reason
     try:
-        body = json.loads(exception.body)
+        import json_codec
+
+        body = json_codec.loads(exception.body)
         if body["message"]:
             message = body["message"]
     except Exception:
@@ -0,0 +1,193 @@
+# Copyright © 2023 Roblox Corporation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+# associated documentation files (the “Software”), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial
+# portions of the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+# OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# SPDX-License-Identifier: MIT
+
+"""
+Groups selected objects that would export to the same asset, so each group can be uploaded once. Objects are
+compared by a hash of their evaluated geometry, UVs, smoothing, shape keys, materials, custom properties, rotation and
+scale. Location is left out, since copies of a kit piece placed around a scene are still the same asset. Objects that
+were already uploaded as different assets are never grouped, so neither asset is left behind.
+"""
+
+if "bpy" in locals():
+    # Imports have run before. Need to reload the imported modules
+    import importlib
+
+    if "constants" in locals():
+        importlib.reload(constants)
+
+import bpy
+import hashlib
+
+
+def group_duplicate_objects(objects, depsgraph):
+    """Returns the objects as a list of groups, in the order their first member appears. Each group holds objects
+    with identical geometry and materials, and no conflicting asset IDs, or a single object that is never
+    deduplicated."""
+    groups_by_hash = {}
+    groups = []
+    # The asset IDs of each group's members, by the group's index in groups
+    asset_ids_by_group_index = {}
+    # Linked duplicates without modifiers share their mesh, so it is only hashed once
+    mesh_hashes_by_pointer = {}
+
+    for target_object in objects:
+        geometry_hash = get_geometry_hash(target_object, depsgraph, mesh_hashes_by_pointer)
+        if geometry_hash is None:
+            groups.append([target_object])
+            continue
+
+        # An object joins the first group whose members were not uploaded as other assets
+        asset_ids = __get_asset_ids(target_object)
+        group_indices = groups_by_hash.setdefault(geometry_hash, [])
+        for group_index in group_indices:
+            group_asset_ids = asset_ids_by_group_index[group_index]
+            if all(group_asset_ids.get(name, asset_id) == asset_id for name, asset_id in asset_ids.items()):
+                groups[group_index].append(target_object)
+                group_asset_ids.update(asset_ids)
+                break
+        else:
+            group_indices.append(len(groups))
+            asset_ids_by_group_index[len(groups)] = asset_ids
+            groups.append([target_object])
+
+    return groups
+
+
+def get_representative(group):
+    """Returns the object in the group to export and upload. An object that was uploaded before is preferred, so the
+    group updates its asset rather than creating a new one."""
+    from . import constants
+
+    return next((obj for obj in group if obj.get(constants.RBX_PACKAGE_ID_PROPERTY_NAME)), group[0])
+
+
+def get_geometry_hash(target_object, depsgraph, mesh_hashes_by_pointer=None):
+    """Returns a digest of everything about the object that ends up in its exported FBX, or None if it is not an
+    object that can be compared this way. Mesh hashes are cached by mesh in the given dictionary, if any."""
+    if mesh_hashes_by_pointer is None:
+        mesh_hashes_by_pointer = {}
+
+    # Collections, non-mesh objects and animated objects export more than the mesh, so they are always uploaded alone
+    if not isinstance(target_object, bpy.types.Object) or target_object.type != "MESH" or target_object.animation_data:
+        return None
+
+    digest = hashlib.blake2b(digest_size=16)
+
+    if target_object.modifiers:
+        evaluated_object = target_object.evaluated_get(depsgraph)
+        mesh = evaluated_object.to_mesh()
+        try:
+            digest.update(__get_mesh_hash(mesh))
+        finally:
+            evaluated_object.to_mesh_clear()
+    else:
+        mesh = target_object.data
+        mesh_pointer = mesh.as_pointer()
+        if mesh_pointer not in mesh_hashes_by_pointer:
+            mesh_hashes_by_pointer[mesh_pointer] = __get_mesh_hash(mesh)
+        digest.update(mesh_hashes_by_pointer[mesh_pointer])
+
+    __update_with_shape_keys(digest, target_object.data)
+
+    for material_slot in target_object.material_slots:
+        digest.update(repr((material_slot.link, material_slot.material and material_slot.material.name)).encode())
+
+    # Custom properties are exported, and some of them override how the object is exported. The asset IDs differ
+    # between copies by design, and are compared separately.
+    asset_id_names = __get_asset_ids(target_object).keys()
+    for property_name in sorted(target_object.keys()):
+        if property_name not in asset_id_names:
+            digest.update(repr((property_name, __get_property_value(target_object[property_name]))).encode())
+
+    # Rotation and scale are applied to the exported vertices, rounded so that float noise does not split groups
+    import numpy
+
+    basis = numpy.array(target_object.matrix_world.to_3x3(), dtype=numpy.float64)
+    digest.update(numpy.round(basis, 5).tobytes())
+
+    return digest.digest()
+
+
+def __get_mesh_hash(mesh):
+    """Returns a digest of the mesh's vertex positions, topology, smoothing, material indices and UVs, read as whole
+    arrays rather than element by element"""
+    import numpy
+
+    digest = hashlib.blake2b(digest_size=16)
+
+    def update(collection, attribute, dtype, components=1):
+        values = numpy.empty(len(collection) * components, dtype=dtype)
+        collection.foreach_get(attribute, values)
+        digest.update(attribute.encode())
+        digest.update(values.tobytes())
+
+    update(mesh.vertices, "co", numpy.float32, 3)
+    update(mesh.loops, "vertex_index", numpy.int32)
+    update(mesh.polygons, "loop_total", numpy.int32)
+    update(mesh.polygons, "material_index", numpy.int32)
+    update(mesh.polygons, "use_smooth", numpy.bool_)
+    for uv_layer in mesh.uv_layers:
+        digest.update(uv_layer.name.encode())
+        update(uv_layer.data, "uv", numpy.float32, 2)
+
+    return digest.digest()
+
+
+def __update_with_shape_keys(digest, mesh):
+    """Adds the shape keys of the mesh, which are exported as blend shapes, to the digest"""
+    import numpy
+
+    shape_keys = mesh.shape_keys
+    if not shape_keys:
+        return
+
+    for key_block in shape_keys.key_blocks:
+        digest.update(repr((key_block.name, key_block.value, key_block.mute, key_block.relative_key.name)).encode())
+        coordinates = numpy.empty(len(key_block.data) * 3, dtype=numpy.float32)
+        key_block.data.foreach_get("co", coordinates)
+        digest.update(coordinates.tobytes())
+
+
+def __get_asset_ids(target_object):
+    """Returns the package IDs the object was uploaded as, including those of its levels of detail, by property
+    name"""
+    from . import constants
+
+    lod_prefix, lod_suffix = constants.RBX_LOD_PACKAGE_ID_PROPERTY_NAME.split("{level}")
+    return {
+        property_name: str(target_object[property_name])
+        for property_name in target_object.keys()
+        if target_object[property_name]
+        and (
+            property_name == constants.RBX_PACKAGE_ID_PROPERTY_NAME
+            or (property_name.startswith(lod_prefix) and property_name.endswith(lod_suffix))
+        )
+    }
+
+
+def __get_property_value(value):
+    """Returns a custom property's value as plain Python data that can be compared by its repr"""
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if hasattr(value, "to_list"):
+        return value.to_list()
+    if isinstance(value, bpy.types.ID):
+        return value.name
+    return value
@@ -24,6 +24,8 @@ if "bpy" in locals():
 
     if "create_http_client" in locals():
         importlib.reload(create_http_client)
+    if "json_codec" in locals():
+        importlib.reload(json_codec)
 
 import bpy
 from pyjwt_key_fetcher.http_client import HTTPClient
@@ -55,14 +57,17 @@ class JWTHTTPClient(HTTPClient):
         try:
             from .create_http_client import create_http_client
 
-            async with create_http_client() as session:
+            async with create_http_client("jwks") as session:
                 async with session.get(url) as response:
                     try:
-                        response_data = await response.json()  # Raises json.JSONDecodeError
+                        import json_codec
+
+                        # Raises json.JSONDecodeError. An empty body gives None
+                        response_data = json_codec.loads_response_body(await response.read())
                         response.raise_for_status()  # Raises ClientResponseError or other ClientError
                         return response_data
                     except aiohttp.ClientResponseError as exception:
-                        error_description = response_data.get("error_description", None)
+                        error_description = (response_data or {}).get("error_description", None)
                         if error_description:
                             exception.message = error_description
                         raise JWTHTTPFetchError(
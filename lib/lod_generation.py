@@ -0,0 +1,233 @@
+# Copyright © 2023 Roblox Corporation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+# associated documentation files (the “Software”), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial
+# portions of the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+# OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# SPDX-License-Identifier: MIT
+
+"""
+Generates decimated levels of detail for uploaded meshes. A temporary copy of the object, with its modifiers applied,
+is decimated at each configured ratio. Where a ratio would move the surface further than the allowed error, a higher
+ratio is searched for. The error is the largest distance from a sample of the original vertices to the decimated
+surface, measured relative to the size of the mesh. Each level is exported to its own FBX and uploaded alongside the
+base asset.
+"""
+
+if "bpy" in locals():
+    # Imports have run before. Need to reload the imported modules
+    import importlib
+
+    if "constants" in locals():
+        importlib.reload(constants)
+    if "export_fbx" in locals():
+        importlib.reload(export_fbx)
+    if "export_settings" in locals():
+        importlib.reload(export_settings)
+    if "str_to_int" in locals():
+        importlib.reload(str_to_int)
+
+import bpy
+from pathlib import Path
+
+# The number of original vertices whose distance to the decimated surface is measured
+ERROR_SAMPLE_SIZE = 4096
+# How many times the ratio is bisected when the requested ratio exceeds the error
+RATIO_SEARCH_STEPS = 5
+# A level that keeps more than this fraction of the previous level's faces is not worth uploading
+MIN_LEVEL_REDUCTION = 0.85
+
+
+class LodUpload:
+    """A generated level of detail to upload with its base object, filled in with the outcome of its upload"""
+
+    def __init__(self, level, ratio, file_path, package_id):
+        self.level = level
+        self.ratio = ratio
+        self.file_path = file_path
+        self.file_size = Path(file_path).stat().st_size
+        self.package_id = package_id
+        self.operation = None
+        self.exception = None
+
+
+def parse_lod_ratios(lod_ratios):
+    """Returns the ratios in a comma separated list, highest first, ignoring values that are not between 0 and 1"""
+    ratios = set()
+    for value in lod_ratios.split(","):
+        try:
+            ratio = float(value)
+        except ValueError:
+            continue
+        if 0 < ratio < 1:
+            ratios.add(ratio)
+    return sorted(ratios, reverse=True)
+
+
+def get_can_generate_lods(target_object):
+    """Returns whether levels of detail can be generated for the object. Collections, non-mesh objects and animated
+    or skinned objects are left at full resolution, since decimating them would break their deformation."""
+    return (
+        isinstance(target_object, bpy.types.Object)
+        and target_object.type == "MESH"
+        and not target_object.animation_data
+        and not any(modifier.type == "ARMATURE" for modifier in target_object.modifiers)
+    )
+
+
+def export_lods(scene, view_layer, target_object, directory_path, preferences):
+    """Exports the levels of detail of the object to FBX files in the given directory. Returns a LodUpload for each
+    level that was exported, in order."""
+    from . import constants
+    from .export_fbx import export_fbx
+    from .export_settings import copy_overrides
+    from .str_to_int import str_to_int
+
+    ratios = parse_lod_ratios(preferences.lod_ratios)
+    if not ratios or not get_can_generate_lods(target_object):
+        return []
+
+    depsgraph = view_layer.depsgraph
+    base_mesh = bpy.data.meshes.new_from_object(target_object.evaluated_get(depsgraph))
+    lod_object = bpy.data.objects.new(f"{target_object.name}_LOD", base_mesh)
+    lod_uploads = []
+    try:
+        lod_object.matrix_world = target_object.matrix_world
+        for lod_material_slot, material_slot in zip(lod_object.material_slots, target_object.material_slots):
+            lod_material_slot.link = material_slot.link
+            lod_material_slot.material = material_slot.material
+        # The levels embed their textures the same way as the base asset
+        if constants.RBX_MAX_TEXTURE_SIZE_PROPERTY_NAME in target_object:
+            lod_object[constants.RBX_MAX_TEXTURE_SIZE_PROPERTY_NAME] = target_object[
+                constants.RBX_MAX_TEXTURE_SIZE_PROPERTY_NAME
+            ]
+        copy_overrides(target_object, lod_object)
+
+        # The copy is linked to the scene so that its decimate modifier is evaluated
+        decimate_modifier = lod_object.modifiers.new("RobloxLOD", "DECIMATE")
+        scene.collection.objects.link(lod_object)
+
+        sample_points, mesh_size = __get_error_samples(base_mesh)
+        max_error = preferences.lod_max_error / 100 * mesh_size
+
+        previous_ratio = 1.0
+        for level, requested_ratio in enumerate(ratios, start=1):
+            ratio = __choose_ratio(
+                lod_object, decimate_modifier, depsgraph, sample_points, max_error, requested_ratio, previous_ratio
+            )
+            if ratio is None:
+                # Any further level would have to keep as many faces as this one
+                break
+
+            decimate_modifier.ratio = ratio
+            lod_object.name = f"{target_object.name}_LOD{level}"
+            file_path = Path(directory_path) / f"lod{level}.fbx"
+            export_fbx(scene, view_layer, lod_object, file_path, preferences)
+
+            package_id = str_to_int(target_object.get(constants.RBX_LOD_PACKAGE_ID_PROPERTY_NAME.format(level=level)))
+            lod_uploads.append(LodUpload(level, ratio, file_path, package_id))
+            previous_ratio = ratio
+    finally:
+        bpy.data.objects.remove(lod_object)
+        bpy.data.meshes.remove(base_mesh)
+
+    return lod_uploads
+
+
+def apply_lod_results(lod_uploads, target_objects):
+    """Stores the package ID of each level of detail that uploaded successfully on the given objects, and reports the
+    levels that failed. Returns the number of levels that uploaded successfully."""
+    import traceback
+    from . import constants
+
+    num_uploaded = 0
+    for lod_upload in lod_uploads:
+        operation = lod_upload.operation
+        if operation and operation.done and operation.response:
+            for target_object in target_objects:
+                target_object[constants.RBX_LOD_PACKAGE_ID_PROPERTY_NAME.format(level=lod_upload.level)] = str(
+                    operation.response.asset_id
+                )
+            num_uploaded += 1
+        elif lod_upload.exception:
+            traceback.print_exception(lod_upload.exception)
+        else:
+            print(f"Upload of LOD{lod_upload.level} failed: {operation.error if operation else 'not uploaded'}")
+    return num_uploaded
+
+
+def __get_error_samples(mesh):
+    """Returns an evenly spaced sample of the mesh's vertex positions, and the length of its bounding box diagonal"""
+    import numpy
+
+    coordinates = numpy.empty(len(mesh.vertices) * 3, dtype=numpy.float32)
+    mesh.vertices.foreach_get("co", coordinates)
+    coordinates = coordinates.reshape(-1, 3)
+    if not len(coordinates):
+        return coordinates, 0.0
+
+    mesh_size = float(numpy.linalg.norm(coordinates.max(axis=0) - coordinates.min(axis=0)))
+    sample_indices = numpy.linspace(0, len(coordinates) - 1, min(len(coordinates), ERROR_SAMPLE_SIZE)).astype(int)
+    return coordinates[sample_indices], mesh_size
+
+
+def __choose_ratio(lod_object, decimate_modifier, depsgraph, sample_points, max_error, requested_ratio, previous_ratio):
+    """Returns the requested ratio if decimating to it stays within the error, or otherwise the lowest ratio found
+    between it and the previous level's ratio that does. Returns None if no ratio saves enough faces."""
+    if __get_decimation_error(lod_object, decimate_modifier, depsgraph, sample_points, requested_ratio) <= max_error:
+        return requested_ratio
+
+    too_low_ratio, good_ratio = requested_ratio, previous_ratio
+    for _ in range(RATIO_SEARCH_STEPS):
+        ratio = (too_low_ratio + good_ratio) / 2
+        if __get_decimation_error(lod_object, decimate_modifier, depsgraph, sample_points, ratio) <= max_error:
+            good_ratio = ratio
+        else:
+            too_low_ratio = ratio
+
+    if good_ratio > previous_ratio * MIN_LEVEL_REDUCTION:
+        return None
+    return good_ratio
+
+
+def __get_decimation_error(lod_object, decimate_modifier, depsgraph, sample_points, ratio):
+    """Returns the largest distance from the sample points to the surface of the object decimated to the given ratio"""
+    import numpy
+    from mathutils.bvhtree import BVHTree
+
+    decimate_modifier.ratio = ratio
+    depsgraph.update()
+    evaluated_object = lod_object.evaluated_get(depsgraph)
+    mesh = evaluated_object.to_mesh()
+    try:
+        mesh.calc_loop_triangles()
+        coordinates = numpy.empty(len(mesh.vertices) * 3, dtype=numpy.float32)
+        mesh.vertices.foreach_get("co", coordinates)
+        triangles = numpy.empty(len(mesh.loop_triangles) * 3, dtype=numpy.int32)
+        mesh.loop_triangles.foreach_get("vertices", triangles)
+    finally:
+        evaluated_object.to_mesh_clear()
+
+    if not len(triangles):
+        return float("inf")
+
+    bvh_tree = BVHTree.FromPolygons(coordinates.reshape(-1, 3).tolist(), triangles.reshape(-1, 3).tolist())
+    # The nearest point queries run in C, and the distances they return are reduced with NumPy
+    distances = numpy.fromiter(
+        (bvh_tree.find_nearest(point)[3] for point in sample_points.tolist()),
+        dtype=numpy.float64,
+        count=len(sample_points),
+    )
+    return float(distances.max()) if len(distances) else 0.0
@@ -0,0 +1,167 @@
+# Copyright © 2023 Roblox Corporation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+# associated documentation files (the “Software”), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial
+# portions of the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+# OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# SPDX-License-Identifier: MIT
+
+"""
+Splits meshes that exceed the limits on uploaded meshes into parts that are each within them, so they can be exported
+together as one model. Faces are first separated by material, and then each material's faces are divided in two at
+the median of their centroids along the longest axis, k-d tree style, until every part is small enough.
+"""
+
+if "bpy" in locals():
+    # Imports have run before. Need to reload the imported modules
+    import importlib
+
+    if "constants" in locals():
+        importlib.reload(constants)
+
+import bpy
+import contextlib
+
+
+def get_can_split(target_object):
+    """Returns whether the object can be split into parts. Animated and skinned objects are left whole, since their
+    parts would no longer deform together."""
+    return (
+        isinstance(target_object, bpy.types.Object)
+        and target_object.type == "MESH"
+        and not target_object.animation_data
+        and not any(modifier.type == "ARMATURE" for modifier in target_object.modifiers)
+    )
+
+
+@contextlib.contextmanager
+def split_oversized_mesh(target_object, depsgraph):
+    """Within the context, yields temporary part objects that together make up the object as it is evaluated, each
+    within the limits on uploaded meshes. Yields a list holding just the object when it does not need splitting."""
+    if not get_can_split(target_object):
+        yield [target_object]
+        return
+
+    evaluated_object = target_object.evaluated_get(depsgraph)
+    mesh = evaluated_object.to_mesh()
+    try:
+        face_parts = partition_faces(mesh)
+    finally:
+        evaluated_object.to_mesh_clear()
+
+    if len(face_parts) <= 1:
+        yield [target_object]
+        return
+
+    print(f"Splitting {target_object.name} into {len(face_parts)} parts")
+    base_mesh = bpy.data.meshes.new_from_object(evaluated_object)
+    part_objects = []
+    try:
+        for part_number, part_faces in enumerate(face_parts, start=1):
+            part_objects.append(__create_part_object(target_object, base_mesh, part_number, part_faces))
+        yield part_objects
+    finally:
+        for part_object in part_objects:
+            part_mesh = part_object.data
+            bpy.data.objects.remove(part_object)
+            bpy.data.meshes.remove(part_mesh)
+        bpy.data.meshes.remove(base_mesh)
+
+
+def partition_faces(mesh):
+    """Returns the indices of the faces in each part of the mesh, as NumPy arrays. Returns a single part holding every
+    face if the mesh is within the limits."""
+    import numpy
+    from . import constants
+
+    num_faces = len(mesh.polygons)
+    loop_totals = numpy.empty(num_faces, dtype=numpy.int32)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    material_indices = numpy.empty(num_faces, dtype=numpy.int32)
+    mesh.polygons.foreach_get("material_index", material_indices)
+    centroids = numpy.empty(num_faces * 3, dtype=numpy.float32)
+    mesh.polygons.foreach_get("center", centroids)
+    centroids = centroids.reshape(-1, 3)
+    loop_vertices = numpy.empty(len(mesh.loops), dtype=numpy.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vertices)
+
+    triangle_counts = loop_totals - 2
+    # The face that each loop belongs to, so the vertices of any set of faces can be gathered with a mask
+    loop_faces = numpy.repeat(numpy.arange(num_faces), loop_totals)
+
+    def get_num_vertices(faces):
+        is_in_part = numpy.zeros(num_faces, dtype=numpy.bool_)
+        is_in_part[faces] = True
+        return len(numpy.unique(loop_vertices[is_in_part[loop_faces]]))
+
+    def is_within_limits(faces):
+        return (
+            triangle_counts[faces].sum() <= constants.MAX_TRIANGLES_PER_MESH
+            and get_num_vertices(faces) <= constants.MAX_VERTICES_PER_MESH
+        )
+
+    all_faces = numpy.arange(num_faces)
+    if is_within_limits(all_faces):
+        return [all_faces]
+
+    parts = []
+    for material_index in numpy.unique(material_indices):
+        pending_parts = [numpy.flatnonzero(material_indices == material_index)]
+        while pending_parts:
+            faces = pending_parts.pop()
+            if len(faces) <= 1 or is_within_limits(faces):
+                parts.append(faces)
+                continue
+
+            # Divide at the face where half of the triangles are on each side, along the axis the faces spread most
+            face_centroids = centroids[faces]
+            axis = numpy.argmax(face_centroids.max(axis=0) - face_centroids.min(axis=0))
+            sorted_faces = faces[numpy.argsort(face_centroids[:, axis], kind="stable")]
+            cumulative_triangles = numpy.cumsum(triangle_counts[sorted_faces])
+            split_index = int(numpy.searchsorted(cumulative_triangles, cumulative_triangles[-1] / 2)) + 1
+            split_index = min(max(split_index, 1), len(sorted_faces) - 1)
+            pending_parts.append(sorted_faces[split_index:])
+            pending_parts.append(sorted_faces[:split_index])
+
+    return parts
+
+
+def __create_part_object(target_object, base_mesh, part_number, part_faces):
+    """Returns a temporary object with a copy of the mesh that keeps only the given faces, placed and given materials
+    like the target object"""
+    import bmesh
+    import numpy
+
+    is_kept = numpy.zeros(len(base_mesh.polygons), dtype=numpy.bool_)
+    is_kept[part_faces] = True
+
+    part_mesh = base_mesh.copy()
+    part_mesh.name = f"{target_object.name}_Part{part_number}"
+    bm = bmesh.new()
+    try:
+        bm.from_mesh(part_mesh)
+        bm.faces.ensure_lookup_table()
+        removed_faces = [bm.faces[face_index] for face_index in numpy.flatnonzero(~is_kept).tolist()]
+        bmesh.ops.delete(bm, geom=removed_faces, context="FACES")
+        bm.to_mesh(part_mesh)
+    finally:
+        bm.free()
+
+    part_object = bpy.data.objects.new(part_mesh.name, part_mesh)
+    part_object.matrix_world = target_object.matrix_world
+    for part_material_slot, material_slot in zip(part_object.material_slots, target_object.material_slots):
+        part_material_slot.link = material_slot.link
+        part_material_slot.material = material_slot.material
+    return part_object
@@ -0,0 +1,306 @@
+# Copyright © 2023 Roblox Corporation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+# associated documentation files (the “Software”), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial
+# portions of the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+# OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# SPDX-License-Identifier: MIT
+
+"""
+Records where the time goes in each HTTP request the add-on makes, using aiohttp's TraceConfig hooks. Each record is
+tagged with the logical operation it belongs to (upload, poll, refresh, ...), kept in memory for the timing histogram
+in the sidebar, and optionally appended to a JSONL log chosen in the add-on preferences.
+"""
+
+if "bpy" in locals():
+    # Imports have run before. Need to reload the imported modules
+    import importlib
+
+    if "constants" in locals():
+        importlib.reload(constants)
+    if "get_add_on_preferences" in locals():
+        importlib.reload(get_add_on_preferences)
+    if "json_codec" in locals():
+        importlib.reload(json_codec)
+
+import bpy
+import time
+import traceback
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from types import SimpleNamespace
+from urllib.parse import urlsplit
+
+# The operation requests made in the current task are tagged with, when it differs from the session's own tag
+current_operation = ContextVar("current_operation", default=None)
+
+# The most recent completed records, oldest first
+records = deque(maxlen=500)
+
+# Upper bounds, in milliseconds, of the buckets shown in the total request time histogram
+HISTOGRAM_BUCKET_BOUNDS_MS = (100, 250, 500, 1000, 2500, 5000, 10000, float("inf"))
+
+
+@contextmanager
+def operation(name):
+    """Tags the requests made within the block with the given operation, overriding the session's tag"""
+    token = current_operation.set(name)
+    try:
+        yield
+    finally:
+        current_operation.reset(token)
+
+
+def create_trace_config(default_operation):
+    """Returns an aiohttp TraceConfig that records the timing of each request of a session.
+    Requests are tagged with default_operation unless made within an `operation` block.
+    """
+    import aiohttp
+
+    def create_trace_context(trace_request_ctx=None):
+        return SimpleNamespace(operation=current_operation.get() or default_operation, record=None)
+
+    trace_config = aiohttp.TraceConfig(trace_config_ctx_factory=create_trace_context)
+    trace_config.on_request_start.append(__on_request_start)
+    trace_config.on_connection_queued_start.append(__on_connection_queued_start)
+    trace_config.on_connection_queued_end.append(__on_connection_queued_end)
+    trace_config.on_connection_create_start.append(__on_connection_create_start)
+    trace_config.on_connection_create_end.append(__on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(__on_connection_reuseconn)
+    trace_config.on_dns_resolvehost_start.append(__on_dns_resolvehost_start)
+    trace_config.on_dns_resolvehost_end.append(__on_dns_resolvehost_end)
+    trace_config.on_request_headers_sent.append(__on_request_headers_sent)
+    trace_config.on_request_chunk_sent.append(__on_request_chunk_sent)
+    trace_config.on_request_end.append(__on_request_end)
+    trace_config.on_response_chunk_received.append(__on_response_chunk_received)
+    trace_config.on_request_exception.append(__on_request_exception)
+    return trace_config
+
+
+def get_summaries():
+    """Returns a summary of the recorded requests for each operation, in the order the operations were first seen.
+    Durations are medians and 95th percentiles in milliseconds. send_ms is the time taken to send the request body,
+    which is bound by the uplink, while wait_ms is the time from then until the first byte of the response arrives,
+    which is mostly time spent by the server processing the request.
+    """
+    records_by_operation = {}
+    for record in records:
+        records_by_operation.setdefault(record["operation"], []).append(record)
+
+    summaries = {}
+    for operation_name, operation_records in records_by_operation.items():
+        total_times = [record["total_ms"] for record in operation_records]
+        bucket_counts = [0] * len(HISTOGRAM_BUCKET_BOUNDS_MS)
+        for total_time in total_times:
+            bucket_counts[next(i for i, bound in enumerate(HISTOGRAM_BUCKET_BOUNDS_MS) if total_time < bound)] += 1
+
+        summaries[operation_name] = {
+            "count": len(operation_records),
+            "errors": sum(1 for record in operation_records if record["error"]),
+            "send_ms": __get_percentiles([record["send_ms"] for record in operation_records]),
+            "wait_ms": __get_percentiles([record["wait_ms"] for record in operation_records]),
+            "total_ms": __get_percentiles(total_times),
+            "bytes_up": sum(record["bytes_up"] for record in operation_records),
+            "bytes_down": sum(record["bytes_down"] for record in operation_records),
+            "histogram": bucket_counts,
+        }
+    return summaries
+
+
+def draw_timings(layout):
+    """Draws the per-operation timing summaries and total request time histograms"""
+    summaries = get_summaries()
+    if not summaries:
+        layout.label(text="No requests recorded yet")
+        return
+
+    for operation_name, summary in summaries.items():
+        box = layout.box()
+        error_text = f", {summary['errors']} failed" if summary["errors"] else ""
+        box.label(text=f"{operation_name}: {summary['count']} requests{error_text}", icon="URL")
+
+        column = box.column(align=True)
+        for label, key in (("Send", "send_ms"), ("Wait", "wait_ms"), ("Total", "total_ms")):
+            median, p95 = summary[key]
+            column.label(text=f"{label}: {median:.0f} ms median, {p95:.0f} ms p95")
+        column.label(text=f"Up: {__format_bytes(summary['bytes_up'])}, Down: {__format_bytes(summary['bytes_down'])}")
+
+        histogram_column = box.column(align=True)
+        most_in_bucket = max(summary["histogram"])
+        lower_bound = 0
+        for bound, count in zip(HISTOGRAM_BUCKET_BOUNDS_MS, summary["histogram"]):
+            bucket_text = f"< {bound:.0f} ms" if bound != float("inf") else f"≥ {lower_bound:.0f} ms"
+            bar = "█" * round(count / most_in_bucket * 20)
+            histogram_column.label(text=f"{bucket_text:>10}  {bar} {count if count else ''}")
+            lower_bound = bound
+
+
+def clear_records():
+    """Forgets all recorded requests"""
+    records.clear()
+
+
+def __now_ms():
+    return time.perf_counter() * 1000
+
+
+def __get_percentiles(values):
+    """Returns the median and 95th percentile of the values, using the nearest rank"""
+    sorted_values = sorted(values)
+    count = len(sorted_values)
+    return sorted_values[(count - 1) // 2], sorted_values[max(0, -(-count * 95 // 100) - 1)]
+
+
+def __format_bytes(num_bytes):
+    for unit in ("B", "KB", "MB"):
+        if num_bytes < 1024:
+            return f"{num_bytes:.0f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} GB"
+
+
+async def __on_request_start(session, context, params):
+    url = urlsplit(str(params.url))
+    context.start_ms = __now_ms()
+    context.queued_ms = context.connect_start_ms = context.dns_start_ms = None
+    context.headers_sent_ms = context.body_sent_ms = context.response_start_ms = None
+    context.expected_bytes_down = None
+    context.record = {
+        "time": time.time(),
+        "operation": context.operation,
+        "method": params.method,
+        "host": url.netloc,
+        "path": url.path,
+        "status": None,
+        "reused_connection": False,
+        "dns_ms": 0.0,
+        "pool_wait_ms": 0.0,
+        "connect_ms": 0.0,
+        "send_ms": 0.0,
+        "wait_ms": 0.0,
+        "receive_ms": 0.0,
+        "total_ms": 0.0,
+        "bytes_up": 0,
+        "bytes_down": 0,
+        "error": None,
+    }
+
+
+async def __on_connection_queued_start(session, context, params):
+    context.queued_ms = __now_ms()
+
+
+async def __on_connection_queued_end(session, context, params):
+    context.record["pool_wait_ms"] += __now_ms() - context.queued_ms
+
+
+async def __on_connection_create_start(session, context, params):
+    context.connect_start_ms = __now_ms()
+
+
+async def __on_connection_create_end(session, context, params):
+    # Name resolution happens while the connection is created, and is recorded separately. The rest of the
+    # connection time is the TCP connection and, for HTTPS, the TLS handshake, which aiohttp does not trace apart
+    context.record["connect_ms"] = __now_ms() - context.connect_start_ms - context.record["dns_ms"]
+
+
+async def __on_connection_reuseconn(session, context, params):
+    context.record["reused_connection"] = True
+
+
+async def __on_dns_resolvehost_start(session, context, params):
+    context.dns_start_ms = __now_ms()
+
+
+async def __on_dns_resolvehost_end(session, context, params):
+    context.record["dns_ms"] += __now_ms() - context.dns_start_ms
+
+
+async def __on_request_headers_sent(session, context, params):
+    context.headers_sent_ms = __now_ms()
+
+
+async def __on_request_chunk_sent(session, context, params):
+    context.body_sent_ms = __now_ms()
+    context.record["bytes_up"] += len(params.chunk)
+
+
+async def __on_request_end(session, context, params):
+    record = context.record
+    context.response_start_ms = __now_ms()
+    record["status"] = params.response.status
+
+    request_sent_ms = context.body_sent_ms or context.headers_sent_ms or context.start_ms
+    if context.headers_sent_ms is not None:
+        record["send_ms"] = request_sent_ms - context.headers_sent_ms
+    record["wait_ms"] = context.response_start_ms - request_sent_ms
+
+    # aiohttp has no hook for the end of the response body, so the record is completed once the expected number of
+    # bytes has been received
+    context.expected_bytes_down = params.response.content_length
+    if (
+        params.method == "HEAD"
+        or not context.expected_bytes_down
+        or record["bytes_down"] >= context.expected_bytes_down
+    ):
+        __complete_record(context)
+
+
+async def __on_response_chunk_received(session, context, params):
+    record = context.record
+    record["bytes_down"] += len(params.chunk)
+    if context.expected_bytes_down and record["bytes_down"] >= context.expected_bytes_down:
+        __complete_record(context)
+
+
+async def __on_request_exception(session, context, params):
+    if context.record is None:
+        return
+    context.record["error"] = type(params.exception).__name__
+    __complete_record(context)
+
+
+def __complete_record(context):
+    record = context.record
+    if record is None:
+        return
+    # Later chunks of the same response must not complete the record a second time
+    context.record = None
+
+    now_ms = __now_ms()
+    if context.response_start_ms is not None:
+        record["receive_ms"] = now_ms - context.response_start_ms
+    record["total_ms"] = now_ms - context.start_ms
+    records.append(record)
+
+    __append_to_log(record)
+
+
+def __append_to_log(record):
+    """Appends the record to the JSONL log file set in the add-on preferences, if any"""
+    try:
+        from .get_add_on_preferences import get_add_on_preferences
+
+        log_path = get_add_on_preferences(bpy.context.preferences).network_timing_log_path
+        if not log_path:
+            return
+
+        import json_codec
+
+        with open(bpy.path.abspath(log_path), "a", encoding="utf-8") as log_file:
+            log_file.write(json_codec.dumps(record) + "\n")
+    except Exception as exception:
+        traceback.print_exception(exception)
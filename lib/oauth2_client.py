@@ -60,6 +60,10 @@ if "bpy" in locals():
         importlib.reload(create_http_client)
     if "constants" in locals():
         importlib.reload(constants)
+    if "connection_warmer" in locals():
+        importlib.reload(connection_warmer)
+    if "json_codec" in locals():
+        importlib.reload(json_codec)
 
 import bpy
 import webbrowser
@@ -134,6 +138,8 @@ class NotLoggedInError(Exception):
 class RbxOAuth2Client:
     _instance = None
     token_data = {}
+    # Refresh tokens are single use, so concurrent refreshes must not both spend the same one
+    _refresh_lock = None
 
     def __new__(cls, *args, **kwargs):
         # Makes this class into a singleton
@@ -211,7 +217,7 @@ class RbxOAuth2Client:
             try:
                 from .create_http_client import create_http_client
 
-                async with create_http_client() as session:
+                async with create_http_client("revoke") as session:
                     async with session.post(
                         constants.REVOKE_TOKEN_ENDPOINT,
                         headers=headers,
@@ -220,41 +226,76 @@ class RbxOAuth2Client:
                         import aiohttp
 
                         try:
-                            response_data = await response.json(content_type=None)  # Raises json.JSONDecodeError
+                            import json_codec
+
+                            # Raises json.JSONDecodeError. An empty body gives None
+                            response_data = json_codec.loads_response_body(await response.read())
                             response.raise_for_status()  # Raises ClientResponseError or other ClientError
                             return response_data
                         except aiohttp.ClientResponseError as exception:
-                            error_description = response_data.get("error_description", None)
+                            error_description = (response_data or {}).get("error_description", None)
                             if error_description:
                                 exception.message = error_description
                             raise exception
             finally:
                 self.token_data = {}
+                self.rbx.is_creator_data_provisional = False
                 self.rbx.is_logged_in = False
 
     async def refresh_login_if_needed(self):
+        async with self.__get_refresh_lock():
+            if (not self.rbx.is_logged_in) or self.token_data.get("refresh_after", 0) < time():
+                await self.__refresh_login()
+
+    async def refresh_rejected_access_token(self, rejected_access_token):
+        """
+        Refreshes the tokens after a request made with rejected_access_token was unauthorized, even if they are not
+        due to be refreshed. Does nothing if the tokens have already been refreshed since, by another request.
+        """
+        async with self.__get_refresh_lock():
+            if self.token_data.get("access_token") == rejected_access_token:
+                await self.__refresh_login()
+
+    async def __refresh_login(self):
         refresh_token = self.token_data.get("refresh_token")
 
         if not refresh_token:
             raise NotLoggedInError("An active login session is required to refresh tokens")
 
-        if (not self.rbx.is_logged_in) or self.token_data.get("refresh_after") < time():
-            # Raises ClientResponseError, ClientError, or JSONDecodeError
-            async with self.__set_is_processing_login():
-                new_token_data = await self.__refresh_tokens(refresh_token)
+        # Raises ClientResponseError, ClientError, or JSONDecodeError
+        async with self.__set_is_processing_login():
+            new_token_data = await self.__refresh_tokens(refresh_token)
+
+            # Refreshing within an active session, or revalidating the creators cached from the last one, reuses the
+            # group names we already know, so only groups authorized since then are requested. A new session always
+            # fetches every name.
+            has_known_creators = self.rbx.is_logged_in or self.rbx.is_creator_data_provisional
+            known_group_names_by_id = self.__get_group_names_by_id() if has_known_creators else None
+
+            # Raises ClientResponseError, ClientError, JSONDecodeError, AttributeError, ValueError, or jwt.exceptions.DecodeError
+            from .request_login_details import request_login_details
 
-                # Raises ClientResponseError, ClientError, JSONDecodeError, AttributeError, ValueError, or jwt.exceptions.DecodeError
-                from .request_login_details import request_login_details
+            self.__complete_login(*await request_login_details(new_token_data, known_group_names_by_id))
 
-                self.__complete_login(*await request_login_details(new_token_data))
+    @classmethod
+    def __get_refresh_lock(cls):
+        if not cls._refresh_lock:
+            cls._refresh_lock = asyncio.Lock()
+        return cls._refresh_lock
 
     def __complete_login(self, creator_ids, name, group_names_by_id, token_data):
         # Set state values in rbx from the data fetched and processed above
         self.__set_creators_from_ids(creator_ids, name, group_names_by_id)
         self.name = name
         self.token_data = token_data
+        self.rbx.is_creator_data_provisional = False
         self.rbx.is_logged_in = True
 
+        # Open connections to the upload hosts now, so the first upload does not wait on connection setup
+        from . import connection_warmer
+
+        connection_warmer.start_warming_connections(self.rbx)
+
     @staticmethod
     def __construct_auth_url(state, code_challenge):
         """
@@ -301,7 +342,7 @@ class RbxOAuth2Client:
         from .create_http_client import create_http_client
 
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
-        async with create_http_client() as session:
+        async with create_http_client("refresh") as session:
             async with session.post(
                 constants.REFRESH_TOKEN_ENDPOINT,
                 headers=headers,
@@ -310,16 +351,22 @@ class RbxOAuth2Client:
                 import aiohttp
 
                 try:
+                    import json_codec
+
                     # Raises json.JSONDecodeError
-                    response_data = await response.json()
+                    response_data = json_codec.loads_response_body(await response.read())
                     response.raise_for_status()  # Raises ClientResponseError or other ClientError
                     return response_data
                 except aiohttp.ClientResponseError as exception:
-                    error_description = response_data.get("error_description", None)
+                    error_description = (response_data or {}).get("error_description", None)
                     if error_description:
                         exception.message = error_description
                     raise exception
 
+    def __get_group_names_by_id(self):
+        """Returns a dictionary of group names by string id for the groups in the creators CollectionProperty"""
+        return {creator.id: creator.name for creator in self.rbx.creators if creator.type == "GROUP"}
+
     def __set_creators_from_ids(self, creator_ids, name, group_names_by_id):
         """Populates a CollectionProperty with RbxCreatorData objects containing creator types, ids, and names
         given ids and names. Used for persisting creator data across sessions and generating enum dropdown items.
@@ -36,10 +36,11 @@ if "bpy" in locals():
         importlib.reload(create_http_client)
     if "constants" in locals():
         importlib.reload(constants)
+    if "json_codec" in locals():
+        importlib.reload(json_codec)
 
 import bpy
 from time import time
-import json
 import urllib
 import ssl
 
@@ -51,16 +52,18 @@ REFRESH_SECONDS_BEFORE_EXPIRY = 30
 # TODO: Replace with async implementation, move to more sensible location
 def fetch_data_custom_ssl_context(self):
     import certifi
+    import json_codec
 
     context = ssl.create_default_context(cafile=certifi.where())
 
     with urllib.request.urlopen(self.uri, context=context) as response:
-        return json.load(response)
+        return json_codec.loads(response.read())
 
 
-async def request_login_details(token_data):
+async def request_login_details(token_data, known_group_names_by_id=None):
     """Fetches authorized resources for the access token, fetches group names for each authorized group ID,
     sets the token data in state, verifies and decodes the id token and stores the username in state.
+    Group names already present in known_group_names_by_id are reused instead of being fetched again.
     """
     # Use access token to fetch authorized resources
     # Raises ClientResponseError, ClientError, or JSONDecodeError
@@ -69,7 +72,7 @@ async def request_login_details(token_data):
     # Read creator ids from resources and fetch group names for each group ID
     # Raises ClientResponseError, ClientError, or JSONDecodeError
     creator_ids = __get_creator_ids_from_resources(authorized_resources)
-    group_names_by_id = await __request_group_names_for_group_ids(creator_ids["groups"])
+    group_names_by_id = await __request_group_names_for_group_ids(creator_ids["groups"], known_group_names_by_id or {})
 
     # Decode the ID token into profile data, fetching the matching signature from the certs API under the hood
     # Raises jwt.exceptions.DecodeError
@@ -99,7 +102,7 @@ async def __request_authorized_resources(access_token):
 
     from .create_http_client import create_http_client
 
-    async with create_http_client() as session:
+    async with create_http_client("resources") as session:
         async with session.post(
             constants.AUTHORIZED_RESOURCES_ENDPOINT,
             headers=headers,
@@ -108,11 +111,14 @@ async def __request_authorized_resources(access_token):
             import aiohttp
 
             try:
-                response_data = await response.json(content_type=None)  # Raises json.JSONDecodeError
+                import json_codec
+
+                # Raises json.JSONDecodeError. An empty body gives None
+                response_data = json_codec.loads_response_body(await response.read())
                 response.raise_for_status()  # Raises ClientResponseError or other ClientError
                 return response_data
             except aiohttp.ClientResponseError as exception:
-                error_description = response_data.get("error_description", None)
+                error_description = (response_data or {}).get("error_description", None)
                 if error_description:
                     exception.message = error_description
                 raise exception
@@ -172,29 +178,40 @@ def __get_creator_ids_from_resources(authorized_resources):
     return creator_ids
 
 
-async def __request_group_names_for_group_ids(group_ids):
-    """Makes an http GET request to fetch the names of the groups, and returns a dictionary of group names by string id"""
-    if not group_ids:
-        return {}
+async def __request_group_names_for_group_ids(group_ids, known_group_names_by_id):
+    """Makes an http GET request to fetch the names of the groups not already in known_group_names_by_id,
+    and returns a dictionary of group names by string id"""
+    group_names_by_id = {
+        group_id: known_group_names_by_id[group_id] for group_id in group_ids if group_id in known_group_names_by_id
+    }
+    unknown_group_ids = [group_id for group_id in group_ids if group_id not in group_names_by_id]
+    if not unknown_group_ids:
+        return group_names_by_id
 
     from . import constants
 
-    query_params = urllib.parse.urlencode({"groupIds": group_ids}, doseq=True)
+    query_params = urllib.parse.urlencode({"groupIds": unknown_group_ids}, doseq=True)
     full_url = f"{constants.GROUPS_ENDPOINT}?{query_params}"
     headers = {"Accept": "application/json"}
 
     from .create_http_client import create_http_client
 
-    async with create_http_client() as session:
+    async with create_http_client("groups") as session:
         async with session.get(full_url, headers=headers) as response:
             import aiohttp
 
             try:
-                response_data = await response.json(content_type=None)  # Raises json.JSONDecodeError
+                import json_codec
+
+                # Raises json.JSONDecodeError. An empty body gives None
+                response_data = json_codec.loads_response_body(await response.read())
                 response.raise_for_status()  # Raises ClientResponseError or other ClientError
-                return {str(group_data["id"]): group_data["name"] for group_data in response_data["data"]}
+                group_names_by_id.update(
+                    {str(group_data["id"]): group_data["name"] for group_data in response_data["data"]}
+                )
+                return group_names_by_id
             except aiohttp.ClientResponseError as exception:
-                for error in response_data.get("errors", []):
+                for error in (response_data or {}).get("errors", []):
                     user_facing_message = error.get("userFacingMessage")
                     if user_facing_message:
                         exception.message += f"{user_facing_message}\n"
@@ -103,6 +103,24 @@ class RbxProperties(PropertyGroup):
     is_logged_in: BoolProperty(update=__on_rbx_property_update)
     is_processing_login_or_logout: BoolProperty()
     creators: CollectionProperty(type=creator_details.RbxCreatorData)
+    # True while the creators were restored from the previous session and have not been verified by a login yet
+    is_creator_data_provisional: BoolProperty()
     has_called_load_creator: BoolProperty()
     num_objects_uploading: IntProperty()
+
+    def __on_is_watching_update(self, context):
+        """Starts or stops watch mode as it is toggled"""
+        from . import watch_mode
+
+        if self.is_watching:
+            watch_mode.start()
+        else:
+            watch_mode.stop()
+
+    is_watching: BoolProperty(
+        name="Watch for Changes",
+        description="Upload objects that were uploaded before again, a moment after their geometry, materials or "
+        "transform are edited",
+        update=__on_is_watching_update,
+    )
     upload_statuses: CollectionProperty(name="Upload Statuses", type=RbxStatusProperties)
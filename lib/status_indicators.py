@@ -20,6 +20,11 @@
 
 """Functions for the management and rendering of RbxStatusProperties objects"""
 
+import contextlib
+
+# The areas to redraw when the deferral of redraws in progress ends, or None if redraws are not being deferred
+deferred_redraw_areas = None
+
 
 def find_status(window_manager, target_object):
     """Returns the status associated with the object, if it exists"""
@@ -42,7 +47,28 @@ def set_status(window_manager, area, target_object, text, icon):
     status.icon = icon
 
     # Redraw the UI
-    area.tag_redraw()
+    if deferred_redraw_areas is None:
+        area.tag_redraw()
+    elif area not in deferred_redraw_areas:
+        deferred_redraw_areas.append(area)
+
+
+@contextlib.contextmanager
+def deferred_redraws():
+    """Within the context, areas showing changed statuses are redrawn once at the end rather than on every change"""
+    global deferred_redraw_areas
+    if deferred_redraw_areas is not None:
+        yield
+        return
+
+    deferred_redraw_areas = []
+    try:
+        yield
+    finally:
+        areas = deferred_redraw_areas
+        deferred_redraw_areas = None
+        for area in areas:
+            area.tag_redraw()
 
 
 def clear_statuses(window_manager):
@@ -0,0 +1,229 @@
+# Copyright © 2023 Roblox Corporation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+# associated documentation files (the “Software”), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial
+# portions of the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+# OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# SPDX-License-Identifier: MIT
+
+"""
+Downscales and re-encodes the textures embedded in an exported FBX. The pixels of each oversized image are resampled
+with NumPy into a temporary image, which replaces the original in the materials' image texture nodes only while the
+export runs. The original images and their files are never modified. Temporary images are kept for the rest of the
+export session, so a texture shared by many objects is only resampled and saved once.
+"""
+
+if "bpy" in locals():
+    # Imports have run before. Need to reload the imported modules
+    import importlib
+
+    if "texture_uploads" in locals():
+        importlib.reload(texture_uploads)
+    if "export_staging" in locals():
+        importlib.reload(export_staging)
+
+import bpy
+import contextlib
+import traceback
+from pathlib import Path
+
+# The Blender file format and file extension that each format policy saves textures as
+FILE_FORMAT_EXTENSIONS = {"PNG": ".png", "JPEG": ".jpg", "TARGA": ".tga", "BMP": ".bmp"}
+
+
+class ReplacementImageCache:
+    """The temporary images made in an export session, by source image, max size and file format, along with the
+    staging directory their files are saved in. Each file has a name unique within the session, since the FBX refers
+    to textures by file name."""
+
+    def __init__(self):
+        self.replacement_images = {}
+        self.used_file_names = set()
+        self.staging_directory = None
+
+    def clear(self):
+        """Removes the temporary images and their files"""
+        for replacement_image in self.replacement_images.values():
+            if replacement_image:
+                bpy.data.images.remove(replacement_image)
+        self.replacement_images.clear()
+        self.used_file_names.clear()
+        if self.staging_directory:
+            self.staging_directory.cleanup()
+            self.staging_directory = None
+
+
+@contextlib.contextmanager
+def downscaled_textures(target_object, max_size, file_format, replacement_image_cache, staging_location):
+    """Within the context, the image texture nodes used by the object's materials refer to copies of their images that
+    are at most max_size pixels on each side and saved in the given file format. A max_size of 0 leaves the resolution
+    alone, and a file_format of "KEEP" keeps the format of images that are not resized. Copies are taken from, and
+    added to, the given ReplacementImageCache, whose files are staged at the given staging location."""
+    if not max_size and file_format == "KEEP":
+        yield
+        return
+
+    from .texture_uploads import get_image_texture_nodes, get_material_images
+
+    replacement_images = {}
+    for image in get_material_images([target_object]):
+        replacement_image = __get_replacement_image(
+            replacement_image_cache, image, max_size, file_format, staging_location
+        )
+        if replacement_image:
+            replacement_images[image] = replacement_image
+
+    replaced_nodes = []
+    try:
+        for node in get_image_texture_nodes([target_object]):
+            if node.image in replacement_images:
+                replaced_nodes.append((node, node.image))
+                node.image = replacement_images[node.image]
+        yield
+    finally:
+        for node, image in replaced_nodes:
+            node.image = image
+
+
+def get_downscaled_size(width, height, max_size):
+    """Returns the size of an image scaled down to fit within max_size on each side, keeping its aspect ratio"""
+    if not max_size or max(width, height) <= max_size:
+        return width, height
+    scale = max_size / max(width, height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def resample_pixels(pixels, width, height):
+    """Returns the (height, width, channels) pixel array resampled to the given size by averaging the area of the
+    source pixels that each output pixel covers"""
+    import numpy
+
+    source_height, source_width, channels = pixels.shape
+    # The common case of a whole number ratio is averaged in blocks, without weight matrices
+    if source_height % height == 0 and source_width % width == 0:
+        return pixels.reshape(height, source_height // height, width, source_width // width, channels).mean(
+            axis=(1, 3), dtype=numpy.float32
+        )
+
+    row_weights = __get_area_weights(source_height, height)
+    column_weights = __get_area_weights(source_width, width)
+    rows = numpy.tensordot(row_weights, pixels, axes=(1, 0))
+    return numpy.tensordot(column_weights, rows, axes=(1, 1)).transpose(1, 0, 2).astype(numpy.float32)
+
+
+def __get_area_weights(source_length, length):
+    """Returns a (length, source_length) matrix whose rows hold the fraction of each source pixel covered by an output
+    pixel, normalized to sum to one"""
+    import numpy
+
+    edges = numpy.arange(length + 1) * (source_length / length)
+    source_edges = numpy.arange(source_length + 1)
+    overlap = numpy.clip(
+        numpy.minimum(edges[1:, None], source_edges[None, 1:])
+        - numpy.maximum(edges[:-1, None], source_edges[None, :-1]),
+        0,
+        None,
+    )
+    return (overlap / overlap.sum(axis=1, keepdims=True)).astype(numpy.float32)
+
+
+def __get_replacement_image(replacement_image_cache, image, max_size, file_format, staging_location):
+    """Returns the cached temporary image for the image, max size and file format, creating it on first use. Returns
+    None if the image can be embedded as it is, or could not be converted."""
+    key = (image.as_pointer(), max_size, file_format)
+    if key not in replacement_image_cache.replacement_images:
+        try:
+            if not replacement_image_cache.staging_directory:
+                from . import export_staging
+
+                replacement_image_cache.staging_directory = export_staging.create_directory(staging_location)
+            replacement_image = __create_replacement_image(
+                image,
+                max_size,
+                file_format,
+                replacement_image_cache.staging_directory.name,
+                replacement_image_cache.used_file_names,
+            )
+        except Exception as exception:
+            # The original texture is embedded instead, so the export still succeeds
+            traceback.print_exception(exception)
+            replacement_image = None
+        replacement_image_cache.replacement_images[key] = replacement_image
+    return replacement_image_cache.replacement_images[key]
+
+
+def __create_replacement_image(image, max_size, file_format, directory_path, used_file_names):
+    """Returns a temporary image holding the image resized and re-encoded as the policy requires, saved to a file in
+    the given directory under a name not in used_file_names. Returns None if the image can be embedded as it is."""
+    import numpy
+
+    width, height = image.size
+    if not width or not height:
+        return None
+
+    new_width, new_height = get_downscaled_size(width, height, max_size)
+    is_resized = (new_width, new_height) != (width, height)
+    if file_format == "KEEP":
+        if not is_resized:
+            return None
+        file_format = image.file_format if image.file_format in FILE_FORMAT_EXTENSIONS else "PNG"
+    elif not is_resized and image.file_format == file_format:
+        return None
+
+    # Read as one flat float32 array, rather than pixel by pixel
+    channels = image.channels
+    pixels = numpy.empty(width * height * channels, dtype=numpy.float32)
+    image.pixels.foreach_get(pixels)
+    if is_resized:
+        pixels = resample_pixels(pixels.reshape(height, width, channels), new_width, new_height)
+
+    replacement_image = bpy.data.images.new(
+        f"{image.name} (export)", new_width, new_height, alpha=channels == 4, float_buffer=image.is_float
+    )
+    try:
+        replacement_image.colorspace_settings.name = image.colorspace_settings.name
+        replacement_image.alpha_mode = image.alpha_mode
+        if replacement_image.channels == channels:
+            replacement_image.pixels.foreach_set(pixels.ravel())
+        else:
+            replacement_image.pixels.foreach_set(__to_rgba(pixels.reshape(-1, channels)).ravel())
+
+        # The file keeps the name of the image's file where it can, since the FBX refers to textures by file name
+        stem = Path(bpy.path.basename(image.filepath_raw)).stem or bpy.path.clean_name(image.name)
+        file_name = f"{stem}{FILE_FORMAT_EXTENSIONS[file_format]}"
+        suffix = 1
+        while file_name in used_file_names:
+            file_name = f"{stem}_{suffix}{FILE_FORMAT_EXTENSIONS[file_format]}"
+            suffix += 1
+        used_file_names.add(file_name)
+        replacement_image.filepath_raw = str(Path(directory_path) / file_name)
+        replacement_image.file_format = file_format
+        replacement_image.save()
+    except Exception:
+        bpy.data.images.remove(replacement_image)
+        raise
+    return replacement_image
+
+
+def __to_rgba(pixels):
+    """Returns the (count, channels) pixels as RGBA, for images whose buffer holds fewer channels"""
+    import numpy
+
+    rgba = numpy.ones((len(pixels), 4), dtype=numpy.float32)
+    if pixels.shape[1] < 3:
+        rgba[:, :3] = pixels[:, :1]
+    else:
+        rgba[:, :3] = pixels[:, :3]
+    return rgba
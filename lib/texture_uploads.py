@@ -0,0 +1,270 @@
+# Copyright © 2023 Roblox Corporation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+# associated documentation files (the “Software”), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial
+# portions of the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+# OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# SPDX-License-Identifier: MIT
+
+"""
+Uploads the images used by the materials of the selected objects as separate Image or Decal assets, so a texture
+shared by many objects is sent once instead of being embedded in each of their FBX files. Images are identified by a
+hash of their packed bytes, file contents or pixels, and the asset each hash was uploaded as is cached in the add-on's
+config directory, so unchanged images are not uploaded again in later batches. The cache can be cleared from the
+add-on preferences, for instance after an asset was deleted or moderated.
+
+The uploaded models are left untextured: nothing links them to the image assets, so the image IDs must be applied to
+their materials in Studio.
+"""
+
+if "bpy" in locals():
+    # Imports have run before. Need to reload the imported modules
+    import importlib
+
+    if "constants" in locals():
+        importlib.reload(constants)
+    if "get_add_on_preferences" in locals():
+        importlib.reload(get_add_on_preferences)
+    if "json_codec" in locals():
+        importlib.reload(json_codec)
+
+import bpy
+from bpy.types import Operator
+import hashlib
+import os
+import traceback
+from pathlib import Path
+
+IMAGE_ASSETS_FILE_NAME = "image_assets.json"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# The cached asset IDs, by creator and asset type, then by image hash. Loaded from the config directory on first use.
+image_assets = None
+
+
+class ImageUpload:
+    """An image to upload, along with the images in the selection that have identical contents"""
+
+    def __init__(self, image, content_hash):
+        self.image = image
+        self.content_hash = content_hash
+        self.duplicate_images = []
+
+
+def get_image_texture_nodes(objects):
+    """Yields the image texture nodes of the materials used by the given objects, including the objects of
+    collections and the node groups the materials use. Node trees shared between materials are visited once."""
+    visited_node_trees = set()
+
+    def visit_node_tree(node_tree):
+        if node_tree is None or node_tree.as_pointer() in visited_node_trees:
+            return
+        visited_node_trees.add(node_tree.as_pointer())
+        for node in node_tree.nodes:
+            if node.type == "TEX_IMAGE" and node.image:
+                yield node
+            elif node.type == "GROUP":
+                yield from visit_node_tree(node.node_tree)
+
+    for target_object in objects:
+        member_objects = (
+            target_object.all_objects if isinstance(target_object, bpy.types.Collection) else [target_object]
+        )
+        for member_object in member_objects:
+            for material_slot in member_object.material_slots:
+                material = material_slot.material
+                if material and material.use_nodes:
+                    yield from visit_node_tree(material.node_tree)
+
+
+def get_material_images(objects):
+    """Returns the images used by image texture nodes in the materials of the given objects, without repeats"""
+    images = {}
+    for node in get_image_texture_nodes(objects):
+        if node.image.type == "IMAGE":
+            images.setdefault(node.image.as_pointer(), node.image)
+    return list(images.values())
+
+
+def group_images_by_hash(images):
+    """Returns an ImageUpload for each distinct image contents, in the order the images are given. Images that cannot
+    be read are reported and left out."""
+    uploads_by_hash = {}
+    for image in images:
+        try:
+            content_hash = __get_image_hash(image)
+        except Exception as exception:
+            traceback.print_exception(exception)
+            print(f"Could not read image {image.name}, so it will not be uploaded")
+            continue
+
+        if content_hash in uploads_by_hash:
+            uploads_by_hash[content_hash].duplicate_images.append(image)
+        else:
+            uploads_by_hash[content_hash] = ImageUpload(image, content_hash)
+
+    return list(uploads_by_hash.values())
+
+
+def write_upload_file(image, directory_path):
+    """Returns the path of a file holding the image in a format that can be uploaded. Images saved in such a format
+    are uploaded from their own file. Packed images are written out to the given directory, and any other image is
+    saved there as a PNG."""
+    from . import constants
+
+    source_path = Path(bpy.path.abspath(image.filepath_raw, library=image.library)) if image.filepath_raw else None
+    extension = source_path.suffix.lower() if source_path else ""
+    is_uploadable_format = extension in constants.IMAGE_UPLOAD_FILE_EXTENSIONS
+
+    if image.packed_file and is_uploadable_format:
+        upload_path = Path(directory_path) / f"image{extension}"
+        upload_path.write_bytes(image.packed_file.data)
+        return upload_path
+
+    if not image.packed_file and not image.is_dirty and is_uploadable_format and source_path.is_file():
+        return source_path
+
+    upload_path = Path(directory_path) / "image.png"
+    __save_pixels_as_png(image, upload_path)
+    return upload_path
+
+
+def get_cached_asset_id(creator_data, asset_type, content_hash):
+    """Returns the ID of the asset an image with the given hash was uploaded as, or None if it was not uploaded"""
+    return __get_image_assets().get(__get_cache_key(creator_data, asset_type), {}).get(content_hash)
+
+
+def cache_asset_id(creator_data, asset_type, content_hash, asset_id):
+    """Remembers the asset that an image with the given hash was uploaded as"""
+    __get_image_assets().setdefault(__get_cache_key(creator_data, asset_type), {})[content_hash] = asset_id
+    try:
+        __save_image_assets()
+    except OSError as exception:
+        # The cache only saves uploads, so failing to write it must not fail the upload
+        traceback.print_exception(exception)
+
+
+def clear_cached_asset_ids():
+    """Forgets every image uploaded, so that images are uploaded again as new assets"""
+    global image_assets
+
+    image_assets = {}
+    get_image_assets_path().unlink(missing_ok=True)
+
+
+def get_image_assets_path():
+    from .get_add_on_preferences import add_on_name
+
+    return Path(bpy.utils.user_resource("CONFIG", path=add_on_name, create=True)) / IMAGE_ASSETS_FILE_NAME
+
+
+def __get_cache_key(creator_data, asset_type):
+    return f"{creator_data.type}:{creator_data.id}:{asset_type}"
+
+
+def __get_image_assets():
+    global image_assets
+
+    if image_assets is None:
+        try:
+            import json_codec
+
+            with open(get_image_assets_path(), "rb") as image_assets_file:
+                image_assets = json_codec.loads(image_assets_file.read())
+        except FileNotFoundError:
+            image_assets = {}
+        except (OSError, ValueError) as exception:
+            traceback.print_exception(exception)
+            image_assets = {}
+    return image_assets
+
+
+def __save_image_assets():
+    """Writes the cache to a temporary file that then replaces the cache, so it is never left half written"""
+    import json_codec
+
+    image_assets_path = get_image_assets_path()
+    temporary_path = image_assets_path.with_suffix(".tmp")
+    with open(temporary_path, "w", encoding="utf-8") as image_assets_file:
+        image_assets_file.write(json_codec.dumps(image_assets))
+    os.replace(temporary_path, image_assets_path)
+
+
+def __get_image_hash(image):
+    """Returns a digest of the image's packed bytes, the contents of its file, or its pixels if it has unsaved
+    changes or no file"""
+    digest = hashlib.blake2b(digest_size=16)
+
+    if image.packed_file:
+        digest.update(image.packed_file.data)
+        return digest.hexdigest()
+
+    source_path = Path(bpy.path.abspath(image.filepath_raw, library=image.library)) if image.filepath_raw else None
+    if not image.is_dirty and source_path and source_path.is_file():
+        with open(source_path, "rb") as source_file:
+            while chunk := source_file.read(HASH_CHUNK_SIZE):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    digest.update(__get_pixels(image).tobytes())
+    digest.update(bytes(f"{image.size[0]}x{image.size[1]}", "utf-8"))
+    return digest.hexdigest()
+
+
+def __get_pixels(image):
+    """Returns the image's RGBA pixels as a flat float32 array, read in one call rather than pixel by pixel"""
+    import numpy
+
+    pixels = numpy.empty(image.size[0] * image.size[1] * 4, dtype=numpy.float32)
+    image.pixels.foreach_get(pixels)
+    return pixels
+
+
+def __save_pixels_as_png(image, file_path):
+    """Saves the image's pixels to a PNG file through a temporary image, leaving the image itself untouched"""
+    width, height = image.size
+    if not width or not height:
+        raise ValueError(f"Image {image.name} has no pixels")
+
+    png_image = bpy.data.images.new(f"{image.name} (upload)", width, height, alpha=True)
+    try:
+        png_image.pixels.foreach_set(__get_pixels(image))
+        png_image.filepath_raw = str(file_path)
+        png_image.file_format = "PNG"
+        png_image.save()
+    finally:
+        bpy.data.images.remove(png_image)
+
+
+class RBX_OT_clear_image_asset_cache(Operator):
+    """Operator for forgetting the assets that images were uploaded as"""
+
+    bl_idname = "rbx.clear_image_asset_cache"
+    bl_label = "Forget Uploaded Images"
+    bl_description = (
+        "Forget the assets that images were uploaded as, so they are uploaded again. Use this if any of those assets "
+        "were deleted or moderated"
+    )
+
+    def execute(self, context):
+        try:
+            clear_cached_asset_ids()
+        except OSError as exception:
+            traceback.print_exception(exception)
+            self.report({"ERROR"}, f"Could not clear the uploaded images: {exception}")
+            return {"CANCELLED"}
+
+        self.report({"INFO"}, "Images will be uploaded again")
+        return {"FINISHED"}
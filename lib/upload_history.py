@@ -0,0 +1,237 @@
+# Copyright © 2023 Roblox Corporation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+# associated documentation files (the “Software”), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial
+# portions of the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+# OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# SPDX-License-Identifier: MIT
+
+"""
+A local SQLite database of every upload attempt, kept in the add-on's config directory. The queries below back the
+upload history panel, and can be called from scripts or Blender's Python console by importing this module from the
+add-on's package.
+"""
+
+if "bpy" in locals():
+    # Imports have run before. Need to reload the imported modules
+    import importlib
+
+    if "get_add_on_preferences" in locals():
+        importlib.reload(get_add_on_preferences)
+
+import bpy
+import sqlite3
+import time
+import traceback
+import uuid
+from pathlib import Path
+
+DATABASE_FILE_NAME = "upload_history.sqlite3"
+SECONDS_PER_WEEK = 7 * 24 * 60 * 60
+
+# Identifies the attempts made in this Blender session
+session_id = uuid.uuid4().hex
+connection = None
+# The summary drawn in the panel, which is only queried again after an attempt is recorded
+cached_summary = None
+
+
+class UploadAttempt:
+    """The measurements of one upload attempt, filled in as it progresses and recorded when it completes"""
+
+    def __init__(self, object_name, creator_data):
+        self.blend_file = bpy.data.filepath
+        self.object_name = object_name
+        self.creator_type = creator_data.type if creator_data else None
+        self.creator_id = creator_data.id if creator_data else None
+        self.fbx_size = None
+        self.export_seconds = None
+        self.upload_seconds = None
+        self.poll_seconds = None
+
+
+def get_database_path():
+    from .get_add_on_preferences import add_on_name
+
+    return Path(bpy.utils.user_resource("CONFIG", path=add_on_name, create=True)) / DATABASE_FILE_NAME
+
+
+def record_attempt(attempt, asset_id=None, revision_id=None, error_code=None):
+    """Records a completed upload attempt. An error_code of None means the attempt succeeded."""
+    global cached_summary
+
+    try:
+        with __get_connection() as database:
+            database.execute(
+                """
+                INSERT INTO upload_attempts (
+                    time, session_id, blend_file, object_name, creator_type, creator_id, asset_id, revision_id,
+                    fbx_size, export_seconds, upload_seconds, poll_seconds, error_code
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    time.time(),
+                    session_id,
+                    attempt.blend_file,
+                    attempt.object_name,
+                    attempt.creator_type,
+                    attempt.creator_id,
+                    asset_id,
+                    revision_id,
+                    attempt.fbx_size,
+                    attempt.export_seconds,
+                    attempt.upload_seconds,
+                    attempt.poll_seconds,
+                    error_code,
+                ),
+            )
+        cached_summary = None
+    except sqlite3.Error as exception:
+        # The history is for reporting only, so failing to record an attempt must not fail the upload
+        traceback.print_exception(exception)
+
+
+def get_last_revisions(limit=None):
+    """Returns (asset_id, object_name, revision_id, time) for the latest successful upload of each asset, most
+    recent first"""
+    return (
+        __get_connection()
+        .execute(
+            """
+        SELECT asset_id, object_name, revision_id, MAX(time)
+        FROM upload_attempts
+        WHERE error_code IS NULL AND asset_id IS NOT NULL
+        GROUP BY asset_id
+        ORDER BY MAX(time) DESC
+        LIMIT ?
+        """,
+            (limit if limit is not None else -1,),
+        )
+        .fetchall()
+    )
+
+
+def get_upload_time_percentile(percentile, since=None):
+    """Returns the given percentile, by nearest rank, of the seconds successful uploads took from the start of the
+    export until the operation finished, since the given time. Defaults to the last week. Returns None if there were
+    no successful uploads."""
+    since = since if since is not None else time.time() - SECONDS_PER_WEEK
+    upload_times = [
+        upload_time
+        for (upload_time,) in __get_connection().execute(
+            """
+            SELECT COALESCE(export_seconds, 0) + COALESCE(upload_seconds, 0) + COALESCE(poll_seconds, 0) AS total
+            FROM upload_attempts
+            WHERE error_code IS NULL AND time >= ?
+            ORDER BY total
+            """,
+            (since,),
+        )
+    ]
+    if not upload_times:
+        return None
+    return upload_times[max(0, -(-len(upload_times) * percentile // 100) - 1)]
+
+
+def get_repeatedly_failing(min_failures=3):
+    """Returns (object_name, blend_file, num_failures, last_error_code, last_time) for objects whose uploads have failed
+    at least min_failures times since they last succeeded, most failures first"""
+    return (
+        __get_connection()
+        .execute(
+            """
+        SELECT object_name, blend_file, COUNT(*) AS num_failures, error_code, MAX(time)
+        FROM upload_attempts AS failure
+        WHERE error_code IS NOT NULL AND time > COALESCE((
+            SELECT MAX(time) FROM upload_attempts AS success
+            WHERE success.error_code IS NULL
+                AND success.object_name = failure.object_name
+                AND success.blend_file IS failure.blend_file
+        ), 0)
+        GROUP BY object_name, blend_file
+        HAVING num_failures >= ?
+        ORDER BY num_failures DESC
+        """,
+            (min_failures,),
+        )
+        .fetchall()
+    )
+
+
+def draw_history(layout):
+    """Draws a summary of the upload history"""
+    global cached_summary
+
+    if cached_summary is None:
+        try:
+            cached_summary = (
+                get_upload_time_percentile(50),
+                get_upload_time_percentile(95),
+                get_last_revisions(limit=5),
+                get_repeatedly_failing(),
+            )
+        except sqlite3.Error as exception:
+            traceback.print_exception(exception)
+            layout.label(text="Upload history is unavailable", icon="ERROR")
+            return
+    median_time, p95_time, last_revisions, repeatedly_failing = cached_summary
+
+    if median_time is not None:
+        layout.label(text=f"This week: {median_time:.1f} s median, {p95_time:.1f} s p95", icon="TIME")
+
+    if last_revisions:
+        layout.label(text="Latest Revisions", icon="PACKAGE")
+        box = layout.box()
+        for asset_id, object_name, revision_id, _ in last_revisions:
+            box.label(text=f"{object_name} ({asset_id}): version {revision_id}")
+
+    if repeatedly_failing:
+        layout.label(text="Failing Repeatedly", icon="ERROR")
+        box = layout.box()
+        for object_name, _, num_failures, last_error_code, _ in repeatedly_failing:
+            box.label(text=f"{object_name}: {num_failures} failures, last {last_error_code}")
+
+    if median_time is None and not last_revisions and not repeatedly_failing:
+        layout.label(text="No uploads recorded yet")
+
+
+def __get_connection():
+    global connection
+
+    if connection is None:
+        connection = sqlite3.connect(get_database_path())
+        connection.executescript("""
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS upload_attempts (
+                id INTEGER PRIMARY KEY,
+                time REAL NOT NULL,
+                session_id TEXT NOT NULL,
+                blend_file TEXT,
+                object_name TEXT NOT NULL,
+                creator_type TEXT,
+                creator_id TEXT,
+                asset_id INTEGER,
+                revision_id TEXT,
+                fbx_size INTEGER,
+                export_seconds REAL,
+                upload_seconds REAL,
+                poll_seconds REAL,
+                error_code TEXT
+            );
+            CREATE INDEX IF NOT EXISTS upload_attempts_by_time ON upload_attempts (time);
+            CREATE INDEX IF NOT EXISTS upload_attempts_by_asset ON upload_attempts (asset_id, time);
+            CREATE INDEX IF NOT EXISTS upload_attempts_by_object ON upload_attempts (object_name, blend_file, time);
+            """)
+    return connection
@@ -0,0 +1,397 @@
+# Copyright © 2023 Roblox Corporation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+# associated documentation files (the “Software”), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial
+# portions of the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+# OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# SPDX-License-Identifier: MIT
+
+"""
+An append-only journal of uploads, kept as JSONL in the add-on's config directory so it survives Blender closing or
+crashing. Uploads whose operation was started but never seen to finish are polled again the next time their .blend
+file is opened, and the resulting package IDs written back onto the objects they were uploaded from.
+"""
+
+if "bpy" in locals():
+    # Imports have run before. Need to reload the imported modules
+    import importlib
+
+    if "constants" in locals():
+        importlib.reload(constants)
+    if "event_loop" in locals():
+        importlib.reload(event_loop)
+    if "creator_details" in locals():
+        importlib.reload(creator_details)
+    if "get_add_on_preferences" in locals():
+        importlib.reload(get_add_on_preferences)
+    if "network_timing" in locals():
+        importlib.reload(network_timing)
+    if "upload_retry" in locals():
+        importlib.reload(upload_retry)
+    if "RbxOAuth2Client" in locals():
+        importlib.reload(RbxOAuth2Client)
+    if "json_codec" in locals():
+        importlib.reload(json_codec)
+
+import bpy
+import asyncio
+import contextlib
+import os
+import time
+import traceback
+import uuid
+from pathlib import Path
+
+JOURNAL_FILE_NAME = "upload_journal.jsonl"
+# Every Blender instance shares the journal, so it is only written while holding an exclusive lock on this file
+JOURNAL_LOCK_FILE_NAME = "upload_journal.lock"
+
+# The queued entries of uploads in progress in this session, by upload ID. They must not be resumed a second time.
+active_uploads = {}
+
+
+def get_journal_path():
+    from .get_add_on_preferences import add_on_name
+
+    return Path(bpy.utils.user_resource("CONFIG", path=add_on_name, create=True)) / JOURNAL_FILE_NAME
+
+
+def record_queued(object_name, asset_id, creator_data, duplicate_names=()):
+    """Records that an object was exported and queued for upload, along with the names of the duplicate objects that
+    share its upload. Returns the ID identifying the upload in the journal."""
+    upload_id = uuid.uuid4().hex
+    queued_entry = {
+        "event": "queued",
+        "upload_id": upload_id,
+        "blend_file": bpy.data.filepath,
+        "object_name": object_name,
+        "duplicate_names": list(duplicate_names),
+        "asset_id": asset_id or 0,
+        "creator_type": creator_data.type,
+        "creator_id": creator_data.id,
+    }
+    active_uploads[upload_id] = queued_entry
+    __append_entry(queued_entry)
+    return upload_id
+
+
+def record_operation(upload_id, operation_id):
+    """Records the ID of the operation started by an upload. The entry repeats the details of the queued entry so
+    the upload can be resumed from it alone."""
+    __append_entry({**active_uploads[upload_id], "event": "operation", "operation_id": operation_id})
+
+
+def record_result(upload_id, operation):
+    """Records the outcome of an upload whose operation is done, so it is not resumed"""
+    response = operation.response
+    __append_entry(
+        {
+            "event": "result",
+            "upload_id": upload_id,
+            "asset_id": response.asset_id if response else None,
+            "revision_id": response.revision_id if response else None,
+            "error": operation.error.message if operation.error else None,
+        }
+    )
+
+
+def finish_upload(upload_id):
+    """Marks an upload started in this session as no longer in progress. If its operation was not seen to finish, it
+    is resumed the next time its .blend file is opened."""
+    active_uploads.pop(upload_id, None)
+
+
+def get_pending_uploads():
+    """Returns the operation entries of uploads whose operation has not been seen to finish, oldest first"""
+    return __get_pending_uploads(__read_entries())
+
+
+def __get_pending_uploads(entries):
+    operation_entries_by_upload_id = {}
+    for entry in entries:
+        match entry["event"]:
+            case "operation":
+                operation_entries_by_upload_id[entry["upload_id"]] = entry
+            case "result":
+                operation_entries_by_upload_id.pop(entry["upload_id"], None)
+    return list(operation_entries_by_upload_id.values())
+
+
+def schedule_resume_pending_uploads():
+    """Resumes polling the pending uploads of the .blend file that was just opened. Runs from a timer since the
+    handlers for loading a file cannot start the event loop."""
+    bpy.app.timers.register(__resume_pending_uploads, first_interval=0)
+
+
+def __resume_pending_uploads():
+    window_manager = bpy.context.window_manager
+    rbx = window_manager.rbx
+
+    # Nothing can be resumed without the dependencies, or a window to run the event loop in
+    if not rbx.is_finished_installing_dependencies or rbx.needs_restart or not window_manager.windows:
+        return None
+
+    try:
+        pending_uploads = __compact_journal()
+    except Exception as exception:
+        traceback.print_exception(exception)
+        return None
+
+    blend_file = bpy.data.filepath
+    uploads_to_resume = [
+        pending_upload
+        for pending_upload in pending_uploads
+        if blend_file
+        and pending_upload["blend_file"] == blend_file
+        and pending_upload["upload_id"] not in active_uploads
+    ]
+    if not uploads_to_resume:
+        return None
+
+    # Resuming needs the remembered session, which is otherwise only loaded when the sidebar is first drawn
+    if not rbx.has_called_load_creator:
+        from . import creator_details
+
+        creator_details.load_creator_details(window_manager, bpy.context.preferences)
+        if rbx.is_creator_data_provisional:
+            creator_details.schedule_creator_revalidation()
+
+    for pending_upload in uploads_to_resume:
+        active_uploads[pending_upload["upload_id"]] = pending_upload
+
+    def on_resume_complete(task):
+        for pending_upload in uploads_to_resume:
+            finish_upload(pending_upload["upload_id"])
+        try:
+            task.result()
+        except Exception as exception:
+            traceback.print_exception(exception)
+
+    from . import event_loop
+
+    with bpy.context.temp_override(window=window_manager.windows[0]):
+        event_loop.submit(__resume_uploads_task(rbx, uploads_to_resume), on_resume_complete)
+
+    # Returning None unregisters the timer so it only runs once
+    return None
+
+
+async def __resume_uploads_task(rbx, pending_uploads):
+    from .oauth2_client import RbxOAuth2Client
+
+    oauth2_client = RbxOAuth2Client(rbx)
+    await oauth2_client.refresh_login_if_needed()
+
+    from . import upload_retry, constants
+
+    retry_budget = upload_retry.RetryBudget(constants.RETRIES_PER_BATCH)
+    results = await asyncio.gather(
+        *(__resume_upload(oauth2_client, pending_upload, retry_budget) for pending_upload in pending_uploads),
+        return_exceptions=True,
+    )
+    for pending_upload, result in zip(pending_uploads, results):
+        if isinstance(result, Exception):
+            print(f"Failed to resume the upload of {pending_upload['object_name']}: {result}")
+
+
+async def __resume_upload(oauth2_client, pending_upload, retry_budget):
+    from assets_upload_client import AssetsUploadClient
+    from openapi_client.models import RobloxOpenCloudAssetsV1Creator as AssetsCreator
+    from .create_http_client import get_shared_connector
+    from . import network_timing, upload_retry, constants
+
+    access_token = oauth2_client.token_data["access_token"]
+    creator_id = int(pending_upload["creator_id"])
+    match pending_upload["creator_type"]:
+        case "USER":
+            creator = AssetsCreator(user_id=creator_id)
+        case "GROUP":
+            creator = AssetsCreator(group_id=creator_id)
+        case _:
+            # The entry is corrupt. Recording a result for it means it is not tried again on every load.
+            print(
+                f"Not resuming the upload of {pending_upload.get('object_name')}: unknown creator type in {pending_upload}"
+            )
+            __append_entry(
+                {
+                    "event": "result",
+                    "upload_id": pending_upload["upload_id"],
+                    "asset_id": None,
+                    "revision_id": None,
+                    "error": "Unknown creator type",
+                }
+            )
+            return
+
+    async with AssetsUploadClient(
+        creator=creator,
+        oauth2_token=access_token,
+        connector=get_shared_connector(),
+        trace_configs=[network_timing.create_trace_config("poll")],
+    ) as client:
+
+        async def refresh_authorization():
+            nonlocal access_token
+            await oauth2_client.refresh_rejected_access_token(access_token)
+            access_token = oauth2_client.token_data["access_token"]
+            client.set_oauth2_token(access_token)
+
+        operation = await upload_retry.poll_until_done(
+            client, pending_upload["operation_id"], retry_budget, refresh_authorization
+        )
+
+    if not operation.done:
+        # Still processing. It stays in the journal, to be resumed again next time
+        return
+
+    record_result(pending_upload["upload_id"], operation)
+    if operation.error or not operation.response:
+        print(f"Resumed upload of {pending_upload['object_name']} failed: {operation.error}")
+        return
+
+    # The user may have opened another file, or removed the object, while the operation was being polled
+    target_object = bpy.data.objects.get(pending_upload["object_name"])
+    if bpy.data.filepath != pending_upload["blend_file"] or not target_object:
+        print(f"Resumed upload of {pending_upload['object_name']} finished, but the object could not be found")
+        return
+
+    # An object uploaded as a new asset may have been given a package ID since, which takes precedence
+    if not target_object.get(constants.RBX_PACKAGE_ID_PROPERTY_NAME) or pending_upload["asset_id"]:
+        target_object[constants.RBX_PACKAGE_ID_PROPERTY_NAME] = str(operation.response.asset_id)
+        for duplicate_name in pending_upload.get("duplicate_names", ()):
+            duplicate_object = bpy.data.objects.get(duplicate_name)
+            if duplicate_object:
+                duplicate_object[constants.RBX_PACKAGE_ID_PROPERTY_NAME] = str(operation.response.asset_id)
+    print(f"Resumed upload of {target_object.name} finished as version {operation.response.revision_id}")
+
+
+def __compact_journal():
+    """Rewrites the journal with only the entries of unfinished uploads that are recent enough to be worth resuming,
+    so it does not grow without bound. Returns the pending uploads among them. The journal is left as it is while
+    another Blender instance holds its lock."""
+    from . import constants
+
+    oldest_time = time.time() - constants.UPLOAD_JOURNAL_RETENTION_DAYS * 24 * 60 * 60
+
+    with __locked_journal(blocking=False) as is_locked:
+        entries = __read_entries()
+        pending_uploads = [entry for entry in __get_pending_uploads(entries) if entry.get("time", 0) >= oldest_time]
+        if not is_locked:
+            return pending_uploads
+
+        # Uploads that were queued but have no operation yet may be in progress in another instance, so every upload
+        # without a result is kept while recent. Uploads still in progress in this session are always kept, since
+        # they will be added to.
+        finished_upload_ids = {entry["upload_id"] for entry in entries if entry["event"] == "result"}
+        last_times_by_upload_id = {}
+        for entry in entries:
+            last_times_by_upload_id[entry["upload_id"]] = entry.get("time", 0)
+        kept_upload_ids = {
+            upload_id
+            for upload_id, last_time in last_times_by_upload_id.items()
+            if upload_id not in finished_upload_ids and last_time >= oldest_time
+        } | active_uploads.keys()
+        kept_entries = [entry for entry in entries if entry["upload_id"] in kept_upload_ids]
+
+        import json_codec
+
+        journal_path = get_journal_path()
+        temporary_path = journal_path.with_suffix(".tmp")
+        with open(temporary_path, "w", encoding="utf-8") as journal_file:
+            journal_file.writelines(json_codec.dumps(entry) + "\n" for entry in kept_entries)
+            journal_file.flush()
+            os.fsync(journal_file.fileno())
+        # Replacing the file in one step means a crash leaves either the old journal or the new one, never a partial one
+        os.replace(temporary_path, journal_path)
+
+    return pending_uploads
+
+
+def __append_entry(entry):
+    import json_codec
+
+    entry = {**entry, "time": time.time()}
+    try:
+        # An entry is still appended if the lock cannot be taken, since losing it is worse than racing a compaction
+        with __locked_journal():
+            with open(get_journal_path(), "a", encoding="utf-8") as journal_file:
+                journal_file.write(json_codec.dumps(entry) + "\n")
+                journal_file.flush()
+                os.fsync(journal_file.fileno())
+    except OSError as exception:
+        # The upload itself can carry on without being journaled
+        traceback.print_exception(exception)
+
+
+@contextlib.contextmanager
+def __locked_journal(blocking=True):
+    """Within the context, holds the exclusive lock on the journal shared by every Blender instance. Yields whether
+    the lock was taken, which it may not be without blocking. The lock is released by the system if Blender crashes."""
+    lock_path = get_journal_path().with_name(JOURNAL_LOCK_FILE_NAME)
+    with open(lock_path, "a+b") as lock_file:
+        is_locked = __lock_file(lock_file, blocking)
+        try:
+            yield is_locked
+        finally:
+            if is_locked:
+                __unlock_file(lock_file)
+
+
+def __lock_file(lock_file, blocking):
+    """Takes an exclusive lock on the open file. Returns whether it was taken."""
+    try:
+        if os.name == "nt":
+            import msvcrt
+
+            lock_file.seek(0)
+            # Blocking locks are retried for about 10 seconds before giving up
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def __unlock_file(lock_file):
+    if os.name == "nt":
+        import msvcrt
+
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def __read_entries():
+    import json_codec
+
+    journal_path = get_journal_path()
+    if not journal_path.exists():
+        return []
+
+    entries = []
+    with open(journal_path, "r", encoding="utf-8") as journal_file:
+        for line in journal_file:
+            try:
+                entries.append(json_codec.loads(line))
+            except ValueError:
+                # A crash while appending can leave the last line incomplete
+                continue
+    return entries
@@ -40,6 +40,24 @@ if "bpy" in locals():
         importlib.reload(str_to_int)
     if "constants" in locals():
         importlib.reload(constants)
+    if "network_timing" in locals():
+        importlib.reload(network_timing)
+    if "upload_retry" in locals():
+        importlib.reload(upload_retry)
+    if "upload_journal" in locals():
+        importlib.reload(upload_journal)
+    if "upload_history" in locals():
+        importlib.reload(upload_history)
+    if "upload_progress" in locals():
+        importlib.reload(upload_progress)
+    if "geometry_dedup" in locals():
+        importlib.reload(geometry_dedup)
+    if "texture_uploads" in locals():
+        importlib.reload(texture_uploads)
+    if "upload_validation" in locals():
+        importlib.reload(upload_validation)
+    if "lod_generation" in locals():
+        importlib.reload(lod_generation)
     if "AssetsUploadClient" in locals():
         importlib.reload(AssetsUploadClient)
     if "AssetsCreator" in locals():
@@ -54,12 +72,18 @@ if "bpy" in locals():
         importlib.reload(extract_exception_message)
     if "event_loop" in locals():
         importlib.reload(event_loop)
+    if "create_http_client" in locals():
+        importlib.reload(create_http_client)
+    if "export_staging" in locals():
+        importlib.reload(export_staging)
 
 import bpy
 from bpy.types import Operator
 
+import collections
+import contextlib
 import traceback
-from tempfile import TemporaryDirectory
+import time
 from pathlib import Path
 
 NO_ASSET_ID = 0
@@ -71,6 +95,14 @@ class RBX_OT_upload(Operator):
     bl_idname = "rbx.upload"
     bl_label = "Upload"
     limiter = None
+    scheduler = None
+    # The upload tasks of the current batch that have not completed. Tasks are removed when they complete or are
+    # cancelled, and only tasks still in here count towards num_objects_uploading.
+    active_tasks = set()
+    # The object groups of the current batch waiting for room to stage their exported files, and the arguments they are
+    # uploaded with. Queued groups count towards num_objects_uploading.
+    export_queue = collections.deque()
+    export_arguments = None
 
     @classmethod
     def description(cls, context, _):
@@ -112,12 +144,35 @@ class RBX_OT_upload(Operator):
 
         from .get_selected_objects import get_selected_objects
 
-        selected_objects = get_selected_objects(context)
+        self.upload_objects(context, get_selected_objects(context))
+
+        return {"FINISHED"}
+
+    @classmethod
+    def upload_objects(cls, context, selected_objects):
+        """Starts a batch uploading the given objects. Nothing must be uploading already."""
+        from .get_add_on_preferences import get_add_on_preferences
+        from . import geometry_dedup
+
+        add_on_preferences = get_add_on_preferences(context.preferences)
+
+        # Objects with identical geometry and materials are grouped, so that each group is exported and uploaded once
+        # and its asset ID shared by every member
+        if add_on_preferences.upload_duplicates_once:
+            object_groups = geometry_dedup.group_duplicate_objects(selected_objects, context.evaluated_depsgraph_get())
+        else:
+            object_groups = [[selected_object] for selected_object in selected_objects]
 
         # Setting the num_objects_uploading value will block future uploading until the current
         # operation is complete
         rbx = context.window_manager.rbx
-        rbx.num_objects_uploading = len(selected_objects)
+        rbx.num_objects_uploading = len(object_groups)
+
+        # Watch mode only uploads these objects again once they are edited after this point
+        if rbx.is_watching:
+            from . import watch_mode
+
+            watch_mode.record_uploaded(selected_objects, context.evaluated_depsgraph_get())
 
         # Because we are starting a new upload operation, we need to clear out the statuses of the
         # previous one from the UI
@@ -125,43 +180,184 @@ class RBX_OT_upload(Operator):
 
         status_indicators.clear_statuses(context.window_manager)
 
-        for selected_object in selected_objects:
-            self.upload(
+        from . import upload_progress
+
+        upload_progress.start_batch()
+
+        # Uploads wait for one another according to the preferences at the time the batch starts
+        from .upload_scheduler import UploadScheduler
+
+        if not RBX_OT_upload.scheduler:
+            RBX_OT_upload.scheduler = UploadScheduler(
+                add_on_preferences.max_concurrent_uploads, add_on_preferences.upload_order
+            )
+        else:
+            RBX_OT_upload.scheduler.configure(
+                add_on_preferences.max_concurrent_uploads, add_on_preferences.upload_order
+            )
+
+        # The objects uploaded together share one budget of retries for requests that fail transiently
+        from . import upload_retry, constants, export_staging
+
+        retry_budget = upload_retry.RetryBudget(constants.RETRIES_PER_BATCH)
+
+        export_staging.start_batch(add_on_preferences.staging_location)
+
+        # Textures are uploaded once as assets of their own rather than embedded in every FBX that uses them
+        if add_on_preferences.upload_textures_separately:
+            cls.upload_images(
                 context.window_manager,
                 context.area,
-                context.scene,
-                context.view_layer,
-                context.preferences,
-                selected_object,
+                selected_objects,
+                add_on_preferences.texture_asset_type,
+                add_on_preferences.staging_location,
+                retry_budget,
             )
 
-        return {"FINISHED"}
+        cls.export_queue.clear()
+        cls.export_queue.extend(object_groups)
+        cls.export_arguments = (
+            context.window_manager,
+            context.area,
+            context.scene,
+            context.view_layer,
+            context.preferences,
+            retry_budget,
+        )
+        cls.export_queued()
+
+        # Once staging is full, the rest of the batch is exported as uploads finish and their files are deleted
+        if cls.export_queue and not bpy.app.timers.is_registered(resume_queued_exports):
+            bpy.app.timers.register(resume_queued_exports, first_interval=constants.STAGING_POLL_INTERVAL_SECONDS)
+
+    @classmethod
+    def export_queued(cls):
+        """Exports and starts uploading the queued object groups, for as long as there is room to stage their files"""
+        from . import export_staging, geometry_dedup
+        from .export_fbx import export_session
+        from .get_add_on_preferences import get_add_on_preferences
+
+        window_manager, area, scene, view_layer, preferences, retry_budget = cls.export_arguments
+        max_staged_bytes = get_add_on_preferences(preferences).max_staged_megabytes * 1024 * 1024
+
+        # The exports share one evaluated depsgraph
+        with export_session(view_layer):
+            while cls.export_queue and export_staging.has_room(max_staged_bytes):
+                object_group = cls.export_queue.popleft()
+                try:
+                    representative_object = geometry_dedup.get_representative(object_group)
+                    cls.upload(
+                        window_manager,
+                        area,
+                        scene,
+                        view_layer,
+                        preferences,
+                        representative_object,
+                        retry_budget,
+                        [
+                            duplicate_object
+                            for duplicate_object in object_group
+                            if duplicate_object != representative_object
+                        ],
+                    )
+                except Exception as exception:
+                    # Objects can be deleted while they wait in the queue
+                    traceback.print_exception(exception)
+                    cls.upload_complete(window_manager, None)
 
     @classmethod
-    def upload(cls, window_manager, area, scene, view_layer, preferences, target_object):
-        """Exports the given object to a FBX file, and uploads it to Roblox"""
+    def upload(
+        cls, window_manager, area, scene, view_layer, preferences, target_object, retry_budget, duplicate_objects=()
+    ):
+        """Exports the given object to a FBX file, and uploads it to Roblox. The resulting package ID is also given to
+        the duplicate objects, which are identical to the target object and not uploaded themselves."""
 
         # FBX exporting occurs on the main thread so we are not scheduling it to be run
         # asynchronously along with the upload web requests
-        from . import status_indicators, constants
+        from . import status_indicators, constants, creator_details, upload_history
 
-        try:
-            from .get_add_on_preferences import get_add_on_preferences
+        attempt = upload_history.UploadAttempt(
+            target_object.name, creator_details.get_selected_creator_data(window_manager)
+        )
+
+        for duplicate_object in duplicate_objects:
+            status_indicators.set_status(
+                window_manager, area, duplicate_object, f"Uploading as {target_object.name}", "LINKED"
+            )
 
-            add_on_preferences = get_add_on_preferences(preferences)
-            temporary_directory = TemporaryDirectory()
+        from .get_add_on_preferences import get_add_on_preferences
+
+        add_on_preferences = get_add_on_preferences(preferences)
+
+        # Objects that would be rejected for exceeding the limits on meshes are reported before spending any time
+        # exporting or uploading them
+        if add_on_preferences.validate_before_upload:
+            from .upload_validation import get_validation_issues
+
+            try:
+                validation_issues = get_validation_issues(
+                    target_object,
+                    view_layer.depsgraph,
+                    add_on_preferences.export_scale,
+                    add_on_preferences.split_oversized_meshes,
+                )
+            except Exception as exception:
+                # Failing to validate an object should not stop it from being uploaded
+                traceback.print_exception(exception)
+                validation_issues = []
+
+            if validation_issues:
+                print(f"{target_object.name} was not uploaded:\n" + "\n".join(validation_issues))
+                for invalid_object in (target_object, *duplicate_objects):
+                    status_indicators.set_status(
+                        window_manager, area, invalid_object, "; ".join(validation_issues), "ERROR"
+                    )
+                upload_history.record_attempt(attempt, error_code="VALIDATION_FAILED")
+                cls.upload_complete(window_manager, None)
+                return
+
+        from . import export_staging
+
+        temporary_directory = None
+        try:
+            temporary_directory = export_staging.create_directory(add_on_preferences.staging_location)
             sanitized_object_name = "".join(
                 c for c in target_object.name if c.isalnum() or c in (" ", ".", "_")
             ).rstrip()
             exported_file_path = Path(temporary_directory.name) / f"exported_{sanitized_object_name}.fbx"
             from .export_fbx import export_fbx
 
+            export_start_time = time.perf_counter()
             export_fbx(scene, view_layer, target_object, exported_file_path, add_on_preferences)
+
+            # Levels of detail are optional, so failing to generate them still uploads the base asset
+            lod_uploads = []
+            if add_on_preferences.generate_lods:
+                from .lod_generation import export_lods
+
+                try:
+                    lod_uploads = export_lods(
+                        scene, view_layer, target_object, temporary_directory.name, add_on_preferences
+                    )
+                except Exception as exception:
+                    traceback.print_exception(exception)
+
+            attempt.export_seconds = time.perf_counter() - export_start_time
+            temporary_directory.record_usage()
+            attempt.fbx_size = exported_file_path.stat().st_size
+
+            from . import upload_progress
+
+            upload_progress.add_object(target_object.name, attempt.fbx_size)
+            for lod_upload in lod_uploads:
+                upload_progress.add_object(f"{target_object.name}_LOD{lod_upload.level}", lod_upload.file_size)
         except Exception as exception:
             traceback.print_exception(exception)
-            status_indicators.set_status(
-                window_manager, area, target_object, constants.ERROR_MESSAGES["ADD_ON_ERROR"], "ERROR"
-            )
+            for failed_object in (target_object, *duplicate_objects):
+                status_indicators.set_status(
+                    window_manager, area, failed_object, constants.ERROR_MESSAGES["ADD_ON_ERROR"], "ERROR"
+                )
+            upload_history.record_attempt(attempt, error_code="EXPORT_FAILED")
             cls.upload_complete(window_manager, temporary_directory)
         else:
             status_indicators.set_status(window_manager, area, target_object, "Waiting to upload", "DECORATE")
@@ -171,125 +367,478 @@ class RBX_OT_upload(Operator):
 
             package_id = str_to_int(target_object.get(constants.RBX_PACKAGE_ID_PROPERTY_NAME))
 
-            coroutine = cls.upload_task(window_manager, area, target_object, exported_file_path, package_id)
+            coroutine = cls.upload_task(
+                window_manager,
+                area,
+                target_object,
+                exported_file_path,
+                package_id,
+                retry_budget,
+                attempt,
+                [duplicate_object.name for duplicate_object in duplicate_objects],
+                lod_uploads,
+            )
 
             def task_complete(task):
-                cls.upload_task_complete(task, window_manager, area, target_object, temporary_directory)
+                cls.upload_task_complete(
+                    task,
+                    window_manager,
+                    area,
+                    target_object,
+                    temporary_directory,
+                    attempt,
+                    duplicate_objects,
+                    lod_uploads,
+                )
 
             from . import event_loop
 
-            event_loop.submit(coroutine, task_complete)
+            cls.active_tasks.add(event_loop.submit(coroutine, task_complete))
 
-    # This asynchronous method is invoked as a separate coroutine from the main thread
     @classmethod
-    async def upload_task(cls, window_manager, area, target_object, file_path, package_id):
-        """Uploads the given fbx file to Roblox, and yields until it has finished processing or timed out"""
+    @contextlib.asynccontextmanager
+    async def open_assets_client(cls, window_manager):
+        """Yields an AssetsUploadClient that uploads as the selected creator, along with a coroutine function that
+        refreshes its access token once the server has rejected it"""
         from .oauth2_client import RbxOAuth2Client
-        from . import creator_details, constants
+        from . import creator_details, network_timing
+        from .create_http_client import get_shared_connector
+        from assets_upload_client import AssetsUploadClient
+        from openapi_client.models import RobloxOpenCloudAssetsV1Creator as AssetsCreator
 
         creator_data = creator_details.get_selected_creator_data(window_manager)
-        rbx = window_manager.rbx
-        oauth2_client = RbxOAuth2Client(rbx)
+        oauth2_client = RbxOAuth2Client(window_manager.rbx)
         await oauth2_client.refresh_login_if_needed()
         access_token = oauth2_client.token_data["access_token"]
 
-        # We are throttling the number of upload operations per minute using the async limiter we declared
-        from assets_upload_client import AssetsUploadClient
-        from openapi_client.models import (
-            RobloxOpenCloudAssetsV1Creator as AssetsCreator,
-            RobloxOpenCloudAssetsV1AssetType as AssetType,
-        )
-
         match creator_data.type:
             case "USER":
                 creator = AssetsCreator(user_id=int(creator_data.id))
             case "GROUP":
                 creator = AssetsCreator(group_id=int(creator_data.id))
 
+        async with AssetsUploadClient(
+            creator=creator,
+            oauth2_token=access_token,
+            connector=get_shared_connector(),
+            trace_configs=[network_timing.create_trace_config("assets")],
+        ) as client:
+
+            async def refresh_authorization():
+                nonlocal access_token
+                await oauth2_client.refresh_rejected_access_token(access_token)
+                access_token = oauth2_client.token_data["access_token"]
+                client.set_oauth2_token(access_token)
+
+            yield client, refresh_authorization
+
+    @classmethod
+    def get_limiter(cls):
+        """Returns the limiter that throttles the number of upload operations per minute"""
+        from . import constants
+
         if not cls.limiter:
             import aiolimiter
 
             cls.limiter = aiolimiter.AsyncLimiter(constants.MAX_UPLOADS_PER_MIN)
-        async with cls.limiter, AssetsUploadClient(creator=creator, oauth2_token=access_token) as client:
-            from . import status_indicators
-
-            status_indicators.set_status(window_manager, area, target_object, "Uploading", "DECORATE")
-            operation = await client.upload_asset_and_wait_for_done_async(
-                asset_type=AssetType.MODEL,
-                asset_name=target_object.name,
-                asset_description=constants.ASSET_DESCRIPTION,
-                file_path=file_path,
-                asset_id=package_id or NO_ASSET_ID,
-                upload_request_timeout_seconds=25,
-            )
+        return cls.limiter
+
+    # This asynchronous method is invoked as a separate coroutine from the main thread
+    @classmethod
+    async def upload_task(
+        cls,
+        window_manager,
+        area,
+        target_object,
+        file_path,
+        package_id,
+        retry_budget,
+        attempt,
+        duplicate_names,
+        lod_uploads=(),
+    ):
+        """Uploads the given fbx file to Roblox, and yields until it has finished processing or timed out. The levels
+        of detail of a successful upload are then uploaded, each as an asset of its own."""
+        import asyncio
+        from . import creator_details, constants, network_timing, upload_journal, upload_progress
+        from . import status_indicators, upload_retry
+        from openapi_client.models import RobloxOpenCloudAssetsV1AssetType as AssetType
+
+        creator_data = creator_details.get_selected_creator_data(window_manager)
+
+        # The upload is journaled so that, if Blender closes before its operation is seen to finish, it is resumed
+        # the next time this file is opened
+        upload_id = upload_journal.record_queued(target_object.name, package_id, creator_data, duplicate_names)
+        try:
+            async with cls.open_assets_client(window_manager) as (client, refresh_authorization):
+
+                def on_retry(retry_number, delay_seconds):
+                    status_indicators.set_status(
+                        window_manager, area, target_object, f"Retrying upload (attempt {retry_number + 1})", "DECORATE"
+                    )
+
+                # The scheduler decides when this file is sent relative to the rest of the batch, and the limiter
+                # keeps the uploads within the per-minute rate limit. Polling does not hold a place in flight.
+                async with cls.scheduler.slot(attempt.fbx_size):
+                    await cls.get_limiter().acquire()
+                    status_indicators.set_status(window_manager, area, target_object, "Uploading", "DECORATE")
+
+                    # Uploading and polling are timed as separate operations, since one is bound by the uplink and the
+                    # other by processing on the server
+                    upload_start_time = time.perf_counter()
+                    with network_timing.operation("upload"), upload_progress.track_object(target_object.name, area):
+                        # Repeating a request that creates an asset could create it twice, so it is only retried when
+                        # the server certainly did not act on it. Uploading a new version of an existing asset is always
+                        # retried.
+                        operation_id = await upload_retry.call_with_retries(
+                            lambda: client.upload_asset_async(
+                                asset_type=AssetType.MODEL,
+                                asset_name=target_object.name,
+                                asset_description=constants.ASSET_DESCRIPTION,
+                                file_path=file_path,
+                                asset_id=package_id or NO_ASSET_ID,
+                                request_timeout_seconds=25,
+                            ),
+                            retry_budget,
+                            refresh_authorization,
+                            is_repeatable=bool(package_id),
+                            on_retry=on_retry,
+                        )
+
+                    attempt.upload_seconds = time.perf_counter() - upload_start_time
+                upload_journal.record_operation(upload_id, operation_id)
+
+                # Once the operation ID is known, failures only repeat the poll, never the upload
+                poll_start_time = time.perf_counter()
+                with network_timing.operation("poll"):
+                    operation = await upload_retry.poll_until_done(
+                        client, operation_id, retry_budget, refresh_authorization
+                    )
+                attempt.poll_seconds = time.perf_counter() - poll_start_time
+
+                if lod_uploads and operation.done and operation.response:
+                    status_indicators.set_status(window_manager, area, target_object, "Uploading LODs", "DECORATE")
+                    await asyncio.gather(
+                        *(
+                            cls.upload_lod(client, refresh_authorization, area, target_object, lod_upload, retry_budget)
+                            for lod_upload in lod_uploads
+                        )
+                    )
+
+            if operation.done:
+                upload_journal.record_result(upload_id, operation)
+        finally:
+            upload_journal.finish_upload(upload_id)
 
         return operation
 
-    @staticmethod
-    def upload_complete(window_manager, temporary_directory):
+    @classmethod
+    async def upload_lod(cls, client, refresh_authorization, area, target_object, lod_upload, retry_budget):
+        """Uploads a level of detail of the target object and polls until it has finished processing. The outcome is
+        recorded on the LodUpload rather than raised, so a failed level does not fail the base asset."""
+        from . import constants, network_timing, upload_progress, upload_retry
+        from openapi_client.models import RobloxOpenCloudAssetsV1AssetType as AssetType
+
+        lod_name = f"{target_object.name}_LOD{lod_upload.level}"
+        try:
+            async with cls.scheduler.slot(lod_upload.file_size):
+                await cls.get_limiter().acquire()
+                with network_timing.operation("upload"), upload_progress.track_object(lod_name, area):
+                    operation_id = await upload_retry.call_with_retries(
+                        lambda: client.upload_asset_async(
+                            asset_type=AssetType.MODEL,
+                            asset_name=lod_name,
+                            asset_description=constants.ASSET_DESCRIPTION,
+                            file_path=str(lod_upload.file_path),
+                            asset_id=lod_upload.package_id or NO_ASSET_ID,
+                            request_timeout_seconds=25,
+                        ),
+                        retry_budget,
+                        refresh_authorization,
+                        is_repeatable=bool(lod_upload.package_id),
+                    )
+
+            with network_timing.operation("poll"):
+                lod_upload.operation = await upload_retry.poll_until_done(
+                    client, operation_id, retry_budget, refresh_authorization
+                )
+        except Exception as exception:
+            lod_upload.exception = exception
+
+    @classmethod
+    def upload_complete(cls, window_manager, temporary_directory, task=None):
         """Decreases the num_objects_uploading counter when an upload task completes, whether successful or errored.
         This way, once all upload tasks are resolved, the upload operator can be invoked again.
+        Tasks of a cancelled batch were already discounted when it was cancelled, so they only clean up.
         """
-        temporary_directory.cleanup()
+        if temporary_directory:
+            temporary_directory.cleanup()
+        if task is not None and task not in cls.active_tasks:
+            return
+        cls.active_tasks.discard(task)
         rbx = window_manager.rbx
         rbx.num_objects_uploading = rbx.num_objects_uploading - 1
 
+    @classmethod
+    def drop_queued_exports(cls, window_manager):
+        """Gives up on the object groups waiting to be exported, for instance because another file was opened"""
+        while cls.export_queue:
+            cls.export_queue.popleft()
+            cls.upload_complete(window_manager, None)
+
+    @classmethod
+    def cancel_uploads(cls, window_manager):
+        """Cancels the upload tasks of the current batch and drops the objects still waiting to be exported, allowing
+        a new batch to start straight away. Each task still cleans up its temporary directory as it finishes
+        cancelling, since its files may be open until then.
+
+        Nothing else needs undoing: files are sent in a single request rather than as multipart uploads, so there are
+        no multipart operations to abort, and cancelled tasks give back their place in the scheduler as they unwind.
+        Places in the per-minute limiter are not given back, since they stand for requests that already reached
+        Roblox and count towards its rate limit."""
+        for task in cls.active_tasks:
+            task.cancel()
+        cls.active_tasks.clear()
+        cls.export_queue.clear()
+        window_manager.rbx.num_objects_uploading = 0
+
     @staticmethod
-    def upload_task_complete(task, window_manager, area, target_object, temporary_directory):
+    def upload_task_complete(
+        task, window_manager, area, target_object, temporary_directory, attempt, duplicate_objects=(), lod_uploads=()
+    ):
         """Handles the result of a upload task, updating the status object, setting the package ID custom
-        property and cleaning up from the operation."""
-        from . import status_indicators, constants
+        property, recording the attempt in the upload history and cleaning up from the operation.
+        Duplicate objects share the status and package ID of the target object, and of its levels of detail."""
+        from . import status_indicators, constants, upload_retry, upload_history
         import openapi_client
         import asyncio
 
+        def set_status(text, icon):
+            for status_object in (target_object, *duplicate_objects):
+                status_indicators.set_status(window_manager, area, status_object, text, icon)
+
+        asset_id = revision_id = None
+        error_code = "ADD_ON_ERROR"
         try:
             operation = task.result()
             print(f"Operation path: {operation.path}")
 
             if operation.error:
-                status_indicators.set_status(window_manager, area, target_object, operation.error.message, "ERROR")
+                error_code = operation.error.code
+                set_status(operation.error.message, "ERROR")
                 print(f"Upload failed, {operation.error.code}: {operation.error.message}")
             elif not operation.done:
                 # Timeout while polling for upload job to finish. It may yet finish or fail, but we stopped checking.
-                status_indicators.set_status(
-                    window_manager, area, target_object, constants.ERROR_MESSAGES["OPERATION_TIMED_OUT"], "ERROR"
-                )
+                error_code = "OPERATION_TIMED_OUT"
+                set_status(constants.ERROR_MESSAGES["OPERATION_TIMED_OUT"], "ERROR")
             elif operation.response:
                 # Success
-                target_object[constants.RBX_PACKAGE_ID_PROPERTY_NAME] = str(operation.response.asset_id)
+                asset_id, revision_id, error_code = operation.response.asset_id, operation.response.revision_id, None
+                for uploaded_object in (target_object, *duplicate_objects):
+                    uploaded_object[constants.RBX_PACKAGE_ID_PROPERTY_NAME] = str(operation.response.asset_id)
 
-                status_indicators.set_status(
-                    window_manager,
-                    area,
-                    target_object,
-                    f"Uploaded version {operation.response.revision_id}",
-                    "CHECKMARK",
-                )
+                status_text = f"Uploaded version {operation.response.revision_id}"
+                if lod_uploads:
+                    from .lod_generation import apply_lod_results
+
+                    num_lods_uploaded = apply_lod_results(lod_uploads, (target_object, *duplicate_objects))
+                    status_text += f" with {num_lods_uploaded} of {len(lod_uploads)} LODs"
+                set_status(status_text, "CHECKMARK")
             else:  # No error, no response, but is done. We don't expect this to happen
-                status_indicators.set_status(
-                    window_manager, area, target_object, constants.ERROR_MESSAGES["INVALID_RESPONSE"], "ERROR"
-                )
+                error_code = "INVALID_RESPONSE"
+                set_status(constants.ERROR_MESSAGES["INVALID_RESPONSE"], "ERROR")
                 print(f"Upload failed, invalid response:\n{operation}")
+        except upload_retry.AmbiguousRequestError as exception:
+            # The upload failed after it was sent, and the asset may have been created regardless. Retrying could
+            # have created a duplicate asset, so the user is left to check before uploading again.
+            traceback.print_exception(exception)
+            error_code = "UPLOAD_OUTCOME_UNKNOWN"
+            set_status(constants.ERROR_MESSAGES["UPLOAD_OUTCOME_UNKNOWN"], "ERROR")
+        except asyncio.exceptions.CancelledError:
+            error_code = "CANCELLED"
+            set_status("Cancelled", "CANCEL")
         except asyncio.exceptions.TimeoutError as exception:
             # Timeout while waiting for initial upload to return an operation ID. It may yet finish or fail, but we stopped waiting.
-            status_indicators.set_status(
-                window_manager, area, target_object, constants.ERROR_MESSAGES["UPLOAD_TIMED_OUT"], "ERROR"
-            )
+            error_code = "UPLOAD_TIMED_OUT"
+            set_status(constants.ERROR_MESSAGES["UPLOAD_TIMED_OUT"], "ERROR")
         except openapi_client.rest.ApiException as exception:
             traceback.print_exception(exception)
+            error_code = f"HTTP_{exception.status}"
             from .extract_exception_message import extract_exception_message
 
-            status_indicators.set_status(
-                window_manager,
-                area,
-                target_object,
-                extract_exception_message(exception),
-                "ERROR",
-            )
+            set_status(extract_exception_message(exception), "ERROR")
         except Exception as exception:
             traceback.print_exception(exception)
-            status_indicators.set_status(
-                window_manager, area, target_object, constants.ERROR_MESSAGES["ADD_ON_ERROR"], "ERROR"
+            set_status(constants.ERROR_MESSAGES["ADD_ON_ERROR"], "ERROR")
+        finally:
+            upload_history.record_attempt(attempt, asset_id, revision_id, error_code)
+            RBX_OT_upload.upload_complete(window_manager, temporary_directory, task)
+
+    @classmethod
+    def upload_images(cls, window_manager, area, target_objects, asset_type_name, staging_location, retry_budget):
+        """Uploads each distinct image used by the materials of the given objects as an asset of the given type,
+        unless the same image was uploaded before. The asset ID is stored on every image with the same contents.
+        Image files are staged at the given staging location."""
+        from . import constants, creator_details, export_staging, status_indicators, texture_uploads
+
+        creator_data = creator_details.get_selected_creator_data(window_manager)
+        image_uploads = texture_uploads.group_images_by_hash(texture_uploads.get_material_images(target_objects))
+
+        for image_upload in image_uploads:
+            images = (image_upload.image, *image_upload.duplicate_images)
+            cached_asset_id = texture_uploads.get_cached_asset_id(
+                creator_data, asset_type_name, image_upload.content_hash
+            )
+            if cached_asset_id:
+                for image in images:
+                    image[constants.RBX_IMAGE_ASSET_ID_PROPERTY_NAME] = str(cached_asset_id)
+                    status_indicators.set_status(
+                        window_manager, area, image, f"Already uploaded as {cached_asset_id}", "CHECKMARK"
+                    )
+                continue
+
+            temporary_directory = None
+            try:
+                temporary_directory = export_staging.create_directory(staging_location)
+                file_path = texture_uploads.write_upload_file(image_upload.image, temporary_directory.name)
+                temporary_directory.record_usage()
+            except Exception as exception:
+                traceback.print_exception(exception)
+                if temporary_directory:
+                    temporary_directory.cleanup()
+                for image in images:
+                    status_indicators.set_status(
+                        window_manager, area, image, constants.ERROR_MESSAGES["ADD_ON_ERROR"], "ERROR"
+                    )
+                continue
+
+            for image in images:
+                status_indicators.set_status(window_manager, area, image, "Waiting to upload", "DECORATE")
+
+            # Images count towards the uploads in progress, so the batch only finishes once they have too
+            window_manager.rbx.num_objects_uploading += 1
+            coroutine = cls.upload_image_task(
+                window_manager, area, image_upload.image, file_path, asset_type_name, retry_budget
             )
+
+            def task_complete(task, image_upload=image_upload, temporary_directory=temporary_directory):
+                cls.upload_image_task_complete(
+                    task, window_manager, area, image_upload, creator_data, asset_type_name, temporary_directory
+                )
+
+            from . import event_loop
+
+            cls.active_tasks.add(event_loop.submit(coroutine, task_complete))
+
+    @classmethod
+    async def upload_image_task(cls, window_manager, area, image, file_path, asset_type_name, retry_budget):
+        """Uploads the given image file as a new asset, and yields until it has finished processing or timed out"""
+        from . import constants, network_timing, status_indicators, upload_progress, upload_retry
+
+        file_size = file_path.stat().st_size
+        upload_progress.add_object(image.name, file_size)
+
+        async with cls.open_assets_client(window_manager) as (client, refresh_authorization):
+            async with cls.scheduler.slot(file_size):
+                await cls.get_limiter().acquire()
+                status_indicators.set_status(window_manager, area, image, "Uploading", "DECORATE")
+
+                with network_timing.operation("upload"), upload_progress.track_object(image.name, area):
+                    # Images are always uploaded as new assets, so the request is only retried when the server
+                    # certainly did not act on it
+                    operation_id = await upload_retry.call_with_retries(
+                        lambda: client.upload_asset_async(
+                            # The preference values are the names of the Image and Decal asset types
+                            asset_type=asset_type_name,
+                            asset_name=image.name,
+                            asset_description=constants.ASSET_DESCRIPTION,
+                            file_path=str(file_path),
+                            request_timeout_seconds=25,
+                        ),
+                        retry_budget,
+                        refresh_authorization,
+                        is_repeatable=False,
+                    )
+
+            with network_timing.operation("poll"):
+                return await upload_retry.poll_until_done(client, operation_id, retry_budget, refresh_authorization)
+
+    @staticmethod
+    def upload_image_task_complete(
+        task, window_manager, area, image_upload, creator_data, asset_type_name, temporary_directory
+    ):
+        """Handles the result of an image upload task, storing the asset ID on the images and in the cache"""
+        from . import constants, status_indicators, texture_uploads, upload_retry
+        import openapi_client
+        import asyncio
+
+        def set_status(text, icon):
+            for image in (image_upload.image, *image_upload.duplicate_images):
+                status_indicators.set_status(window_manager, area, image, text, icon)
+
+        try:
+            operation = task.result()
+
+            if operation.error:
+                set_status(operation.error.message, "ERROR")
+                print(f"Image upload failed, {operation.error.code}: {operation.error.message}")
+            elif not operation.done:
+                set_status(constants.ERROR_MESSAGES["OPERATION_TIMED_OUT"], "ERROR")
+            elif operation.response:
+                asset_id = operation.response.asset_id
+                texture_uploads.cache_asset_id(creator_data, asset_type_name, image_upload.content_hash, asset_id)
+                for image in (image_upload.image, *image_upload.duplicate_images):
+                    image[constants.RBX_IMAGE_ASSET_ID_PROPERTY_NAME] = str(asset_id)
+                set_status(f"Uploaded as {asset_id}", "CHECKMARK")
+            else:
+                set_status(constants.ERROR_MESSAGES["INVALID_RESPONSE"], "ERROR")
+                print(f"Image upload failed, invalid response:\n{operation}")
+        except upload_retry.AmbiguousRequestError as exception:
+            traceback.print_exception(exception)
+            set_status(constants.ERROR_MESSAGES["UPLOAD_OUTCOME_UNKNOWN"], "ERROR")
+        except asyncio.exceptions.CancelledError:
+            set_status("Cancelled", "CANCEL")
+        except asyncio.exceptions.TimeoutError:
+            set_status(constants.ERROR_MESSAGES["UPLOAD_TIMED_OUT"], "ERROR")
+        except openapi_client.rest.ApiException as exception:
+            traceback.print_exception(exception)
+            from .extract_exception_message import extract_exception_message
+
+            set_status(extract_exception_message(exception), "ERROR")
+        except Exception as exception:
+            traceback.print_exception(exception)
+            set_status(constants.ERROR_MESSAGES["ADD_ON_ERROR"], "ERROR")
         finally:
-            RBX_OT_upload.upload_complete(window_manager, temporary_directory)
+            RBX_OT_upload.upload_complete(window_manager, temporary_directory, task)
+
+
+def resume_queued_exports():
+    """Timer that exports the queued object groups of the current batch as room is made to stage their files"""
+    from . import constants
+
+    try:
+        if RBX_OT_upload.export_queue:
+            RBX_OT_upload.export_queued()
+    except Exception as exception:
+        traceback.print_exception(exception)
+        RBX_OT_upload.drop_queued_exports(bpy.context.window_manager)
+
+    return constants.STAGING_POLL_INTERVAL_SECONDS if RBX_OT_upload.export_queue else None
+
+
+class RBX_OT_cancel_upload(Operator):
+    """Operator for cancelling the uploads in progress"""
+
+    bl_idname = "rbx.cancel_upload"
+    bl_label = "Cancel Upload"
+    bl_description = "Stop the uploads in progress. Uploads that already reached Roblox may still complete"
+
+    def execute(self, context):
+        RBX_OT_upload.cancel_uploads(context.window_manager)
+
+        return {"FINISHED"}
+
+    @classmethod
+    def poll(cls, context):
+        # A batch waiting for room to stage its exports may not have submitted any tasks yet
+        return bool(RBX_OT_upload.active_tasks or RBX_OT_upload.export_queue)
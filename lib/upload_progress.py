@@ -0,0 +1,128 @@
+# Copyright © 2023 Roblox Corporation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+# associated documentation files (the “Software”), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial
+# portions of the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+# OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# SPDX-License-Identifier: MIT
+
+"""Tracks the bytes sent for each object in the current upload batch, and draws progress, throughput and ETA"""
+
+if "bpy" in locals():
+    # Imports have run before. Need to reload the imported modules
+    import importlib
+
+    if "progress_payload" in locals():
+        importlib.reload(progress_payload)
+
+import bpy
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Throughput is averaged over this many of the most recent seconds, so the ETA follows changes in the uplink speed
+THROUGHPUT_WINDOW_SECONDS = 5
+# The UI is redrawn at most this often while bytes are being sent
+REDRAW_INTERVAL_SECONDS = 0.2
+
+# [bytes_sent, total_bytes] by object name, for the objects of the current batch
+progress_by_object_name = {}
+# (time, bytes sent for the whole batch) samples within the throughput window, oldest first
+throughput_samples = deque()
+last_redraw_time = 0
+
+
+def start_batch():
+    """Forgets the progress of the previous batch"""
+    progress_by_object_name.clear()
+    throughput_samples.clear()
+
+
+def add_object(object_name, total_bytes):
+    """Adds an exported object of the given size to the batch"""
+    progress_by_object_name[object_name] = [0, total_bytes]
+
+
+@contextmanager
+def track_object(object_name, area):
+    """Counts the bytes sent for files uploaded within the block towards the given object"""
+    import progress_payload
+
+    def on_progress(bytes_sent, total_bytes):
+        global last_redraw_time
+
+        progress_by_object_name[object_name] = [bytes_sent, total_bytes]
+
+        now = time.monotonic()
+        throughput_samples.append((now, get_batch_bytes()[0]))
+        while throughput_samples[0][0] < now - THROUGHPUT_WINDOW_SECONDS:
+            throughput_samples.popleft()
+
+        if now - last_redraw_time >= REDRAW_INTERVAL_SECONDS or bytes_sent == total_bytes:
+            last_redraw_time = now
+            area.tag_redraw()
+
+    token = progress_payload.current_progress_callback.set(on_progress)
+    try:
+        yield
+    finally:
+        progress_payload.current_progress_callback.reset(token)
+
+
+def get_batch_bytes():
+    """Returns the bytes sent and total bytes to send for the whole batch"""
+    bytes_sent = sum(progress[0] for progress in progress_by_object_name.values())
+    total_bytes = sum(progress[1] for progress in progress_by_object_name.values())
+    return bytes_sent, total_bytes
+
+
+def get_bytes_per_second():
+    """Returns the average upload throughput over the throughput window, or None until there are enough samples"""
+    if len(throughput_samples) < 2:
+        return None
+    (oldest_time, oldest_bytes_sent), (newest_time, newest_bytes_sent) = throughput_samples[0], throughput_samples[-1]
+    if newest_time <= oldest_time:
+        return None
+    # A retried upload starts again from zero, which can make the batch total go backwards
+    return max(0, newest_bytes_sent - oldest_bytes_sent) / (newest_time - oldest_time)
+
+
+def draw_progress(layout):
+    """Draws a progress bar for the batch, with its throughput and ETA, and one for each object being sent"""
+    bytes_sent, total_bytes = get_batch_bytes()
+    if not total_bytes:
+        return
+
+    bytes_per_second = get_bytes_per_second()
+    details_text = f"{bytes_sent / 1e6:.1f} / {total_bytes / 1e6:.1f} MB"
+    if bytes_per_second and bytes_sent < total_bytes:
+        eta_seconds = (total_bytes - bytes_sent) / bytes_per_second
+        details_text += (
+            f", {bytes_per_second / 1e6:.2f} MB/s, {int(eta_seconds // 60)}:{int(eta_seconds % 60):02d} left"
+        )
+
+    __draw_progress_bar(layout, bytes_sent / total_bytes, details_text)
+
+    for object_name, (object_bytes_sent, object_total_bytes) in progress_by_object_name.items():
+        if 0 < object_bytes_sent < object_total_bytes:
+            __draw_progress_bar(layout, object_bytes_sent / object_total_bytes, object_name)
+
+
+def __draw_progress_bar(layout, factor, text):
+    # UILayout.progress was added in Blender 4.0. Older versions show the percentage as text instead.
+    if hasattr(layout, "progress"):
+        layout.progress(factor=factor, type="BAR", text=text)
+    else:
+        layout.label(text=f"{factor:.0%}  {text}")
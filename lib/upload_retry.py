@@ -0,0 +1,166 @@
+# Copyright © 2023 Roblox Corporation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+# associated documentation files (the “Software”), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial
+# portions of the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+# OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# SPDX-License-Identifier: MIT
+
+"""
+Retries requests to the assets API that fail for transient reasons, such as a dropped connection, a timeout or an
+overloaded server, with exponential backoff. Errors that retrying cannot fix are raised straight away.
+"""
+
+if "bpy" in locals():
+    # Imports have run before. Need to reload the imported modules
+    import importlib
+
+    if "constants" in locals():
+        importlib.reload(constants)
+    if "AssetsUploadClient" in locals():
+        importlib.reload(AssetsUploadClient)
+
+import bpy
+import asyncio
+import random
+
+# Status codes of responses to requests that may succeed if repeated
+TRANSIENT_STATUS_CODES = frozenset((408, 429, 500, 502, 503, 504))
+# Status codes of responses to requests that the server did not act on, and that can be repeated without creating
+# anything twice
+UNPROCESSED_STATUS_CODES = frozenset((408, 429, 503))
+UNAUTHORIZED_STATUS_CODE = 401
+
+
+class AmbiguousRequestError(Exception):
+    """Raised when a request that is not safe to repeat failed after it may have reached the server"""
+
+
+class RetryBudget:
+    """The number of retries left to share between the uploads of a batch, so a batch cannot keep retrying
+    indefinitely while the service is down"""
+
+    def __init__(self, num_retries):
+        self.num_retries_remaining = num_retries
+
+    def try_spend(self):
+        """Takes one retry from the budget. Returns False if there are none left."""
+        if self.num_retries_remaining <= 0:
+            return False
+        self.num_retries_remaining -= 1
+        return True
+
+
+def is_transient(exception):
+    """Returns whether the request that raised the exception may succeed if repeated"""
+    import aiohttp
+    import openapi_client
+
+    if isinstance(exception, openapi_client.rest.ApiException):
+        return exception.status in TRANSIENT_STATUS_CODES
+    return isinstance(exception, (asyncio.TimeoutError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError))
+
+
+def is_unprocessed(exception):
+    """Returns whether the request that raised the exception certainly did not reach the server, or was rejected
+    by it without being acted on"""
+    import aiohttp
+    import openapi_client
+
+    if isinstance(exception, openapi_client.rest.ApiException):
+        return exception.status in UNPROCESSED_STATUS_CODES or exception.status == UNAUTHORIZED_STATUS_CODE
+    return isinstance(exception, (aiohttp.ClientConnectorError, aiohttp.ConnectionTimeoutError))
+
+
+def is_unauthorized(exception):
+    import openapi_client
+
+    return isinstance(exception, openapi_client.rest.ApiException) and exception.status == UNAUTHORIZED_STATUS_CODE
+
+
+async def call_with_retries(request, retry_budget, refresh_authorization=None, is_repeatable=True, on_retry=None):
+    """Awaits request(), calling it again if it fails with a transient error, until it succeeds, the attempts
+    are used up or the batch's retry budget runs out. The last error is raised in the latter cases.
+
+    If the request is unauthorized, refresh_authorization() is awaited and the request repeated, once.
+    If is_repeatable is False, as for requests creating an asset, a request is only repeated if it certainly was not
+    acted on. Otherwise AmbiguousRequestError is raised, rather than risking creating the asset twice.
+    on_retry(attempt, delay_seconds) is called before waiting to retry.
+    """
+    from . import constants
+
+    attempt = 1
+    has_refreshed_authorization = False
+    while True:
+        try:
+            return await request()
+        except Exception as exception:
+            if is_unauthorized(exception) and refresh_authorization and not has_refreshed_authorization:
+                has_refreshed_authorization = True
+                await refresh_authorization()
+                continue
+
+            if not is_transient(exception):
+                raise
+            if not is_repeatable and not is_unprocessed(exception):
+                raise AmbiguousRequestError("The request failed after it may have been acted on") from exception
+            if attempt >= constants.MAX_REQUEST_ATTEMPTS or not retry_budget.try_spend():
+                raise
+
+            delay_seconds = __get_retry_delay_seconds(attempt, exception)
+            print(
+                f"Retrying request in {delay_seconds:.1f} seconds after attempt {attempt} failed: {type(exception).__name__} {exception}"
+            )
+            if on_retry:
+                on_retry(attempt, delay_seconds)
+            await asyncio.sleep(delay_seconds)
+            attempt += 1
+
+
+async def poll_until_done(client, operation_id, retry_budget, refresh_authorization=None, num_tries=5):
+    """Polls the status of an upload operation num_tries times or until it is done, retrying failed polls.
+    Returns the last RobloxLongrunningOperation received. Errors that cannot be retried are raised.
+    """
+    from assets_upload_client import AssetsUploadClient
+
+    for i in range(num_tries):
+        operation = await call_with_retries(
+            lambda: client.poll_asset_upload_status_async(operation_id=operation_id),
+            retry_budget,
+            refresh_authorization,
+        )
+        if operation.done:
+            return operation
+
+        if i < num_tries - 1:
+            await asyncio.sleep(AssetsUploadClient.UPLOAD_STATUS_QUERY_INTERVAL_SECONDS)
+
+    return operation
+
+
+def __get_retry_delay_seconds(attempt, exception):
+    """Returns how long to wait before the next attempt, honoring a Retry-After header given in seconds, otherwise
+    backing off exponentially with full jitter so uploads that failed together do not retry together"""
+    from . import constants
+
+    headers = getattr(exception, "headers", None)
+    retry_after = headers.get("Retry-After") if headers else None
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), constants.RETRY_BACKOFF_MAX_SECONDS)
+
+    max_delay_seconds = min(
+        constants.RETRY_BACKOFF_MAX_SECONDS, constants.RETRY_BACKOFF_BASE_SECONDS * 2 ** (attempt - 1)
+    )
+    return random.uniform(0, max_delay_seconds)
@@ -0,0 +1,107 @@
+# Copyright © 2023 Roblox Corporation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+# associated documentation files (the “Software”), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial
+# portions of the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+# OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# SPDX-License-Identifier: MIT
+
+"""
+Decides the order in which exported files are uploaded, and how many are sent at once. This is separate from the
+per-minute rate limit: the rate limit keeps within the API's quota, while the cap on uploads in flight keeps
+concurrent uploads from splitting the uplink so many ways that every one of them finishes late.
+"""
+
+import asyncio
+import itertools
+from contextlib import asynccontextmanager
+
+# Orders in which waiting uploads are started
+SMALLEST_FIRST = "SMALLEST_FIRST"
+BALANCED = "BALANCED"
+SELECTION_ORDER = "SELECTION_ORDER"
+
+
+class UploadScheduler:
+    """Admits at most max_in_flight uploads at once, picking the next waiting upload according to the order"""
+
+    def __init__(self, max_in_flight, order):
+        self.max_in_flight = max_in_flight
+        self.order = order
+        self.num_in_flight = 0
+        self.num_admitted = 0
+        # (size, sequence number, future) for each waiting upload
+        self.waiting = []
+        self.sequence_numbers = itertools.count()
+
+    def configure(self, max_in_flight, order):
+        """Changes the cap and order, admitting waiting uploads if the cap was raised"""
+        self.max_in_flight = max_in_flight
+        self.order = order
+        self.__admit_waiting()
+
+    @asynccontextmanager
+    async def slot(self, size):
+        """Waits until an upload of the given size in bytes is admitted, and holds its place in flight until the
+        block exits"""
+        loop = asyncio.get_running_loop()
+        entry = (size, next(self.sequence_numbers), loop.create_future())
+        self.waiting.append(entry)
+
+        # Admitting on the next iteration of the loop lets every upload submitted together join the queue first, so the
+        # first ones to arrive do not take the free slots regardless of the order
+        loop.call_soon(self.__admit_waiting)
+
+        try:
+            await entry[2]
+        except asyncio.CancelledError:
+            if entry in self.waiting:
+                self.waiting.remove(entry)
+            elif not entry[2].cancelled():
+                # Admitted just as it was cancelled, so the slot it was given must be freed
+                self.__release()
+            raise
+
+        try:
+            yield
+        finally:
+            self.__release()
+
+    def __release(self):
+        self.num_in_flight -= 1
+        self.__admit_waiting()
+
+    def __admit_waiting(self):
+        while self.waiting and self.num_in_flight < self.max_in_flight:
+            entry = self.__get_next_entry()
+            self.waiting.remove(entry)
+            if entry[2].cancelled():
+                continue
+            self.num_in_flight += 1
+            self.num_admitted += 1
+            entry[2].set_result(None)
+
+    def __get_next_entry(self):
+        match self.order:
+            case "SMALLEST_FIRST":
+                # Sending the smallest files first minimizes the mean time until each upload completes
+                return min(self.waiting)
+            case "BALANCED":
+                # Alternating with the largest files keeps large uploads from waiting behind every small one
+                if self.num_admitted % 2 == 0:
+                    return min(self.waiting)
+                return max(self.waiting, key=lambda entry: (entry[0], -entry[1]))
+            case _:
+                return min(self.waiting, key=lambda entry: entry[1])
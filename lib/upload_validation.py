@@ -0,0 +1,162 @@
+# Copyright © 2023 Roblox Corporation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+# associated documentation files (the “Software”), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial
+# portions of the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+# OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# SPDX-License-Identifier: MIT
+
+"""
+Checks objects against the limits that Roblox enforces on uploaded meshes before they are exported, so objects that
+would be rejected are reported without spending export time or upload quota. Mesh and armature data is read with
+foreach_get into NumPy arrays, rather than element by element.
+"""
+
+if "bpy" in locals():
+    # Imports have run before. Need to reload the imported modules
+    import importlib
+
+    if "constants" in locals():
+        importlib.reload(constants)
+    if "mesh_splitting" in locals():
+        importlib.reload(mesh_splitting)
+
+import bpy
+
+
+def get_validation_issues(target_object, depsgraph, export_scale, split_oversized_meshes=False):
+    """Returns a description of each way in which the object, or the objects of a collection, exceed the limits on
+    uploaded meshes. Returns an empty list if the object can be uploaded. When oversized meshes are split, an object
+    that will be split is not held to the triangle and vertex limits."""
+    from .mesh_splitting import get_can_split
+
+    is_collection = isinstance(target_object, bpy.types.Collection)
+    member_objects = target_object.all_objects if is_collection else [target_object]
+    mesh_objects = [member_object for member_object in member_objects if member_object.type == "MESH"]
+    is_split = split_oversized_meshes and not is_collection and get_can_split(target_object)
+
+    issues = []
+    for mesh_object in mesh_objects:
+        for issue in __get_mesh_object_issues(mesh_object, depsgraph, export_scale, is_split):
+            issues.append(f"{mesh_object.name}: {issue}" if is_collection else issue)
+    return issues
+
+
+def __get_mesh_object_issues(mesh_object, depsgraph, export_scale, is_split):
+    """Returns the issues with a single mesh object, as it will be exported with its modifiers applied"""
+    import numpy
+    from . import constants
+
+    issues = []
+    evaluated_object = mesh_object.evaluated_get(depsgraph)
+    mesh = evaluated_object.to_mesh()
+    try:
+        num_polygons = len(mesh.polygons)
+        loop_totals = numpy.empty(num_polygons, dtype=numpy.int32)
+        mesh.polygons.foreach_get("loop_total", loop_totals)
+        num_triangles = int((loop_totals - 2).sum())
+        if num_triangles > constants.MAX_TRIANGLES_PER_MESH and not is_split:
+            issues.append(f"{num_triangles} triangles, more than the {constants.MAX_TRIANGLES_PER_MESH} allowed")
+        if len(mesh.vertices) > constants.MAX_VERTICES_PER_MESH and not is_split:
+            issues.append(f"{len(mesh.vertices)} vertices, more than the {constants.MAX_VERTICES_PER_MESH} allowed")
+
+        if num_polygons and not mesh.uv_layers:
+            issues.append("No UV map")
+
+        areas = numpy.empty(num_polygons, dtype=numpy.float32)
+        mesh.polygons.foreach_get("area", areas)
+        num_zero_area_faces = int(numpy.count_nonzero(areas <= constants.ZERO_AREA_FACE_EPSILON))
+        if num_zero_area_faces:
+            issues.append(f"{num_zero_area_faces} faces with zero area")
+
+        num_vertices = len(mesh.vertices)
+        if num_vertices:
+            coordinates = numpy.empty(num_vertices * 3, dtype=numpy.float32).reshape(-1, 3)
+            mesh.vertices.foreach_get("co", coordinates.ravel())
+            matrix_world = numpy.array(mesh_object.matrix_world, dtype=numpy.float32)
+            world_coordinates = coordinates @ matrix_world[:3, :3].T + matrix_world[:3, 3]
+            # The exported FBX is in centimeters, and Studio reads each centimeter as a stud
+            size_in_studs = (world_coordinates.max(axis=0) - world_coordinates.min(axis=0)) * export_scale * 100
+            if size_in_studs.max() > constants.MAX_MESH_SIZE_STUDS:
+                issues.append(
+                    f"{size_in_studs.max():.0f} studs across, larger than the {constants.MAX_MESH_SIZE_STUDS} allowed"
+                )
+
+        armature_object = __get_armature_object(mesh_object)
+        if armature_object:
+            issues.extend(__get_skinning_issues(mesh_object, mesh, armature_object))
+    finally:
+        evaluated_object.to_mesh_clear()
+
+    return issues
+
+
+def __get_armature_object(mesh_object):
+    """Returns the armature that deforms the mesh object, if any"""
+    for modifier in mesh_object.modifiers:
+        if modifier.type == "ARMATURE" and modifier.object and modifier.show_viewport:
+            return modifier.object
+    if mesh_object.parent and mesh_object.parent.type == "ARMATURE" and mesh_object.parent_type == "ARMATURE":
+        return mesh_object.parent
+    return None
+
+
+def __get_skinning_issues(mesh_object, mesh, armature_object):
+    """Returns the issues with the bones that deform the mesh and the number of bones influencing each vertex. Only
+    the deforming bones that weight this mesh count, so meshes on a shared rig are not held to the whole rig's size."""
+    import numpy
+    from . import constants
+
+    issues = []
+    bones = armature_object.data.bones
+    use_deform = numpy.empty(len(bones), dtype=numpy.bool_)
+    bones.foreach_get("use_deform", use_deform)
+
+    # Only vertex groups named after deforming bones influence the exported skin
+    deform_bone_names = {bone.name for bone, is_deform in zip(bones, use_deform) if is_deform}
+    is_deform_group = numpy.zeros(max(len(mesh_object.vertex_groups), 1), dtype=numpy.bool_)
+    for vertex_group in mesh_object.vertex_groups:
+        is_deform_group[vertex_group.index] = vertex_group.name in deform_bone_names
+    if not is_deform_group.any():
+        return issues
+
+    # Vertex group weights are not exposed as flat arrays, so the influences of each vertex, and the groups that
+    # weight any vertex at all, are gathered as they are read and then checked in bulk
+    weighted_groups = set()
+    influence_counts = []
+    for vertex in mesh.vertices:
+        vertex_groups = [
+            element.group for element in vertex.groups if element.weight > 0 and is_deform_group[element.group]
+        ]
+        weighted_groups.update(vertex_groups)
+        influence_counts.append(len(vertex_groups))
+
+    num_weighting_bones = len(weighted_groups)
+    if num_weighting_bones > constants.MAX_BONES_PER_MESH:
+        issues.append(
+            f"{num_weighting_bones} bones weighting the mesh, more than the {constants.MAX_BONES_PER_MESH} allowed"
+        )
+
+    if not influence_counts:
+        return issues
+    influences_per_vertex = numpy.array(influence_counts, dtype=numpy.int32)
+    max_influences = int(influences_per_vertex.max())
+    if max_influences > constants.MAX_INFLUENCES_PER_VERTEX:
+        num_vertices = int(numpy.count_nonzero(influences_per_vertex > constants.MAX_INFLUENCES_PER_VERTEX))
+        issues.append(
+            f"{num_vertices} vertices influenced by up to {max_influences} bones, more than the "
+            f"{constants.MAX_INFLUENCES_PER_VERTEX} allowed"
+        )
+    return issues
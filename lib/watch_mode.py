@@ -0,0 +1,246 @@
+# Copyright © 2023 Roblox Corporation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+# associated documentation files (the “Software”), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial
+# portions of the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+# FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS
+# OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# SPDX-License-Identifier: MIT
+
+"""
+Watch mode re-uploads objects and collections that were uploaded before, whenever their geometry, materials or
+transform are edited. Edits are collected by a depsgraph_update_post handler and debounced, so an object is uploaded
+once it has not changed for a moment, and only while no other upload is in progress. Objects whose exported contents
+are unchanged since their last upload by watch mode, such as after an undo, are not uploaded again.
+"""
+
+if "bpy" in locals():
+    # Imports have run before. Need to reload the imported modules
+    import importlib
+
+    if "constants" in locals():
+        importlib.reload(constants)
+    if "geometry_dedup" in locals():
+        importlib.reload(geometry_dedup)
+    if "upload_operator" in locals():
+        importlib.reload(upload_operator)
+
+import bpy
+import contextlib
+import hashlib
+import time
+import traceback
+from bpy.app.handlers import persistent
+
+# The time of the last edit to each uploaded object or collection waiting to be uploaded, by its data collection name
+# and its name. Names are kept rather than the IDs themselves, which can be freed by undo.
+pending_edits = {}
+# The fingerprint of each object or collection when it was last uploaded while watching, by the same keys
+uploaded_fingerprints = {}
+
+
+def start():
+    """Starts watching for edits to uploaded objects"""
+    if __on_depsgraph_update not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(__on_depsgraph_update)
+    if not bpy.app.timers.is_registered(__upload_settled_edits):
+        from . import constants
+
+        # Watching carries on when another file is opened
+        bpy.app.timers.register(
+            __upload_settled_edits, first_interval=constants.WATCH_POLL_INTERVAL_SECONDS, persistent=True
+        )
+
+
+def stop():
+    """Stops watching for edits, dropping the edits not yet uploaded"""
+    if __on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(__on_depsgraph_update)
+    if bpy.app.timers.is_registered(__upload_settled_edits):
+        bpy.app.timers.unregister(__upload_settled_edits)
+    clear()
+
+
+@contextlib.contextmanager
+def paused():
+    """Within the context, changes to the scene are not looked at, such as those made while exporting. Objects edited
+    within the context are still recognized as changed by their fingerprints when next edited."""
+    is_watching = __on_depsgraph_update in bpy.app.handlers.depsgraph_update_post
+    if is_watching:
+        bpy.app.handlers.depsgraph_update_post.remove(__on_depsgraph_update)
+    try:
+        yield
+    finally:
+        if is_watching and __on_depsgraph_update not in bpy.app.handlers.depsgraph_update_post:
+            bpy.app.handlers.depsgraph_update_post.append(__on_depsgraph_update)
+
+
+def record_uploaded(targets, depsgraph):
+    """Remembers the contents of objects and collections as they are uploaded, so that updates which leave them
+    unchanged, including those made by exporting them, do not upload them again"""
+    for target in targets:
+        uploaded_fingerprints[__get_key(target)] = __get_fingerprint(target, depsgraph)
+
+
+def clear():
+    """Forgets the edits and uploads seen so far, for instance because another file was opened"""
+    pending_edits.clear()
+    uploaded_fingerprints.clear()
+
+
+@persistent
+def __on_depsgraph_update(scene, depsgraph):
+    """Records the time of edits to uploaded objects, and to the uploaded collections containing edited objects. This
+    runs after every change to the scene, so it only looks at what changed."""
+    from . import constants
+
+    uploaded_objects = None
+    uploaded_collections = None
+    edit_time = time.monotonic()
+
+    for update in depsgraph.updates:
+        edited_id = update.id.original
+        if isinstance(edited_id, bpy.types.Object):
+            if not (update.is_updated_geometry or update.is_updated_transform):
+                continue
+            edited_objects = [edited_id]
+        elif isinstance(edited_id, bpy.types.Material):
+            if uploaded_objects is None:
+                uploaded_objects = [
+                    uploaded_object
+                    for uploaded_object in bpy.data.objects
+                    if constants.RBX_PACKAGE_ID_PROPERTY_NAME in uploaded_object
+                ]
+            edited_objects = [
+                uploaded_object
+                for uploaded_object in uploaded_objects
+                if any(material_slot.material == edited_id for material_slot in uploaded_object.material_slots)
+            ]
+        else:
+            continue
+
+        for edited_object in edited_objects:
+            if constants.RBX_PACKAGE_ID_PROPERTY_NAME in edited_object:
+                pending_edits[__get_key(edited_object)] = edit_time
+
+            if uploaded_collections is None:
+                uploaded_collections = [
+                    collection
+                    for collection in bpy.data.collections
+                    if constants.RBX_PACKAGE_ID_PROPERTY_NAME in collection
+                ]
+            for collection in uploaded_collections:
+                if edited_object.name in collection.all_objects:
+                    pending_edits[__get_key(collection)] = edit_time
+
+
+def __upload_settled_edits():
+    """Uploads the objects that have not been edited for the debounce period, once no upload is in progress. Runs
+    as a timer for as long as watch mode is on."""
+    from . import constants
+
+    try:
+        window_manager = bpy.context.window_manager
+        rbx = window_manager.rbx
+        if not pending_edits or rbx.num_objects_uploading or not rbx.is_logged_in or rbx.is_processing_login_or_logout:
+            return constants.WATCH_POLL_INTERVAL_SECONDS
+
+        settled_time = time.monotonic() - constants.WATCH_DEBOUNCE_SECONDS
+        settled_keys = [key for key, edit_time in pending_edits.items() if edit_time <= settled_time]
+        if not settled_keys:
+            return constants.WATCH_POLL_INTERVAL_SECONDS
+
+        # Uploading needs an area to show statuses in, so edits wait while no 3D viewport is open
+        window, area = __find_view_3d_area(window_manager)
+        if not area:
+            return constants.WATCH_POLL_INTERVAL_SECONDS
+
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        edited_targets = []
+        for key in settled_keys:
+            del pending_edits[key]
+            data_collection_name, name = key
+            target = getattr(bpy.data, data_collection_name).get(name)
+            if not target or constants.RBX_PACKAGE_ID_PROPERTY_NAME not in target:
+                continue
+
+            fingerprint = __get_fingerprint(target, depsgraph)
+            if fingerprint is None or uploaded_fingerprints.get(key) != fingerprint:
+                edited_targets.append(target)
+
+        if edited_targets:
+            print(f"Uploading edited objects: {', '.join(target.name for target in edited_targets)}")
+            from .upload_operator import RBX_OT_upload
+
+            with bpy.context.temp_override(window=window, area=area):
+                RBX_OT_upload.upload_objects(bpy.context, edited_targets)
+    except Exception as exception:
+        traceback.print_exception(exception)
+
+    return constants.WATCH_POLL_INTERVAL_SECONDS
+
+
+def __get_key(target):
+    """Returns the name of the bpy.data collection holding the object or collection, and its name"""
+    return ("collections" if isinstance(target, bpy.types.Collection) else "objects", target.name)
+
+
+def __find_view_3d_area(window_manager):
+    """Returns a window and a 3D viewport area in it, or (None, None) if no 3D viewport is open"""
+    for window in window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == "VIEW_3D":
+                return window, area
+    return None, None
+
+
+def __get_fingerprint(target, depsgraph):
+    """Returns a digest of the geometry, transform and materials of the object, or of every object in a collection.
+    Returns None if an object cannot be fingerprinted, in which case it is always uploaded when edited."""
+    import numpy
+    from .geometry_dedup import get_geometry_hash
+
+    digest = hashlib.blake2b(digest_size=16)
+    member_objects = target.all_objects if isinstance(target, bpy.types.Collection) else [target]
+    for member_object in sorted(member_objects, key=lambda member_object: member_object.name):
+        geometry_hash = get_geometry_hash(member_object, depsgraph)
+        if geometry_hash is None:
+            return None
+        digest.update(member_object.name.encode())
+        digest.update(geometry_hash)
+        # The geometry hash leaves out the location, which the upload keeps
+        digest.update(numpy.array(member_object.matrix_world, dtype=numpy.float32).tobytes())
+        for material_slot in member_object.material_slots:
+            if material_slot.material:
+                digest.update(__get_material_hash(material_slot.material))
+
+    return digest.digest()
+
+
+def __get_material_hash(material):
+    """Returns a digest of the material's settings and shader nodes, the parts of it that end up in an FBX"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(tuple(material.diffuse_color)).encode())
+    if material.use_nodes and material.node_tree:
+        for node in material.node_tree.nodes:
+            image = getattr(node, "image", None)
+            digest.update(repr((node.name, node.bl_idname, image and image.name)).encode())
+            for node_input in node.inputs:
+                default_value = getattr(node_input, "default_value", None)
+                if hasattr(default_value, "__len__"):
+                    default_value = tuple(default_value)
+                digest.update(repr((node_input.identifier, default_value, node_input.is_linked)).encode())
+        for link in material.node_tree.links:
+            digest.update(repr((link.from_node.name, link.from_socket.identifier, link.to_node.name)).encode())
+    return digest.digest()